@@ -1,10 +1,13 @@
 # Final Version of the Spooky Forest Adventure Game
 # Includes: File operations (save/load game, leaderboard), Exception handling
 
+import argparse
 import random
 import time
 import os
 
+from autosave import AutosaveWriter
+
 # ------------------- Constants & Game Setup -------------------
 rooms = ["Dark Cave", "Misty Pond", "Old Cabin", "Hidden Grove"]
 mission_items = {"Dark Cave": "Flashlight", "Misty Pond": "Life Jacket", "Old Cabin": "Map", "Hidden Grove": "Magic Key"}
@@ -22,10 +25,13 @@ hazards = {
     "Hidden Grove": ("A shadow blocks your path. Do you fight or sneak?", "sneak")
 }
 
+rng = random.Random()  # Seeded in play_game() so a session can be played again
+
 # ------------------- Save/Load Functions -------------------
+autosave = AutosaveWriter("save_file.txt")  # Writes in the background; never leaves half a file
+
 def save_game(player):
-    with open("save_file.txt", "w") as f:
-        f.write(f"{player['name']},{player['life_points']},{'|'.join(player['inventory'])}\n")
+    autosave.submit(f"{player['name']},{player['life_points']},{'|'.join(player['inventory'])}\n")
 
 def load_game():
     if not os.path.exists("save_file.txt"):
@@ -56,7 +62,7 @@ def ask_question(room, player):
 def choose_item(room, player):
     correct_item = mission_items[room]
     items = [correct_item, "Broken Stick", "Old Sock"]
-    random.shuffle(items)
+    rng.shuffle(items)
     while True:
         print("Choose an item:")
         for i, item in enumerate(items):
@@ -96,8 +102,12 @@ def face_hazard(room, player):
         print("Error occurred. Skipping hazard without penalty.")
 
 # ------------------- Game Loop -------------------
-def play_game():
+def play_game(seed=None):
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    rng.seed(seed)
     print("Welcome to the Spooky Forest Adventure!")
+    print(f"(Game seed: {seed} - run with --seed {seed} to get the same item order again)")
     try:
         name = input("Enter your name: ")
     except Exception:
@@ -133,11 +143,15 @@ def play_game():
 
     print(f"Final Life Points: {player['life_points']}")
     save_leaderboard(player)
+    autosave.close()  # Flush the last save
 
 # ------------------- Entry Point -------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spooky Forest Adventure")
+    parser.add_argument("--seed", type=int, help="seed for the item order (same seed = same game)")
+    args = parser.parse_args()
     try:
-        play_game()
+        play_game(args.seed)
     except KeyboardInterrupt:
         print("\nGame interrupted.")
     finally:
@@ -1,3 +1,4 @@
+import argparse
 import random
 import sys
 import json
@@ -9,6 +10,7 @@ random
 Provides functions to generate random numbers or randomly choose items.
 
 In your game, it’s used to pick random quiz questions and hazards to keep the gameplay unpredictable.
+The picks come from one seeded generator (rng), so a game can be played again with --seed.
 
 sys
 
@@ -57,6 +59,8 @@ rooms = {
     }
 }
 
+rng = random.Random()  # Seeded in main() so a session can be played again
+
 # Starting variables
 current_room = "Clearing"   # Player's current location
 inventory = []              # Items player has collected
@@ -66,6 +70,12 @@ mission_items = {"flashlight", "map", "compass", "fire kit"}  # Correct items to
 # Completed rooms variables
 completed_rooms = set()  # Tracks rooms player has fully completed
 
+# Case-insensitive item lookups, built once instead of on every pick
+# item_index looks like {room: {lowered item: real item}} and keeps the items in order
+item_index = {name: {item.casefold(): item for item in room["items"]} for name, room in rooms.items()}
+mission_keys = {item.casefold() for item in mission_items}
+missions_found = set()  # Lowered mission items the player is carrying
+
 
 # -----------------------------
 # Quiz Data (by categories)
@@ -137,7 +147,7 @@ def ask_quiz():
     if not quizzes:
         print("🎓 No more quizzes left!")
         return
-    quiz = random.choice(quizzes)
+    quiz = rng.choice(quizzes)
     quizzes.remove(quiz)  # Remove to avoid repeats
 
     print(f"\n🧚‍♀️ Quiz ({quiz['category']}): {quiz['question']}")
@@ -173,7 +183,7 @@ def handle_hazard():
     if not hazards:
         print("✨ No hazards left.")
         return
-    hazard = random.choice(hazards)
+    hazard = rng.choice(hazards)
     hazards.remove(hazard)  # Remove to avoid repeats
 
     print(f"\n⚠️ Hazard: {hazard['scenario']}")
@@ -207,17 +217,17 @@ def take_item(item):
     Returns True if item was valid (regardless of success), else False.
     """
     global life_points
-    lowered_items = [i.lower() for i in rooms[current_room]["items"]]
+    key = item.casefold()
+    real_item = item_index[current_room].get(key)
 
-    if item.lower() not in lowered_items:
+    if real_item is None:
         print("❌ That is not an option, try again.")
         return False
 
-    real_item = rooms[current_room]["items"][lowered_items.index(item.lower())]
-
-    if real_item.lower() in mission_items:
+    if key in mission_keys:
         inventory.append(real_item)
-        rooms[current_room]["items"].remove(real_item)
+        missions_found.add(key)
+        del item_index[current_room][key]  # Taken items leave the room
         life_points += 1
         score_breakdown["Items"] += 1
         print(f"✅ You took the {real_item}! +1 life point.")
@@ -236,8 +246,7 @@ def check_end():
     Checks if player has collected all mission items.
     If yes, ends the game with a victory message and shows summary and leaderboard.
     """
-    collected = set(i.lower() for i in inventory)
-    if mission_items.issubset(collected):
+    if len(missions_found) == len(mission_keys):
         print("\n🎉 You collected all correct items and escape the forest!")
         print(f"❤️ Final life points: {life_points}")
         show_summary()
@@ -347,6 +356,10 @@ def load_game():
         current_room = save_data["current_room"]
         inventory.clear()
         inventory.extend(save_data["inventory"])
+        missions_found.clear()
+        missions_found.update(item.casefold() for item in inventory if item.casefold() in mission_keys)
+        for name, room in rooms.items():
+            item_index[name] = {i.casefold(): i for i in room["items"] if i.casefold() not in missions_found}
         life_points = save_data["life_points"]
         quizzes.clear()
         quizzes.extend(save_data["quizzes"])
@@ -364,13 +377,18 @@ def load_game():
 # Main Game Loop
 # -----------------------------
 
-def main():
+def main(seed=None):
     """
     Runs the main game loop, handling player input for movement, inventory, points, saving/loading, and quitting.
     Coordinates quizzes, item collection, hazards, and room transitions.
     """
     global current_room
 
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    rng.seed(seed)
+    print(f"(Game seed: {seed} - run with --seed {seed} to get the same quizzes and hazards again)")
+
     intro()
 
     while True:
@@ -434,11 +452,11 @@ def main():
 
             # Allow player to pick up items or leave room
             while True:
-                if not rooms[current_room]["items"]:
+                if not item_index[current_room]:
                     print("No more items here. Go elsewhere.")
                     break
 
-                print(f"Items in this room: {', '.join(rooms[current_room]['items'])}")
+                print(f"Items in this room: {', '.join(item_index[current_room].values())}")
                 print("Pick an item or type 'leave' to exit.")
                 choice = input("> ").strip().lower()
 
@@ -462,4 +480,7 @@ def main():
 # -----------------------------
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Spooky Forest Adventure")
+    parser.add_argument("--seed", type=int, help="seed for the quizzes and hazards (same seed + same answers = same game)")
+    args = parser.parse_args()
+    main(args.seed)
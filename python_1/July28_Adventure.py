@@ -3,18 +3,22 @@
 # ---------- CONSTANTS ----------
 MAX_LIFE_POINTS = 5
 SAVE_FILE = "save_file.txt"
-LEADERBOARD_FILE = "leaderboard.txt"
+LEADERBOARD_FILE = "leaderboard.txt"  # Old text leaderboard, imported into the leaderboard store
 
 # ---------- IMPORTS ----------
 import random
 import time
 from collections import namedtuple
 
+from autosave import AutosaveWriter
+from leaderboard import open_leaderboard
+
 # ---------- VARIABLES ----------
 life_points = MAX_LIFE_POINTS
 mission_items = []
 wrong_items = []  # <-- This is a list to store incorrect item choices
 visited_rooms = []  # <-- This is a list to track which rooms have been visited
+autosave = AutosaveWriter(SAVE_FILE)  # <-- Writes saves in the background, safely
 
 # ---------- ROOM DATA USING NAMED TUPLES ----------
 Room = namedtuple("Room", ["name", "question", "answer", "items"])
@@ -46,11 +50,9 @@ def save_game():
     """
     Saves the current game state to a text file.
     Stores life points, mission items, and visited rooms.
+    The autosave thread does the writing, so the game does not wait for the disk.
     """
-    with open(SAVE_FILE, "w") as f:
-        f.write(f"{life_points}\n")
-        f.write(",".join(mission_items) + "\n")
-        f.write(",".join(visited_rooms) + "\n")
+    autosave.submit(f"{life_points}\n" + ",".join(mission_items) + "\n" + ",".join(visited_rooms) + "\n")
     print("Game state saved!")
 
 # Updated load_game with exception handling and comments
@@ -85,10 +87,11 @@ def load_game():
 
 def update_leaderboard(name):
     """
-    Appends the player's name, number of items collected, and remaining life points to the leaderboard file.
+    Records the player's name, number of items collected, and remaining life points in the leaderboard store.
     """
-    with open(LEADERBOARD_FILE, "a") as f:
-        f.write(f"{name} - Items: {len(mission_items)} - Life Points: {life_points}\n")
+    board = open_leaderboard(text_path=LEADERBOARD_FILE)
+    board.add(name, life_points, len(mission_items), "July28")
+    board.close()
 
 def ask_question(question, correct_answer):
     """
@@ -184,6 +187,8 @@ def play_game():
 
         save_game()  # Save game state at the end of each loop
 
+    autosave.close()  # Make sure the last save is on disk before we finish
+
 # ---------- RUN GAME ----------
 if __name__ == "__main__":
     play_game()
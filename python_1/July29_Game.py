@@ -3,7 +3,7 @@
 # ---------- CONSTANTS ----------
 MAX_LIFE_POINTS = 5  # Maximum life points a player can have
 SAVE_FILE = "save_file.txt"  # File to save game progress
-LEADERBOARD_FILE = "leaderboard.txt"  # File to store leaderboard entries
+LEADERBOARD_FILE = "leaderboard.txt"  # Old leaderboard entries, imported into the leaderboard store
 
 # ---------- IMPORTS ----------
 import tkinter as tk
@@ -12,6 +12,8 @@ import random
 import os
 from collections import namedtuple  # Named tuple for room structure
 
+from leaderboard import open_leaderboard, top_lines  # Indexed leaderboard store
+
 # ---------- VARIABLES ----------
 life_points = MAX_LIFE_POINTS  # Tracks the current life points
 mission_items = []  # Correct magical items collected by player
@@ -57,44 +59,137 @@ def load_game():
 
 def update_leaderboard(name):
     """
-    Write player's result to leaderboard file
+    Record player's result in the leaderboard store
     """
-    with open(LEADERBOARD_FILE, "a") as f:
-        f.write(f"{name} - Items: {len(mission_items)} - Life Points: {life_points}\n")
+    board = open_leaderboard(text_path=LEADERBOARD_FILE)
+    board.add(name, life_points, len(mission_items), "July29")
+    board.close()
 
-# ---------- GUI FUNCTIONS ----------
-def start_game_window():
+# ---------- VIEW MANAGER ----------
+class ViewManager:
     """
-    Initialize the main GUI game window
+    Keeps one Tk root for the whole session.
+    Every screen is a Frame that is built once and swapped in with show().
     """
-    game_window = tk.Tk()
-    game_window.title("Spooky Forest Adventure")
-
-    status_label = tk.Label(game_window, text=f"Life Points: {life_points}", font=("Arial", 12))
-    status_label.pack(pady=10)
-
-    instruction_label = tk.Label(game_window, text="Choose a room to explore:", font=("Arial", 14))
-    instruction_label.pack(pady=10)
-
-    for room in room_data:
-        if room.name not in visited_rooms:
-            btn = tk.Button(game_window, text=room.name, command=lambda r=room: enter_room(game_window, r))
-            btn.pack(pady=5)
-
-    game_window.mainloop()
 
-def enter_room(game_window, room):
+    def __init__(self, root):
+        self.root = root
+        self.frames = {}
+        self.current = None
+
+    def add(self, name):
+        """
+        Create an empty screen and return its Frame so widgets can be added to it
+        """
+        frame = tk.Frame(self.root)
+        self.frames[name] = frame
+        return frame
+
+    def show(self, name):
+        """
+        Swap the visible screen; nothing is destroyed or rebuilt
+        """
+        if self.current == name:
+            return
+        if self.current is not None:
+            self.frames[self.current].pack_forget()
+        self.frames[name].pack(fill="both", expand=True, padx=20, pady=10)
+        self.current = name
+
+# ---------- GUI ----------
+class SpookyForestApp:
     """
-    Handle entering a room: ask quiz, choose item
+    The whole game in one window: welcome, rooms, quiz, items, game over and leaderboard screens
     """
-    global life_points
 
-    visited_rooms.append(room.name)
-
-    # Ask quiz question
-    def check_answer():
+    def __init__(self, root):
+        root.title("Spooky Forest Adventure")
+        self.root = root
+        self.views = ViewManager(root)
+        self.room = None  # Room being explored
+        self.item_buttons = []  # Reused item buttons, one per item slot
+
+        # Welcome screen
+        frame = self.views.add("welcome")
+        tk.Label(frame, text="Welcome to the Spooky Forest Adventure!", font=("Arial", 14)).pack(pady=20)
+        tk.Button(frame, text="Start Game", command=self.show_rooms).pack(pady=10)
+        tk.Button(frame, text="View Leaderboard", command=self.show_leaderboard).pack(pady=5)
+        tk.Button(frame, text="Quit", command=root.destroy).pack(pady=10)
+
+        # Room choice screen, with one button per room made up front
+        frame = self.views.add("rooms")
+        self.status_label = tk.Label(frame, text="", font=("Arial", 12))
+        self.status_label.pack(pady=10)
+        tk.Label(frame, text="Choose a room to explore:", font=("Arial", 14)).pack(pady=10)
+        self.room_buttons = {}
+        for room in room_data:
+            btn = tk.Button(frame, text=room.name, command=lambda r=room: self.enter_room(r))
+            self.room_buttons[room.name] = btn
+
+        # Quiz screen
+        frame = self.views.add("quiz")
+        self.question_label = tk.Label(frame, text="", font=("Arial", 12))
+        self.question_label.pack(pady=10)
+        self.answer_entry = tk.Entry(frame)
+        self.answer_entry.pack(pady=5)
+        self.answer_entry.bind("<Return>", lambda event: self.check_answer())
+        tk.Button(frame, text="Submit", command=self.check_answer).pack(pady=5)
+
+        # Item screen
+        frame = self.views.add("items")
+        self.items_label = tk.Label(frame, text="", font=("Arial", 12))
+        self.items_label.pack(pady=10)
+        self.items_frame = frame
+
+        # Game over screen
+        frame = self.views.add("end")
+        self.end_label = tk.Label(frame, text="", font=("Arial", 14))
+        self.end_label.pack(pady=10)
+        tk.Label(frame, text="Enter your name for the leaderboard:").pack(pady=5)
+        self.name_entry = tk.Entry(frame)
+        self.name_entry.pack(pady=5)
+        tk.Button(frame, text="Save and Exit", command=self.save_and_exit).pack(pady=10)
+
+        # Leaderboard screen
+        frame = self.views.add("leaderboard")
+        tk.Label(frame, text="Leaderboard", font=("Arial", 14)).pack(pady=10)
+        self.leaderboard_text = tk.Text(frame, height=15, width=50)
+        self.leaderboard_text.pack(pady=10)
+        tk.Button(frame, text="Back", command=lambda: self.views.show("welcome")).pack(pady=5)
+
+        self.views.show("welcome")
+
+    def show_rooms(self):
+        """
+        Show the room choice screen with only the rooms not visited yet
+        """
+        self.status_label.config(text=f"Life Points: {life_points}")
+        for room in room_data:
+            btn = self.room_buttons[room.name]
+            if room.name in visited_rooms:
+                btn.pack_forget()
+            elif not btn.winfo_manager():
+                btn.pack(pady=5)
+        self.views.show("rooms")
+
+    def enter_room(self, room):
+        """
+        Handle entering a room: ask quiz, choose item
+        """
+        visited_rooms.append(room.name)
+        self.room = room
+        self.question_label.config(text=f"{room.name}: {room.question}")
+        self.answer_entry.delete(0, tk.END)
+        self.views.show("quiz")
+        self.answer_entry.focus_set()
+
+    def check_answer(self):
+        """
+        Check the quiz answer, then move on to picking an item
+        """
         global life_points
-        player_answer = answer_entry.get().strip().lower()
+        room = self.room
+        player_answer = self.answer_entry.get().strip().lower()
         if player_answer == room.answer:
             life_points = min(MAX_LIFE_POINTS, life_points + 1)
             messagebox.showinfo("Correct", "You got it right! +1 Life Point")
@@ -102,27 +197,32 @@ def enter_room(game_window, room):
             life_points -= 1
             messagebox.showwarning("Incorrect", f"Wrong! The correct answer was '{room.answer}'. -1 Life Point")
 
-        quiz_window.destroy()
         if life_points <= 0:
-            end_game("lose")
+            self.end_game("lose")
         else:
-            choose_item(room)
-
-    quiz_window = tk.Toplevel(game_window)
-    quiz_window.title(room.name)
-
-    tk.Label(quiz_window, text=room.question, font=("Arial", 12)).pack(pady=10)
-    answer_entry = tk.Entry(quiz_window)
-    answer_entry.pack(pady=5)
-    tk.Button(quiz_window, text="Submit", command=check_answer).pack(pady=5)
-
-def choose_item(room):
-    """
-    Handle item selection after quiz
-    """
-    global life_points
-
-    def item_choice(picked):
+            self.choose_item(room)
+
+    def choose_item(self, room):
+        """
+        Handle item selection after quiz, reusing the item buttons
+        """
+        self.items_label.config(text=f"Choose one item from: {room.items}")
+
+        # Make more buttons only if this room has more items than any room before
+        while len(self.item_buttons) < len(room.items):
+            self.item_buttons.append(tk.Button(self.items_frame))
+        for i, btn in enumerate(self.item_buttons):
+            if i < len(room.items):
+                item = room.items[i]
+                btn.config(text=item, command=lambda picked=item: self.item_choice(picked))
+                if not btn.winfo_manager():
+                    btn.pack(pady=5)
+            else:
+                btn.pack_forget()
+        self.views.show("items")
+
+    def item_choice(self, picked):
+        global life_points
         if "magic" in picked:
             mission_items.append(picked)
             messagebox.showinfo("Item", f"You picked {picked}, it's magical!")
@@ -131,82 +231,51 @@ def choose_item(room):
             life_points -= 1
             messagebox.showwarning("Item", f"{picked} is useless! -1 Life Point")
 
-        item_window.destroy()
-
         if life_points <= 0:
-            end_game("lose")
+            self.end_game("lose")
         elif len(mission_items) == 4:
-            end_game("win")
+            self.end_game("win")
         else:
-            start_game_window()
-
-    item_window = tk.Toplevel()
-    item_window.title("Pick an Item")
-
-    tk.Label(item_window, text=f"Choose one item from: {room.items}", font=("Arial", 12)).pack(pady=10)
-
-    for item in room.items:
-        tk.Button(item_window, text=item, command=lambda i=item: item_choice(i)).pack(pady=5)
-
-def end_game(outcome):
-    """
-    End game with message and ask for leaderboard name
-    """
-    result_window = tk.Tk()
-    result_window.title("Game Over")
-
-    if outcome == "win":
-        msg = "You escaped the forest with all magical items!"
-    else:
-        msg = "You lost all life points! The forest has captured you..."
-
-    tk.Label(result_window, text=msg, font=("Arial", 14)).pack(pady=10)
-    tk.Label(result_window, text="Enter your name for the leaderboard:").pack(pady=5)
-
-    name_entry = tk.Entry(result_window)
-    name_entry.pack(pady=5)
+            self.show_rooms()
+
+    def end_game(self, outcome):
+        """
+        End game with message and ask for leaderboard name
+        """
+        if outcome == "win":
+            msg = "You escaped the forest with all magical items!"
+        else:
+            msg = "You lost all life points! The forest has captured you..."
+        self.end_label.config(text=msg)
+        self.views.show("end")
 
-    def save_and_exit():
-        name = name_entry.get().strip()
+    def save_and_exit(self):
+        name = self.name_entry.get().strip()
         if name:
             update_leaderboard(name)
-        result_window.destroy()
-
-    tk.Button(result_window, text="Save and Exit", command=save_and_exit).pack(pady=10)
+        self.root.destroy()
+
+    def show_leaderboard(self):
+        """
+        Display the top of the leaderboard
+        """
+        board = open_leaderboard(text_path=LEADERBOARD_FILE)
+        content = "\n".join(top_lines(board, k=15))
+        board.close()
+
+        self.leaderboard_text.config(state=tk.NORMAL)
+        self.leaderboard_text.delete("1.0", tk.END)
+        self.leaderboard_text.insert(tk.END, content)
+        self.leaderboard_text.config(state=tk.DISABLED)
+        self.views.show("leaderboard")
 
 def start_gui():
     """
-    Initial GUI welcome screen with start and leaderboard buttons
+    Create the one Tk root for the session and show the welcome screen
     """
-    welcome = tk.Tk()
-    welcome.title("Spooky Forest Adventure")
-
-    tk.Label(welcome, text="Welcome to the Spooky Forest Adventure!", font=("Arial", 14)).pack(pady=20)
-    tk.Button(welcome, text="Start Game", command=lambda: [welcome.destroy(), start_game_window()]).pack(pady=10)
-    tk.Button(welcome, text="View Leaderboard", command=show_leaderboard).pack(pady=5)
-    tk.Button(welcome, text="Quit", command=welcome.destroy).pack(pady=10)
-
-    welcome.mainloop()
-
-def show_leaderboard():
-    """
-    Display leaderboard from file in new window
-    """
-    lb_win = tk.Toplevel()
-    lb_win.title("Leaderboard")
-
-    tk.Label(lb_win, text="Leaderboard", font=("Arial", 14)).pack(pady=10)
-
-    if os.path.exists(LEADERBOARD_FILE):
-        with open(LEADERBOARD_FILE, "r") as f:
-            content = f.read()
-    else:
-        content = "No entries yet."
-
-    text_box = tk.Text(lb_win, height=15, width=50)
-    text_box.insert(tk.END, content)
-    text_box.config(state=tk.DISABLED)
-    text_box.pack(pady=10)
+    root = tk.Tk()
+    SpookyForestApp(root)
+    root.mainloop()
 
 # ---------- RUN GAME ----------
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
+import argparse
 import random
 import json
+import time
 
 # -----------------------------
-# Global Game State
+# Game Content (shared, never changed)
 # -----------------------------
 rooms = {
     "Clearing": {
@@ -47,18 +49,186 @@ hazards = [
 
 mission_items = {"flashlight", "map", "compass", "fire kit"}
 
-current_room = "Clearing"
-inventory = []
-life_points = 0
-score_breakdown = {"Quiz": 0, "Hazards": 0, "Items": 0}
+room_map = {"north": "Dark Cave", "south": "Old Cabin", "east": "Misty Pond", "west": "Hidden Grove"}
 
 # -----------------------------
-# GUI App
+# Game Engine (no Tk)
+# -----------------------------
+class ForestStateMachine:
+    """
+    The game as a table of (state, event) -> handler.
+    It knows nothing about Tk: after each step, text, options and info describe what to show.
+    Every machine has its own rooms and score, so many games can run side by side.
+    """
+
+    # state, event, handler
+    # "begin" starts the game, "choose" is a player click, "advance" moves on without a click
+    TRANSITIONS = [
+        ("start", "begin", "on_start"),
+        ("intro", "choose", "on_intro"),
+        ("move", "advance", "on_move"),
+        ("move", "choose", "on_move"),
+        ("quiz", "choose", "on_quiz"),
+        ("quiz_result", "choose", "on_quiz_result"),
+        ("item", "advance", "on_item"),
+        ("item_result", "choose", "on_item_result"),
+        ("hazard", "advance", "on_hazard"),
+        ("hazard", "choose", "on_hazard"),
+        ("hazard_result", "choose", "on_hazard_result"),
+    ]
+
+    def __init__(self, rng=None, timed=False):
+        self.table = {(state, event): getattr(self, handler) for state, event, handler in self.TRANSITIONS}
+        self.rng = rng if rng is not None else random.Random()
+        self.timed = timed
+        self.counters = {}  # (state, event) -> [calls, seconds], only filled when timed
+
+        self.rooms = {name: {"items": list(room["items"])} for name, room in rooms.items()}
+        self.current_room = "Clearing"
+        self.inventory = []
+        self.life_points = 0
+        self.score_breakdown = {"Quiz": 0, "Hazards": 0, "Items": 0}
+
+        self.state = "start"
+        self.text = ""
+        self.options = []
+        self.choice = None
+
+    @property
+    def info(self):
+        return f"Room: {self.current_room} | Inventory: {', '.join(self.inventory)} | ❤️ {self.life_points}"
+
+    def fire(self, event, choice=None):
+        """
+        Runs the handler for (state, event). Handlers return True to move on without a click.
+        Returns False if the event means nothing in this state (for example after game over).
+        """
+        self.choice = choice
+        while True:
+            handler = self.table.get((self.state, event))
+            if handler is None:
+                return False
+            if self.timed:
+                key = (self.state, event)
+                started = time.perf_counter()
+                advance = handler()
+                counter = self.counters.setdefault(key, [0, 0.0])
+                counter[0] += 1
+                counter[1] += time.perf_counter() - started
+            else:
+                advance = handler()
+            if not advance:
+                return True
+            event = "advance"
+
+    def choose(self, choice):
+        return self.fire("choose", choice)
+
+    def show(self, text, options):
+        self.text = text
+        self.options = options
+
+    # ---------- Handlers ----------
+
+    def on_start(self):
+        self.show("Do you want to start your adventure?", ["Yes", "No"])
+        self.state = "intro"
+
+    def on_intro(self):
+        if self.choice == "No":
+            self.show("You chose not to proceed. Game over.", [])
+            self.state = "over"
+            return
+        self.state = "move"
+        return True
+
+    def on_move(self):
+        self.show(f"You are in the {self.current_room}. Choose a direction:", ["north", "south", "east", "west"])
+        self.state = "quiz"
+
+    def on_quiz(self):
+        self.direction = self.choice
+        self.quiz = self.rng.choice(quizzes)
+        self.show(f"Quiz: {self.quiz['question']}", self.quiz["choices"])
+        self.state = "quiz_result"
+
+    def on_quiz_result(self):
+        if self.choice == self.quiz["answer"]:
+            self.life_points += 1
+            self.score_breakdown["Quiz"] += 1
+        else:
+            self.life_points -= 1
+        if self.life_points < 0:
+            return self.game_over()
+        self.current_room = room_map[self.direction]
+        self.state = "item"
+        return True
+
+    def on_item(self):
+        items = self.rooms[self.current_room]["items"]
+        if not items:
+            self.show("No more items here. Going back.", ["OK"])
+            self.state = "hazard"
+            return
+        self.show(f"Choose an item: {', '.join(items)}", items + ["Leave"])
+        self.state = "item_result"
+
+    def on_item_result(self):
+        if self.choice == "Leave":
+            self.state = "hazard"
+            return True
+        if self.choice in self.rooms[self.current_room]["items"]:
+            item = self.choice
+            if item in mission_items:
+                self.inventory.append(item)
+                self.life_points += 1
+                self.score_breakdown["Items"] += 1
+                self.text = f"You picked {item}. +1 life point."
+            else:
+                self.life_points -= 1
+                self.text = f"{item} is cursed! -1 life point."
+            self.rooms[self.current_room]["items"].remove(item)
+            if self.life_points < 0:
+                return self.game_over()
+            if mission_items.issubset(set(self.inventory)):
+                return self.win()
+            self.state = "hazard"
+            self.options = ["Continue"]
+
+    def on_hazard(self):
+        self.hazard = self.rng.choice(hazards)
+        self.show(f"Hazard! {self.hazard['scenario']}", self.hazard["choices"])
+        self.state = "hazard_result"
+
+    def on_hazard_result(self):
+        if self.choice == self.hazard["answer"]:
+            self.life_points += 1
+            self.score_breakdown["Hazards"] += 1
+            self.text = f"Safe choice! +1 life point."
+        else:
+            self.life_points -= 1
+            self.text = f"Bad choice! -1 life point."
+        if self.life_points < 0:
+            return self.game_over()
+        self.state = "move"
+        self.options = ["Continue"]
+
+    def game_over(self):
+        self.show("Game over. The forest swallows you whole.", [])
+        self.state = "over"
+
+    def win(self):
+        self.show(f"🎉 You collected all items and escaped! Final life points: {self.life_points}", [])
+        self.state = "over"
+
+# -----------------------------
+# GUI App (only draws the engine)
 # -----------------------------
 class SpookyForestGame:
-    def __init__(self, master):
+    def __init__(self, master, engine=None):
         self.master = master
         master.title("Spooky Forest Adventure")
+        self.engine = engine or ForestStateMachine()
 
         self.text = tk.Label(master, text="Welcome to the Spooky Forest Adventure!", font=("Arial", 14), wraplength=400)
         self.text.pack(pady=10)
@@ -75,8 +245,8 @@ class SpookyForestGame:
             btn.grid(row=_, column=0, pady=2)
             self.option_buttons.append(btn)
 
-        self.state = "start"
-        self.next()
+        self.engine.fire("begin")
+        self.render()
 
     def set_options(self, options):
         for i, text in enumerate(options):
@@ -85,121 +255,60 @@ class SpookyForestGame:
             self.option_buttons[j].config(text="", state="disabled")
 
     def option_click(self, i):
-        self.choice = self.option_buttons[i].cget("text")
-        self.next()
-
-    def next(self):
-        global current_room, inventory, life_points
-        if self.state == "start":
-            self.text.config(text="Do you want to start your adventure?")
-            self.set_options(["Yes", "No"])
-            self.state = "intro"
-
-        elif self.state == "intro":
-            if self.choice == "No":
-                self.text.config(text="You chose not to proceed. Game over.")
-                self.set_options([])
-                return
-            self.state = "move"
-            self.next()
-
-        elif self.state == "move":
-            self.text.config(text=f"You are in the {current_room}. Choose a direction:")
-            self.set_options(["north", "south", "east", "west"])
-            self.state = "quiz"
-
-        elif self.state == "quiz":
-            self.direction = self.choice
-            self.quiz = random.choice(quizzes)
-            self.text.config(text=f"Quiz: {self.quiz['question']}")
-            self.set_options(self.quiz["choices"])
-            self.state = "quiz_result"
-
-        elif self.state == "quiz_result":
-            if self.choice == self.quiz["answer"]:
-                life_points += 1
-                score_breakdown["Quiz"] += 1
-            else:
-                life_points -= 1
-            if life_points < 0:
-                self.game_over()
-                return
-            room_map = {"north": "Dark Cave", "south": "Old Cabin", "east": "Misty Pond", "west": "Hidden Grove"}
-            current_room = room_map[self.direction]
-            self.state = "item"
-            self.next()
-
-        elif self.state == "item":
-            items = rooms[current_room]["items"]
-            if not items:
-                self.text.config(text="No more items here. Going back.")
-                self.state = "hazard"
-                self.set_options(["OK"])
-                return
-            self.text.config(text=f"Choose an item: {', '.join(items)}")
-            self.set_options(items + ["Leave"])
-            self.state = "item_result"
-
-        elif self.state == "item_result":
-            if self.choice == "Leave":
-                self.state = "hazard"
-                self.next()
-                return
-            if self.choice in rooms[current_room]["items"]:
-                item = self.choice
-                if item in mission_items:
-                    inventory.append(item)
-                    life_points += 1
-                    score_breakdown["Items"] += 1
-                    self.text.config(text=f"You picked {item}. +1 life point.")
-                else:
-                    life_points -= 1
-                    self.text.config(text=f"{item} is cursed! -1 life point.")
-                rooms[current_room]["items"].remove(item)
-                if life_points < 0:
-                    self.game_over()
-                    return
-                if mission_items.issubset(set(inventory)):
-                    self.win()
-                    return
-                self.state = "hazard"
-                self.set_options(["Continue"])
-
-        elif self.state == "hazard":
-            hazard = random.choice(hazards)
-            self.hazard = hazard
-            self.text.config(text=f"Hazard! {hazard['scenario']}")
-            self.set_options(hazard["choices"])
-            self.state = "hazard_result"
-
-        elif self.state == "hazard_result":
-            if self.choice == self.hazard["answer"]:
-                life_points += 1
-                score_breakdown["Hazards"] += 1
-                self.text.config(text=f"Safe choice! +1 life point.")
-            else:
-                life_points -= 1
-                self.text.config(text=f"Bad choice! -1 life point.")
-            if life_points < 0:
-                self.game_over()
-                return
-            self.state = "move"
-            self.set_options(["Continue"])
+        if self.engine.choose(self.option_buttons[i].cget("text")):
+            self.render()
 
-        self.info.config(text=f"Room: {current_room} | Inventory: {', '.join(inventory)} | ❤️ {life_points}")
+    def render(self):
+        self.text.config(text=self.engine.text)
+        self.set_options(self.engine.options)
+        self.info.config(text=self.engine.info)
 
-    def game_over(self):
-        self.text.config(text="Game over. The forest swallows you whole.")
-        self.set_options([])
+# -----------------------------
+# Headless Benchmark
+# -----------------------------
+def benchmark(sessions, seed=0, max_steps=1000):
+    """
+    Plays many games with a bot that clicks a random button, without any window.
+    Returns (seconds, clicks, merged per-transition counters).
+    """
+    rng = random.Random(seed)
+    counters = {}
+    clicks = 0
+    started = time.perf_counter()
+    for _ in range(sessions):
+        engine = ForestStateMachine(rng=rng, timed=True)
+        engine.fire("begin")
+        for _ in range(max_steps):
+            if not engine.options:
+                break
+            engine.choose(rng.choice(engine.options))
+            clicks += 1
+        for key, (calls, seconds) in engine.counters.items():
+            total = counters.setdefault(key, [0, 0.0])
+            total[0] += calls
+            total[1] += seconds
+    return time.perf_counter() - started, clicks, counters
 
-    def win(self):
-        self.text.config(text=f"🎉 You collected all items and escaped! Final life points: {life_points}")
-        self.set_options([])
+def print_counters(counters):
+    print(f"{'state':14} {'event':8} {'calls':>10} {'avg µs':>8}")
+    for (state, event), (calls, seconds) in sorted(counters.items(), key=lambda kv: -kv[1][1]):
+        print(f"{state:14} {event:8} {calls:10} {seconds / calls * 1e6:8.2f}")
 
 # -----------------------------
 # Launch GUI
 # -----------------------------
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = SpookyForestGame(root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Spooky Forest Adventure")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS", help="play this many headless games and print the transition counters")
+    args = parser.parse_args()
+    if args.bench is not None:
+        if args.bench < 1:
+            parser.error("--bench must be at least 1")
+        sessions = args.bench
+        seconds, clicks, counters = benchmark(sessions)
+        print(f"{sessions} sessions, {clicks} clicks in {seconds:.2f}s ({sessions / seconds:,.0f} sessions/sec)")
+        print_counters(counters)
+    else:
+        root = tk.Tk()
+        app = SpookyForestGame(root)
+        root.mainloop()
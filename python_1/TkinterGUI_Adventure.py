@@ -3,20 +3,24 @@
 # ---------- CONSTANTS ----------
 MAX_LIFE_POINTS = 5
 SAVE_FILE = "save_file.txt"
-LEADERBOARD_FILE = "leaderboard.txt"
+LEADERBOARD_FILE = "leaderboard.txt"  # Old text leaderboard, imported into the leaderboard store
 
 # ---------- IMPORTS ----------
 import random
 import tkinter as tk
-from tkinter import messagebox, PhotoImage
+from tkinter import messagebox, simpledialog
 import os
 from collections import namedtuple
 
+from image_cache import ImageCache
+from leaderboard import open_leaderboard, top_lines
+
 # ---------- VARIABLES ----------
 life_points = MAX_LIFE_POINTS
 mission_items = []
 wrong_items = []
 visited_rooms = []
+image_cache = ImageCache()  # Room pictures, loaded once and decoded ahead of time
 
 # ---------- ROOM DATA USING NAMED TUPLES ----------
 Room = namedtuple("Room", ["name", "question", "answer", "items", "image"])
@@ -50,8 +54,9 @@ def load_game():
         pass
 
 def update_leaderboard(name):
-    with open(LEADERBOARD_FILE, "a") as f:
-        f.write(f"{name} - Items: {len(mission_items)} - Life Points: {life_points}\n")
+    board = open_leaderboard(text_path=LEADERBOARD_FILE)
+    board.add(name, life_points, len(mission_items), "TkinterGUI")
+    board.close()
 
 # ---------- GUI FUNCTIONS ----------
 def start_gui():
@@ -61,11 +66,9 @@ def start_gui():
         game_window()
 
     def view_leaderboard():
-        try:
-            with open(LEADERBOARD_FILE, "r") as f:
-                leaderboard_text = f.read()
-        except FileNotFoundError:
-            leaderboard_text = "No leaderboard data yet."
+        board = open_leaderboard(text_path=LEADERBOARD_FILE)
+        leaderboard_text = "\n".join(top_lines(board, k=15))
+        board.close()
 
         leaderboard_window = tk.Toplevel(window)
         leaderboard_window.title("Leaderboard")
@@ -80,87 +83,161 @@ def start_gui():
     tk.Button(window, text="Exit", command=window.destroy, width=20).pack(pady=5)
     window.mainloop()
 
+# ---------- WIDGET POOL ----------
+class ButtonPool:
+    """
+    A row of Buttons that are made once and reused every turn.
+    set() only sends Tk the text and visibility changes since the last turn.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.buttons = []
+        self.texts = []  # Text each button shows now
+        self.packed = []  # Whether each button is on screen
+        self.callbacks = []  # Python function each button runs; changing it needs no Tk call
+
+    def set(self, options):
+        """
+        options is a list of (text, callback), or None for a slot that should be hidden.
+        """
+        for i, option in enumerate(options):
+            if i == len(self.buttons):
+                self.buttons.append(tk.Button(self.parent, command=lambda i=i: self.callbacks[i]()))
+                self.texts.append(None)
+                self.packed.append(False)
+                self.callbacks.append(None)
+            if option is None:
+                self.hide(i)
+                continue
+            text, callback = option
+            self.callbacks[i] = callback
+            if self.texts[i] != text:
+                self.buttons[i].config(text=text)
+                self.texts[i] = text
+            if not self.packed[i]:
+                # Keep slots in order even if an earlier one comes back
+                later = [b for b, shown in zip(self.buttons[i + 1:], self.packed[i + 1:]) if shown]
+                self.buttons[i].pack(pady=2, before=later[0]) if later else self.buttons[i].pack(pady=2)
+                self.packed[i] = True
+        for i in range(len(options), len(self.buttons)):
+            self.hide(i)
+
+    def hide(self, i):
+        if self.packed[i]:
+            self.buttons[i].pack_forget()
+            self.packed[i] = False
+
+class GameView:
+    """
+    The game window. Every widget is made once; each turn only changes what is different.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.question_label = tk.Label(root, text="", font=("Arial", 14))
+        self.question_label.pack(pady=10)
+        self.image_label = tk.Label(root)
+        self.image_label.pack()
+        self.image_path = None  # Picture the image label shows now
+
+        # One frame and pool per kind of choice; a turn swaps frames instead of rewriting buttons
+        self.frames = {}
+        self.pools = {}
+        for name in ("rooms", "answers", "items"):
+            self.frames[name] = tk.Frame(root)
+            self.pools[name] = ButtonPool(self.frames[name])
+        self.shown = None
+
+    def show(self, name, options):
+        """
+        Shows one pool of choices and hides the one shown before.
+        """
+        self.pools[name].set(options)
+        if self.shown != name:
+            if self.shown is not None:
+                self.frames[self.shown].pack_forget()
+            self.frames[name].pack()
+            self.shown = name
+
+    def set_text(self, text):
+        if self.question_label.cget("text") != text:
+            self.question_label.config(text=text)
+
+    def set_image(self, path):
+        if path == self.image_path:
+            return
+        self.image_path = path
+        if path is None:
+            self.image_label.config(image="", text="")
+            return
+        try:
+            img = image_cache.get(path, master=self.root)
+            self.image_label.config(image=img, text="")
+            self.image_label.image = img
+        except Exception as e:
+            print(f"⚠️ Could not load image: {e}")
+            self.image_label.config(image="", text="[Image not found]", font=("Arial", 12))
+
 # ---------- GAME GUI LOGIC ----------
 def game_window():
     root = tk.Tk()
     root.title("Game in Progress")
+    view = GameView(root)
 
-    question_label = tk.Label(root, text="", font=("Arial", 14))
-    question_label.pack(pady=10)
-
-    image_label = tk.Label(root)
-    image_label.pack()
-
-    item_buttons = []
+    # One fixed slot per room, so visiting a room only hides its own button
+    room_slots = {name: (name, lambda name=name: show_room(name)) for name in rooms}
 
     def show_room(room_name):
         room = room_dict[room_name]
         visited_rooms.append(room_name)
 
-        question_label.config(text=f"{room.name}: {room.question}")
-
-        try:
-            img = PhotoImage(file=room.image)
-            image_label.config(image=img)
-            image_label.image = img
-        except:
-            image_label.config(image="", text="[Image not found]", font=("Arial", 12))
-
-        for btn in item_buttons:
-            btn.destroy()
-        item_buttons.clear()
-
-        def handle_answer(is_correct):
-            nonlocal room
-            global life_points
-
-            if is_correct:
-                messagebox.showinfo("Correct", "You gain a life point!")
-                life_points += 1
-            else:
-                messagebox.showerror("Wrong", "You lose a life point!")
-                life_points -= 1
-
-            question_label.config(text=f"Pick an item:")
-
-            for item in room.items:
-                def make_handler(item=item):
-                    def choose():
-                        if item.startswith("magic"):
-                            mission_items.append(item)
-                            messagebox.showinfo("Item", f"You found a mission item: {item}!")
-                        else:
-                            wrong_items.append(item)
-                            messagebox.showwarning("Wrong Item", f"That was the wrong item! -1 Life")
-                            global life_points
-                            life_points -= 1
-                        next_turn()
-                    return choose
-
-                btn = tk.Button(root, text=item, command=make_handler(item))
-                btn.pack(pady=2)
-                item_buttons.append(btn)
+        view.set_text(f"{room.name}: {room.question}")
+        view.set_image(room.image)
 
         # Answer buttons
-        tk.Button(root, text="Answer: " + room.answer, command=lambda: handle_answer(True)).pack()
-        tk.Button(root, text="Wrong Answer", command=lambda: handle_answer(False)).pack()
+        view.show("answers", [("Answer: " + room.answer, lambda: handle_answer(room, True)),
+                              ("Wrong Answer", lambda: handle_answer(room, False))])
+
+    def handle_answer(room, is_correct):
+        global life_points
+
+        if is_correct:
+            messagebox.showinfo("Correct", "You gain a life point!")
+            life_points += 1
+        else:
+            messagebox.showerror("Wrong", "You lose a life point!")
+            life_points -= 1
+
+        view.set_text(f"Pick an item:")
+        view.show("items", [(item, lambda item=item: choose(item)) for item in room.items])
+
+    def choose(item):
+        global life_points
+        if item.startswith("magic"):
+            mission_items.append(item)
+            messagebox.showinfo("Item", f"You found a mission item: {item}!")
+        else:
+            wrong_items.append(item)
+            messagebox.showwarning("Wrong Item", f"That was the wrong item! -1 Life")
+            life_points -= 1
+        next_turn()
 
     def next_turn():
         if life_points <= 0:
             messagebox.showinfo("Game Over", "You ran out of life points. The wizard captures you forever!")
             root.destroy()
         elif len(mission_items) == 4:
-            name = tk.simpledialog.askstring("Victory!", "You escaped! Enter your name for the leaderboard:")
+            name = simpledialog.askstring("Victory!", "You escaped! Enter your name for the leaderboard:")
             if name:
                 update_leaderboard(name)
             root.destroy()
         else:
-            for widget in root.winfo_children():
-                widget.destroy()
             available = [r for r in rooms if r not in visited_rooms]
-            tk.Label(root, text="Choose a room:", font=("Arial", 14)).pack(pady=10)
-            for r in available:
-                tk.Button(root, text=r, command=lambda r=r: show_room(r)).pack(pady=2)
+            image_cache.prefetch(room_dict[r].image for r in available)  # Decode the next pictures in the background
+            view.set_text("Choose a room:")
+            view.set_image(None)
+            view.show("rooms", [room_slots[r] if r not in visited_rooms else None for r in rooms])
 
     next_turn()
     root.mainloop()
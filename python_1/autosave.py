@@ -0,0 +1,140 @@
+# Spooky Forest Adventure - Autosave Writer
+# Saves the game on a background thread so the game loop never waits for the disk.
+
+import atexit
+import os
+import tempfile
+import threading
+import time
+
+"""How the autosave works:
+
+submit(text) only remembers the newest save text and returns straight away.
+A background thread waits a short moment (delay) so that a burst of changes turns into
+one write, then writes the newest text.
+
+Every write goes to a temporary file in the same folder, which is then renamed over the
+real save file. A rename is all-or-nothing, so a crash leaves either the old save or the
+new one, never half a file. close() (also run automatically when Python exits) writes
+whatever is still waiting.
+
+A failed write is printed straight away and the thread keeps running, so later saves are
+still written. The error is also kept and raised again by the next flush() or close(), so
+a caller that waits for its save learns that it did not happen."""
+
+# -----------------------------
+# Atomic Write
+# -----------------------------
+
+def write_atomic(path, text):
+    """
+    Writes text to path through a temporary file and a rename.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".autosave-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())  # Make sure the data is on disk before the rename
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+# -----------------------------
+# Background Writer
+# -----------------------------
+
+class AutosaveWriter:
+    """
+    Writes the newest submitted save text to path on a background thread.
+    """
+
+    def __init__(self, path, delay=0.25):
+        self.path = path
+        self.delay = delay  # Seconds to wait for more changes before writing
+        self.writes = 0  # How many times the file was actually written
+        self._cond = threading.Condition()
+        self._pending = None  # Newest text not written yet
+        self._writing = False
+        self._hurry = False  # Set by flush() to skip the delay
+        self._closed = False
+        self._error = None  # The last failed write, until flush() or close() raises it
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, text):
+        """
+        Queues text to be saved. Newer text replaces older text that was not written yet.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("autosave writer is closed")
+            self._pending = text
+            self._cond.notify_all()
+
+    def flush(self):
+        """
+        Waits until everything submitted so far is on disk.
+        Raises the error of a write that failed since the last flush() or close().
+        """
+        with self._cond:
+            self._hurry = True
+            self._cond.notify_all()
+            while self._pending is not None or self._writing:
+                self._cond.wait()
+            self._hurry = False  # The next submit waits for company again
+            self._raise_error()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Writes anything still waiting and stops the background thread.
+        Raises the error of a write that failed since the last flush() or close().
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._cond:
+            self._raise_error()
+
+    def _run(self):
+        with self._cond:
+            while True:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return  # Closed and nothing left to write
+
+                # Give more changes a moment to arrive so they share one write
+                deadline = time.monotonic() + self.delay
+                while not self._closed and not self._hurry:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                text, self._pending = self._pending, None
+                self._writing = True
+                self._cond.release()
+                try:
+                    write_atomic(self.path, text)
+                    self.writes += 1
+                except Exception as e:  # A full disk, or text that cannot be written; keep the thread alive
+                    print(f"⚠️ Autosave failed: {e}")
+                    self._error = e
+                finally:
+                    self._cond.acquire()
+                    self._writing = False
+                    if self._pending is None:
+                        self._hurry = False
+                    self._cond.notify_all()
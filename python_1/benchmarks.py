@@ -0,0 +1,317 @@
+# Spooky Forest Adventure - Benchmarks
+# Times the engine's hot paths against made-up worlds of growing size, so a slow change
+# shows up as a number instead of as a laggy classroom.
+#
+# Example:
+#   python benchmarks.py --sizes 10,1000 --save-baseline bench_baseline.json
+#   python benchmarks.py --sizes 10,1000 --baseline bench_baseline.json
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from content import compile_content, mask_of
+from forest_engine import SCORE_CATEGORIES, GameEngine, silent_output
+from leaderboard import Leaderboard
+
+"""What is measured:
+
+Every benchmark runs one engine operation many times against a synthetic world with
+`size` quizzes, `size` items (ten per room, the rooms laid out as a grid) and `size`
+leaderboard rows:
+
+ask_quiz         draw a quiz and answer it
+handle_hazard    draw a hazard and answer it
+take_item        pick a random item in a random room
+check_end        the "all mission items found?" test
+save_game        write the save file (the game carries one mission item per room visited)
+load_game        read and restore that save file
+show_leaderboard the top 5 plus the player's own rank
+route            the way to the nearest mission item from a random room of the grid
+
+For each one the report shows operations per second, the median (p50) and 99th
+percentile (p99) time of one operation, and the peak memory of a separate, shorter run
+under tracemalloc (tracemalloc slows everything down, so it is never timed)."""
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+DEFAULT_OPS = 1000
+MEMORY_OPS = 50  # Operations in the tracemalloc run
+ROUTE_SPACING = 97  # route: one room in this many still holds a mission item
+# Flag a benchmark when it reaches less than 80% of the baseline ops/sec and its median got
+# slower too; a few disk stalls can pull ops/sec down without the typical operation changing
+REGRESSION = 0.8
+
+# -----------------------------
+# Synthetic Worlds
+# -----------------------------
+
+QUIZ_CATEGORIES = [category for category in SCORE_CATEGORIES if category not in ("Items", "Hazards")]
+
+def make_quizzes(size):
+    for number in range(size):
+        yield {"id": f"quiz-{number}", "category": QUIZ_CATEGORIES[number % len(QUIZ_CATEGORIES)],
+               "question": f"What is {number} + 1?", "choices": [str(number), str(number + 1), str(number + 2)],
+               "answer": str(number + 1)}
+
+def make_hazards(size):
+    for number in range(size):
+        yield {"id": f"hazard-{number}", "scenario": f"Hazard number {number}!", "choices": ["Run", "Hide"],
+               "answer": "Hide", "explanations": {"Run": "Too slow.", "Hide": "Safe."}}
+
+def grid_exits(room, count, side):
+    """
+    The exits of a room in a square grid of count rooms, side rooms wide.
+    """
+    exits = {}
+    row, column = divmod(room, side)
+    for direction, (other, ok) in (("north", (room - side, row > 0)), ("south", (room + side, room + side < count)),
+                                   ("west", (room - 1, column > 0)), ("east", (room + 1, column < side - 1 and room + 1 < count))):
+        if ok:
+            exits[direction] = f"Room {other}"
+    return exits
+
+def make_world(size):
+    """
+    A compiled world with size quizzes, size hazards and size items, ten items per room.
+    The rooms form a square grid entered from the Clearing; the first item in every
+    room is a mission item.
+    """
+    rooms = {"Clearing": {"description": "The start.", "exits": {"north": "Room 0"}, "items": []}}
+    missions = []
+    count = max(1, size // 10)
+    side = math.isqrt(count - 1) + 1
+    for room in range(count):
+        items = [f"item {room}-{number}" for number in range(min(10, size))]
+        missions.append(items[0])
+        rooms[f"Room {room}"] = {"description": f"Room number {room}.", "exits": grid_exits(room, count, side),
+                                 "items": items}
+    rooms["Room 0"]["exits"]["back"] = "Clearing"
+    return compile_content(rooms, make_quizzes(size), make_hazards(size), missions, "Clearing")
+
+def make_engine(world, rng, **kwargs):
+    options = {"input_fn": None, "output_fn": silent_output, "save_file": None, "results_file": None}
+    options.update(kwargs)
+    engine = GameEngine(rng=rng, content=world, **options)
+    engine.life_points = 10 ** 9  # Never lose, so no benchmark ends the game
+    return engine
+
+def answer(generator, text="1"):
+    """
+    Runs a prompt-asking engine step (ask_quiz, handle_hazard) with one answer.
+    """
+    try:
+        next(generator)
+        generator.send(text)
+    except StopIteration:
+        pass
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+
+# Each benchmark is setup(world, size, rng, folder) -> operation, where operation() does one timed step
+
+def bench_ask_quiz(world, size, rng, folder):
+    engine = make_engine(world, rng)
+
+    def operation():
+        if not engine.quiz_deck:
+            engine.quiz_deck = type(engine.quiz_deck)(world.quizzes, "category", rng.getrandbits(32), id_key="id")
+        answer(engine.ask_quiz(), rng.choice("123"))
+    return operation
+
+def bench_handle_hazard(world, size, rng, folder):
+    engine = make_engine(world, rng)
+
+    def operation():
+        if not engine.hazard_deck:
+            engine.hazard_deck = type(engine.hazard_deck)(world.hazards, rng.getrandbits(32), id_key="id")
+        answer(engine.handle_hazard(), rng.choice("12"))
+    return operation
+
+def bench_take_item(world, size, rng, folder):
+    engine = make_engine(world, rng)
+    rooms = world.rooms[1:]
+
+    def operation():
+        room = rng.choice(rooms)
+        engine.current_room = room.name
+        engine.take_item(world.items[rng.choice(room.items)].name)
+    return operation
+
+def carrying_engine(world, rng, **kwargs):
+    """
+    An engine that has visited every room and carries its mission item, with some cards drawn.
+    """
+    engine = make_engine(world, rng, **kwargs)
+    missions = [room.items[0] for room in world.rooms[1:]]
+    engine.inventory = [world.items[item].name for item in missions]
+    engine.carried = mask_of(missions)
+    engine.missions_carried = len(missions)
+    for _ in range(min(len(world.quizzes), 1000)):
+        engine.quiz_deck.draw(rng=rng)
+    return engine
+
+def bench_check_end(world, size, rng, folder):
+    engine = carrying_engine(world, rng)
+    engine.missions_carried -= 1  # One mission item short, so the game goes on
+    return engine.check_end
+
+def bench_save_game(world, size, rng, folder):
+    engine = carrying_engine(world, rng, save_file=os.path.join(folder, "bench_save.json"))
+    return engine.save_game
+
+def bench_load_game(world, size, rng, folder):
+    save_file = os.path.join(folder, "bench_load.json")
+    carrying_engine(world, rng, save_file=save_file).save_game()
+    engine = make_engine(world, rng, save_file=save_file)
+    return engine.load_game
+
+def bench_show_leaderboard(world, size, rng, folder):
+    leaderboard = Leaderboard(os.path.join(folder, f"bench_{size}.db"))
+    if not len(leaderboard):
+        leaderboard.add_many((f"player {number}", rng.randint(-5, 60), rng.randint(0, 4), "bench")
+                             for number in range(size))
+    engine = make_engine(world, rng, leaderboard=leaderboard)
+    engine.score_id = leaderboard.add("me", 0)  # Usually far from the top, so its rank is looked up too
+    return engine.show_leaderboard
+
+def bench_route(world, size, rng, folder):
+    engine = make_engine(world, rng)
+    rooms = world.rooms[1:]
+    # Every room but one in ROUTE_SPACING is done, so the nearest mission item is some steps away
+    engine.completed = mask_of(room.id for room in rooms if room.id % ROUTE_SPACING)
+
+    def operation():
+        engine.current_room = rng.choice(rooms).name
+        engine.show_route()
+    return operation
+
+BENCHMARKS = {
+    "ask_quiz": bench_ask_quiz,
+    "handle_hazard": bench_handle_hazard,
+    "take_item": bench_take_item,
+    "check_end": bench_check_end,
+    "save_game": bench_save_game,
+    "load_game": bench_load_game,
+    "show_leaderboard": bench_show_leaderboard,
+    "route": bench_route,
+}
+
+# -----------------------------
+# Running
+# -----------------------------
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_one(name, world, size, ops, folder, seed):
+    """
+    Times one benchmark and returns its result row.
+    """
+    setup = BENCHMARKS[name]
+    operation = setup(world, size, random.Random(seed), folder)
+    timings = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for _ in range(ops):
+        before = clock()
+        operation()
+        timings.append(clock() - before)
+    total = clock() - started
+    timings.sort()
+
+    operation = setup(world, size, random.Random(seed), folder)
+    tracemalloc.start()
+    for _ in range(min(ops, MEMORY_OPS)):
+        operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"benchmark": name, "size": size, "ops": ops, "ops_per_sec": ops / (total / 1e9),
+            "p50_us": percentile(timings, 0.5) / 1000, "p99_us": percentile(timings, 0.99) / 1000,
+            "peak_kb": peak / 1024}
+
+def run(sizes, names, ops, seed=0, folder=None):
+    """
+    Runs every benchmark at every size. Returns the result rows.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(dir=folder) as folder:
+        for size in sizes:
+            started = time.perf_counter()
+            world = make_world(size)
+            print(f"🌲 World of {size:,} built in {time.perf_counter() - started:.1f}s")
+            for name in names:
+                row = run_one(name, world, size, ops, folder, seed)
+                results.append(row)
+                print_row(row)
+    return results
+
+# -----------------------------
+# Report
+# -----------------------------
+
+def print_header():
+    print(f"{'benchmark':18} {'size':>10} {'ops/sec':>12} {'p50 µs':>10} {'p99 µs':>10} {'peak KB':>10}")
+
+def print_row(row, note=""):
+    print(f"{row['benchmark']:18} {row['size']:>10,} {row['ops_per_sec']:>12,.0f} {row['p50_us']:>10.1f} "
+          f"{row['p99_us']:>10.1f} {row['peak_kb']:>10.1f} {note}")
+
+def compare(results, baseline):
+    """
+    Prints every result next to its baseline. Returns the number of regressions.
+    """
+    before = {(row["benchmark"], row["size"]): row for row in baseline}
+    regressions = 0
+    print("\n📏 Compared with the baseline (ops/sec now / before)")
+    print_header()
+    for row in results:
+        old = before.get((row["benchmark"], row["size"]))
+        if old is None:
+            print_row(row, "(new)")
+            continue
+        ratio = row["ops_per_sec"] / old["ops_per_sec"]
+        slower = ratio < REGRESSION and old["p50_us"] / row["p50_us"] < REGRESSION
+        regressions += slower
+        print_row(row, f"{ratio:5.2f}x {'❌ slower' if slower else '✅'}")
+    return regressions
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Spooky Forest engine")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated world sizes (default: %(default)s)")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="timed operations per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="compare with this baseline JSON file; exits 1 on a regression")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results as a new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size.replace("_", "")) for size in args.sizes.split(",")]
+    names = args.only or list(BENCHMARKS)
+    print_header()
+    results = run(sizes, names, args.ops, args.seed)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            return 1 if compare(results, json.load(f)) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
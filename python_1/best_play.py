@@ -0,0 +1,413 @@
+# Spooky Forest Adventure - Best Play
+# Works out the best way to play the July30 rules (which room to enter, which item to take,
+# when to leave empty-handed) and the score it gets, so a content change that makes some
+# trick pay off shows up before the students find it.
+#
+# Example:
+#   python best_play.py
+#   python best_play.py --accuracy 0.8 --quizzes 40 --hazards 20 --workers 4
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+from content_pack import load_pack
+from forest_engine import CONTENT, DEFAULT_RULES, Rules
+from simulate import PCorrectPolicy, make_deck, parse_accuracy
+from win_odds import hub_rooms
+
+"""How the best play is found:
+
+The solver plays expectimax over the rules of forest_engine. The player decides which
+room to enter, which item to take (or to leave, which costs a hazard but keeps the room
+open) and whether to quit; chance decides which quiz or hazard comes up and whether the
+player answers it right (with their accuracy, as the p-correct bot of simulate.py).
+The score is the final life points, as on the leaderboard.
+
+As in win_odds.py the world must be a hub (a start room surrounded by dead ends, such as
+the spooky forest or a world grown with world_gen.py --layout hub), and a
+state is (life points, mission items needed, fresh rooms of each kind, quizzes left per
+accuracy, hazards left): after each visit the player is back in the start room, and
+rooms alike (with or without a mission item, with or without other items) are interchangeable. Every move uses up a room or a card, so
+the game tree has no cycles. A move that uses up nothing (walking into a room and out
+again once both decks are empty) changes nothing and is never worth making.
+
+States repeat all over the tree, so their values are kept in a transposition table,
+and states that must have the same best play share one entry: once the player has more
+life points than they could possibly lose in the rest of the game, more points only add
+to the score, and once the mission items left can no longer all be found, how many are
+missing stops mattering. With plain rules (rewards add, penalties take away) two more
+shortcuts are exact: taking a cursed item is never better than leaving, and once both
+decks are empty nothing is left to chance, so the rest of the game is worked out directly.
+
+To use more than one core, the root is split: the states a few visits into the game
+(the frontier) are shared out between worker processes, each with its own table, and
+the top of the tree is then solved with their values."""
+
+TASKS_PER_WORKER = 8  # Frontier states per worker process, so the work evens out
+MAX_FRONTIER_DEPTH = 4  # Room visits the root is expanded before it is shared out
+EPSILON = 1e-12  # Moves must beat the best so far by this much, so ties keep the first move
+
+class BestPlay:
+    """
+    Expectimax over the rules of one hub world, for one player accuracy.
+    """
+
+    def __init__(self, kinds, start, quiz_chances, hazard_chance, rules=DEFAULT_RULES, allow_leave=True):
+        self.kinds = kinds  # [(has a mission item, has other items)] of each kind of room
+        self.start = start
+        self.quiz_chances = quiz_chances
+        self.hazard_chance = hazard_chance
+        self.rules = rules
+        self.allow_leave = allow_leave  # False: every room visit ends with taking an item
+        self.plain_rules = min(rules[1:]) >= 0  # Rewards add and penalties take away, as in the +1/-1 rules
+        self.table = {}  # state -> (value, best move)
+        self.hazard_table = {}  # (life, needed, rooms, quizzes, hazards) before the hazard -> value
+
+    @classmethod
+    def for_world(cls, policy, content=CONTENT, rules=DEFAULT_RULES, quizzes=None, hazards=None, allow_leave=True):
+        kinds, _ = hub_rooms(content)  # Rooms without items change nothing, so they are never worth entering
+        plain = min(rules[1:]) >= 0
+        rooms = Counter()
+        for (_, missions, others), count in kinds.items():
+            # One pick completes a room, so a player who knows the items only cares whether
+            # a room has a mission item and whether it has anything else (which never
+            # matters next to a mission item once cursed items are never worth taking)
+            others = 0 if missions and allow_leave and plain else min(others, 1)
+            rooms[(min(missions, 1), others)] += count
+        quizzes = content.quizzes if quizzes is None else quizzes
+        hazards = content.hazards if hazards is None else hazards
+        by_chance = Counter(policy.chance(quiz.category) for quiz in quizzes)
+        start = (0, content.mission_count, tuple(rooms.values()), tuple(by_chance.values()), len(hazards))
+        return cls(list(rooms), start, list(by_chance), policy.chance("Hazards"), rules, allow_leave)
+
+    # ---------- Rules ----------
+
+    def quiz_steps(self, life, quizzes):
+        """
+        (probability, life points, quizzes left) of the quiz asked when a room is entered.
+        """
+        left = sum(quizzes)
+        if not left:
+            return [(1.0, life, quizzes)]
+        steps = []
+        for group, count in enumerate(quizzes):
+            if count:
+                drawn = quizzes[:group] + (count - 1,) + quizzes[group + 1:]
+                chance = self.quiz_chances[group]
+                steps.append((count / left * chance, life + self.rules.quiz_reward, drawn))
+                steps.append((count / left * (1 - chance), life - self.rules.quiz_penalty, drawn))
+        return steps
+
+    def hazard_steps(self, life, hazards):
+        if not hazards:
+            return [(1.0, life, hazards)]
+        return [(self.hazard_chance, life + self.rules.hazard_reward, hazards - 1),
+                (1 - self.hazard_chance, life - self.rules.hazard_penalty, hazards - 1)]
+
+    def item_moves(self, state, kind, quizzes_before):
+        """
+        The moves after the quiz in a room of this kind: {move: final score, or (life, needed, rooms)
+        going into the hazard}. state has the quiz already taken from the deck; quizzes_before is
+        the deck on entering.
+        """
+        life, needed, rooms, quizzes, hazards = state
+        missions, others = self.kinds[kind]
+        done = rooms[:kind] + (rooms[kind] - 1,) + rooms[kind + 1:]
+        leave = self.allow_leave and (hazards or quizzes != quizzes_before)
+        moves = {}
+        if missions:
+            moves["mission"] = (life + self.rules.item_reward, needed - 1, done)
+        # With plain rules a cursed item is never better than leaving: both end in a hazard,
+        # and leaving keeps the life point and the room
+        if others and (self.allow_leave or not missions) and not (leave and self.plain_rules):
+            cursed = life - self.rules.item_penalty
+            moves["cursed"] = cursed if cursed < 0 else (cursed, needed, done)
+        if leave:
+            moves["leave"] = (life, needed, rooms)
+        return moves
+
+    def after_hazard(self, life, needed, rooms, quizzes, hazards):
+        """
+        [(probability, final score or next state)] of the hazard that ends a visit (handle_hazard, then check_end).
+        """
+        outcomes = []
+        for chance, hazard_life, hazards_after in self.hazard_steps(life, hazards):
+            if hazard_life < 0 or needed <= 0:
+                outcomes.append((chance, hazard_life))  # Lost, or won
+            else:
+                outcomes.append((chance, (hazard_life, needed, rooms, quizzes, hazards_after)))
+        return outcomes
+
+    def safe_life(self, rooms, quizzes, hazards):
+        """
+        The most life points the rest of the game could still take away.
+        """
+        return (sum(quizzes) * self.rules.quiz_penalty + hazards * self.rules.hazard_penalty
+                + sum(rooms) * self.rules.item_penalty)
+
+    def canonical(self, state):
+        """
+        The state that shares a table entry with this one, and the score difference between them.
+        Past the life points that can still be lost, extra points just add to the score; once
+        the mission items left cannot all be found, how many are missing no longer matters.
+        """
+        life, needed, rooms, quizzes, hazards = state
+        cap = self.safe_life(rooms, quizzes, hazards)
+        findable = sum(count for count, (missions, _) in zip(rooms, self.kinds) if missions)
+        if life > cap or needed > findable + 1:
+            return (min(life, cap), min(needed, findable + 1), rooms, quizzes, hazards), max(0, life - cap)
+        return state, 0
+
+    # ---------- Solving ----------
+
+    def value(self, state):
+        """
+        The expected final score of the best play from a state, with the player in the start room.
+        """
+        known = self.table.get(state)
+        if known is not None:
+            return known[0]
+        life, needed, rooms, quizzes, hazards = state
+        if not hazards and not any(quizzes) and self.plain_rules:
+            # Nothing is left to chance: take the mission items that are left (the last one
+            # wins), never a cursed one, then stop
+            findable = sum(count for count, (missions, _) in zip(rooms, self.kinds) if missions)
+            return float(life + self.rules.item_reward * min(needed, findable))
+        same, extra = self.canonical(state)
+        if same != state:
+            return extra + self.value(same)
+
+        best, best_move = float(life), "quit"
+        for kind, count in enumerate(rooms):
+            if not count:
+                continue
+            enter = 0.0
+            for chance, quiz_life, quizzes_after in self.quiz_steps(life, quizzes):
+                if quiz_life < 0:
+                    enter += chance * quiz_life
+                else:
+                    taken = (quiz_life, needed, rooms, quizzes_after, hazards)
+                    enter += chance * max(self.item_values(taken, kind, quizzes).values())
+            if enter > best + EPSILON:
+                best, best_move = enter, kind
+        self.table[state] = (best, best_move)
+        return best
+
+    def hazard_value(self, life, needed, rooms, quizzes, hazards):
+        """
+        The expected final score from the hazard that ends a room visit. Many visits end the
+        same way, so these have a table of their own.
+        """
+        key = (life, needed, rooms, quizzes, hazards)
+        known = self.hazard_table.get(key)
+        if known is None:
+            known = self.hazard_table[key] = sum(
+                chance * (after if not isinstance(after, tuple) else self.value(after))
+                for chance, after in self.after_hazard(life, needed, rooms, quizzes, hazards))
+        return known
+
+    def item_values(self, state, kind, quizzes_before):
+        """
+        {move: expected score} of every item move, the quiz already answered.
+        """
+        _, _, _, quizzes, hazards = state
+        return {move: after if not isinstance(after, tuple) else self.hazard_value(*after, quizzes, hazards)
+                for move, after in self.item_moves(state, kind, quizzes_before).items()}
+
+    def best_item(self, state, kind, quizzes_before):
+        values = self.item_values(state, kind, quizzes_before)
+        best = max(values.values())
+        return next(move for move, value in values.items() if value >= best - EPSILON)
+
+    def move(self, state):
+        """
+        The best move from a state: "quit" or the kind of room to enter.
+        """
+        state, _ = self.canonical(state)
+        self.value(state)
+        known = self.table.get(state)
+        if known is None:  # Nothing left to chance (see value()): go for a mission item while one is needed
+            _, needed, rooms, _, _ = state
+            return next((kind for kind, count in enumerate(rooms) if count and needed > 0 and self.kinds[kind][0]), "quit")
+        return known[1]
+
+    def outcomes(self, state, kind, quizzes_before, move):
+        """
+        [(probability, final score or next state)] of an item move.
+        """
+        after = self.item_moves(state, kind, quizzes_before)[move]
+        if not isinstance(after, tuple):
+            return [(1.0, after)]
+        return self.after_hazard(*after, state[3], state[4])
+
+    def children(self, state):
+        """
+        Every state one room visit after this one, whatever the player does.
+        """
+        life, needed, rooms, quizzes, hazards = state
+        for kind, count in enumerate(rooms):
+            if not count:
+                continue
+            for _, quiz_life, quizzes_after in self.quiz_steps(life, quizzes):
+                if quiz_life < 0:
+                    continue
+                taken = (quiz_life, needed, rooms, quizzes_after, hazards)
+                for move in self.item_moves(taken, kind, quizzes):
+                    for _, after in self.outcomes(taken, kind, quizzes, move):
+                        if isinstance(after, tuple):
+                            yield self.canonical(after)[0]
+
+    def frontier(self, size):
+        """
+        The states a few visits into the game: at least size of them, if the game is that big.
+        """
+        layer = {self.start}
+        for _ in range(MAX_FRONTIER_DEPTH):
+            if len(layer) >= size:
+                break
+            layer = {child for state in layer for child in self.children(state)}
+        return sorted(layer)
+
+    def solve(self, workers=1):
+        """
+        Solves the game from the start. With more than one worker the frontier below the
+        root is solved in worker processes first. Returns the expected score of best play.
+        """
+        if workers > 1:
+            states = self.frontier(workers * TASKS_PER_WORKER)
+            if len(states) > 1:
+                with multiprocessing.Pool(workers, initializer=init_worker, initargs=(self,)) as pool:
+                    for solved in pool.imap_unordered(solve_states, states, chunksize=1):
+                        self.table.update(solved)
+        return self.value(self.start)
+
+    # ---------- Reading the Policy ----------
+
+    def odds(self, state, memo=None):
+        """
+        Chances of each ending under best play from a state: {"win"/"lose"/"quit": probability}.
+        """
+        memo = {} if memo is None else memo
+        state, _ = self.canonical(state)
+        if state in memo:
+            return memo[state]
+        kind = self.move(state)
+        if kind == "quit":
+            result = Counter(quit=1.0)
+        else:
+            result = Counter()
+            life, needed, rooms, quizzes, hazards = state
+            for chance, quiz_life, quizzes_after in self.quiz_steps(life, quizzes):
+                if quiz_life < 0:
+                    result["lose"] += chance
+                    continue
+                taken = (quiz_life, needed, rooms, quizzes_after, hazards)
+                move = self.best_item(taken, kind, quizzes)
+                for after_chance, after in self.outcomes(taken, kind, quizzes, move):
+                    if isinstance(after, tuple):
+                        for outcome, odds in self.odds(after, memo).items():
+                            result[outcome] += chance * after_chance * odds
+                    else:
+                        result["lose" if after < 0 else "win"] += chance * after_chance
+        memo[state] = result
+        return result
+
+    def likely_game(self):
+        """
+        The moves of best play when every answer goes the most likely way, as text lines.
+        """
+        lines, state = [], self.start
+        while True:
+            kind = self.move(state)
+            if kind == "quit":
+                lines.append(f"quit with {state[0]} life points")
+                return lines
+            life, needed, rooms, quizzes, hazards = state
+            chance, quiz_life, quizzes_after = max(self.quiz_steps(life, quizzes), key=lambda step: step[0])
+            missions, others = self.kinds[kind]
+            room = ("a room with " + ("a mission item" if missions else "no mission item")
+                    + (" and other items" if others else ""))
+            if quiz_life < 0:
+                lines.append(f"enter {room}, lose on the quiz")
+                return lines
+            taken = (quiz_life, needed, rooms, quizzes_after, hazards)
+            move = self.best_item(taken, kind, quizzes)
+            _, after = max(self.outcomes(taken, kind, quizzes, move), key=lambda outcome: outcome[0])
+            lines.append(f"enter {room}, {'take the mission item' if move == 'mission' else 'take a cursed item' if move == 'cursed' else 'leave empty-handed'}")
+            if not isinstance(after, tuple):
+                lines.append(f"{'lose' if after < 0 else 'win'} with {after} life points")
+                return lines
+            state = after
+
+# -----------------------------
+# Worker Processes
+# -----------------------------
+
+_solver = None  # The BestPlay of this worker process, with its own transposition table
+
+def init_worker(solver):
+    global _solver
+    _solver = solver
+    _solver.table = {}
+    _solver.hazard_table = {}
+
+def solve_states(state):
+    """
+    Worker entry point: solves one frontier state. Returns only that state's table entry;
+    the rest of the worker's table stays behind for its next states.
+    """
+    _solver.value(state)
+    return {state: _solver.table[state]}
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Best play of the Spooky Forest rules and the score it gets.")
+    parser.add_argument("--accuracy", action="append", metavar="[CATEGORY=]P",
+                        help="chance of a right answer, optionally per category, as in simulate.py (repeatable)")
+    parser.add_argument("--quizzes", type=int, default=None, help="quiz deck size (default: all quizzes)")
+    parser.add_argument("--hazards", type=int, default=None, help="hazard deck size (default: all hazards)")
+    parser.add_argument("--world", metavar="PACK", help="a hub world to solve instead of the spooky forest "
+                                                        "(world_gen.py --layout hub; grid worlds cannot be solved)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    for field in Rules._fields:
+        parser.add_argument("--" + field.replace("_", "-"), type=int, default=getattr(DEFAULT_RULES, field))
+    args = parser.parse_args(argv)
+
+    policy = PCorrectPolicy(*parse_accuracy(args.accuracy))
+    rules = Rules(**{field: getattr(args, field) for field in Rules._fields})
+    content = load_pack(args.world) if args.world else CONTENT
+    quizzes = make_deck(content.quizzes, args.quizzes)
+    hazards = make_deck(content.hazards, args.hazards)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * (len(content.rooms) + len(quizzes) + len(hazards)) + 1000))
+
+    started = time.perf_counter()
+    try:
+        best = BestPlay.for_world(policy, content, rules, quizzes, hazards)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    score = best.solve(args.workers)
+    solved = time.perf_counter() - started
+    straight = BestPlay.for_world(policy, content, rules, quizzes, hazards, allow_leave=False)
+    straight_score = straight.solve(args.workers)
+    odds = best.odds(best.start)
+
+    print(f"🧠 Best play: {len(content.rooms) - 1} rooms, {len(quizzes)} quizzes, {len(hazards)} hazards, accuracy {policy.accuracy}")
+    print(f"Expected score (final life points): {score:.3f}")
+    print(f"Win {odds['win']:.2%} | lose {odds['lose']:.2%} | quit {odds['quit']:.2%}")
+    print(f"Never leaving a room empty-handed:  {straight_score:.3f} (leaving rooms is worth {score - straight_score:+.3f})")
+    print("\n🗺️ Best play when every answer goes the likely way:")
+    for number, line in enumerate(best.likely_game(), 1):
+        print(f"{number:3}. {line}")
+    print(f"\n⏱️ Solved in {solved:.2f}s with {args.workers} worker process{'es' if args.workers != 1 else ''}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,163 @@
+# Spooky Forest Adventure - Compiled Content
+# Turns the authored rooms, quizzes and hazards (dicts keyed by display names) into
+# compact records with integer ids, so games can track items and rooms as bitsets.
+
+"""How compiled content is laid out:
+
+Every room and every item gets an integer id, in the order they first appear. Items are
+identified by their casefolded name, so "Map" and "map" are the same item everywhere.
+
+Room, Item, Quiz and Hazard are records with __slots__: no per-record dict, and every
+string is shared with the authored content instead of copied.
+
+A game's set of carried items is one int with bit (1 << item id) set for each item in it,
+so "is it carried?" and "are all mission items found?" are single integer operations.
+Rooms keep a short tuple of item ids instead: a bitset per room would be as wide as the
+highest item id in it, which adds up fast in a world with a million items.
+
+The rooms and their exits form a directed graph. adjacency[room id] is the tuple of
+room ids the room's exits lead to, so walking the graph needs no name lookups."""
+
+def mask_of(ids):
+    """
+    The bitset with a bit set for each id. Built in a bytearray, so it takes linear time
+    even for very large ids (adding up 1 << id ints would copy the growing int every time).
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for number in ids:
+        bits[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(bits, "little")
+
+def ids_of(mask):
+    """
+    The ids whose bits are set in a bitset, smallest first. The bits are searched with
+    str.find, so a sparse mask over a million ids costs little more than its set bits.
+    """
+    bits = bin(mask)[:1:-1]  # Lowest bit first, without the "0b"
+    ids = []
+    number = bits.find("1")
+    while number >= 0:
+        ids.append(number)
+        number = bits.find("1", number + 1)
+    return ids
+
+# -----------------------------
+# Records
+# -----------------------------
+
+class Room:
+    __slots__ = ("id", "name", "description", "exits", "items")
+
+    def __init__(self, id, name, description, exits, items):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.exits = exits  # {direction: room id}
+        self.items = items  # Item ids in the order the room lists them (a room holds a handful)
+
+class Item:
+    __slots__ = ("id", "name", "key", "mission")
+
+    def __init__(self, id, name, mission):
+        self.id = id
+        self.name = name
+        self.key = name.casefold()
+        self.mission = mission
+
+class Quiz:
+    __slots__ = ("number", "id", "category", "question", "choices", "answer")
+
+    def __init__(self, number, quiz):
+        self.number = number
+        self.id = quiz["id"]  # Stable id used by saves
+        self.category = quiz["category"]
+        self.question = quiz["question"]
+        self.choices = tuple(quiz["choices"])
+        self.answer = quiz["answer"]
+
+class Hazard:
+    __slots__ = ("number", "id", "scenario", "choices", "answer", "explanations")
+
+    def __init__(self, number, hazard):
+        self.number = number
+        self.id = hazard["id"]
+        self.scenario = hazard["scenario"]
+        self.choices = tuple(hazard["choices"])
+        self.answer = hazard["answer"]
+        self.explanations = tuple(hazard["explanations"][choice] for choice in self.choices)
+
+    def explanation(self, choice):
+        return self.explanations[self.choices.index(choice)]
+
+# -----------------------------
+# Compiled World
+# -----------------------------
+
+class Content:
+    """
+    One compiled world. Shared by every game and never changed.
+    """
+    __slots__ = ("version", "rooms", "room_ids", "adjacency", "items", "item_ids", "missions", "mission_mask",
+                 "mission_count", "start_room", "categories", "quizzes", "hazards", "graph")
+
+    def __init__(self):
+        self.graph = None  # The world's exit_graph.ExitGraph, made the first time a game asks for a route
+
+    def item_names(self, mask):
+        """
+        The names of the items in a bitset, in item id order.
+        """
+        return [self.items[item].name for item in ids_of(mask)]
+
+    def room_mask(self, names):
+        return mask_of(self.room_ids[name] for name in names)
+
+    def room_names(self, mask):
+        return [self.rooms[room].name for room in ids_of(mask)]
+
+def compile_content(rooms, quizzes, hazards, mission_items, start_room, version=None):
+    """
+    Compiles authored content into a Content.
+    Raises ValueError if an exit or the start room names a room that does not exist.
+    """
+    content = Content()
+    content.version = version
+    content.room_ids = {name: number for number, name in enumerate(rooms)}
+    content.item_ids = {}
+    mission_keys = {item.casefold() for item in mission_items}
+    items = []
+    compiled_rooms = []
+    for name, room in rooms.items():
+        room_items = []
+        for item_name in room["items"]:
+            key = item_name.casefold()
+            if key not in content.item_ids:
+                content.item_ids[key] = len(items)
+                items.append(Item(len(items), item_name, key in mission_keys))
+            room_items.append(content.item_ids[key])
+        exits = {direction: room_id(content, target) for direction, target in room["exits"].items()}
+        compiled_rooms.append(Room(content.room_ids[name], name, room["description"], exits, tuple(room_items)))
+
+    content.rooms = tuple(compiled_rooms)
+    content.adjacency = tuple(tuple(room.exits.values()) for room in compiled_rooms)
+    content.items = tuple(items)
+    content.missions = tuple(item.id for item in items if item.mission)
+    content.mission_mask = mask_of(content.missions)
+    content.mission_count = len(content.missions)
+    if len(mission_keys) != content.mission_count:
+        missing = mission_keys - set(content.item_ids)
+        raise ValueError(f"mission items not in any room: {', '.join(sorted(missing))}")
+    content.start_room = room_id(content, start_room)
+    content.quizzes = tuple(Quiz(number, quiz) for number, quiz in enumerate(quizzes))
+    content.hazards = tuple(Hazard(number, hazard) for number, hazard in enumerate(hazards))
+    content.categories = tuple(dict.fromkeys(quiz.category for quiz in content.quizzes))
+    return content
+
+def room_id(content, name):
+    try:
+        return content.room_ids[name]
+    except KeyError:
+        raise ValueError(f"unknown room {name!r}") from None
@@ -0,0 +1,604 @@
+# Spooky Forest Adventure - Content Packs
+# Compiles authored content (rooms, quizzes, hazards in JSON or YAML) into a checked,
+# pre-indexed binary pack that the engine memory-maps at startup instead of building
+# the whole world from Python literals on every import.
+#
+# Example:
+#   python content_pack.py check content/spooky_forest.json
+#   python content_pack.py build content/spooky_forest.json
+#   python content_pack.py info content/spooky_forest.pack
+
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+from content import Content, Hazard, Item, Quiz, Room, mask_of
+
+"""What the authored content looks like (JSON, or YAML with the same keys):
+
+{"content": "spooky-forest-1",                  version name that saves and replays check
+ "start_room": "Clearing",
+ "mission_items": ["flashlight", ...],
+ "rooms": {"Clearing": {"description": "...", "exits": {"north": "Dark Cave", ...}, "items": [...]}, ...},
+ "quizzes": [{"id": "math-1", "category": "Math", "question": "...", "choices": [...], "answer": "..."}, ...],
+ "hazards": [{"id": "dragon", "scenario": "...", "choices": [...], "answer": "...", "explanations": {...}}, ...]}
+
+How a pack is laid out (little-endian):
+
+header      b"SFPK", pack format (u16), section count (u16), 4 spare bytes
+sections    one (tag, offset, length) entry per section, then the sections themselves
+
+STRS is every distinct string once, as UTF-8. Every other section is a table of u32
+numbers, and strings are (offset, length) pairs into STRS. Rooms, items and their
+exits are fixed-size rows, so room number n is found without reading the rooms before it.
+RIDX and IIDX are open-addressing hash tables (crc32 of the UTF-8 name, linear probing)
+from room names and item keys to ids, so a lookup reads a slot or two instead of
+building a dict of the whole world.
+
+Loading maps the file and reads the header, quizzes and hazards (a quiz
+bank is small). In a big pack, rooms and items are only decoded when the game first
+touches them, so a pack with a hundred thousand rooms opens about as fast as one with five. Worker processes that
+map the same pack share its pages instead of each building their own copy.
+
+The pack remembers a fingerprint (crc32 and length) of the source it was built from; load_content() rebuilds it
+whenever the source has changed."""
+
+PACK_MAGIC = b"SFPK"
+PACK_FORMAT = 2  # 2: no separate directions table, the game walks the rooms' exits
+HEADER = struct.Struct("<4sHH4x")
+SECTION = struct.Struct("<4sQQ")
+EMPTY = 0xFFFFFFFF  # An unused hash table slot
+# Packs with up to this many rooms and items are decoded whole when they are opened (a few
+# milliseconds): plain tuples and dicts are faster to look things up in than the pack views
+EAGER_LIMIT = 2000
+
+# u32 numbers per row of each table
+ROOM_ROW = 8  # name, description, first exit, exits, first room item, items
+ITEM_ROW = 5  # name, key, mission
+EXIT_ROW = 3  # direction, room id
+QUIZ_ROW = 8  # id, category number, question, first choice, choices, answer number
+HAZARD_ROW = 7  # id, scenario, first choice, choices, answer number
+CHOICE_ROW = 4  # text, explanation (empty for quiz choices)
+
+# -----------------------------
+# Authored Content
+# -----------------------------
+
+def load_source(path):
+    """
+    Reads authored content from a .json, .yaml or .yml file. Returns (content dict, raw bytes).
+    YAML needs PyYAML, which is only imported when a YAML file is read.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: reading YAML content needs PyYAML (pip install pyyaml)") from None
+        return yaml.safe_load(raw), raw
+    return json.loads(raw), raw
+
+def source_digest(raw):
+    """
+    A fingerprint of the source bytes, kept in the pack to notice an edited source.
+    """
+    return f"{zlib.crc32(raw):08x}-{len(raw)}"
+
+def validate(source):
+    """
+    Checks authored content. Returns a list of problems, empty if the content is fine.
+    """
+    problems = []
+    for key, kind in (("content", str), ("start_room", str), ("mission_items", list), ("rooms", dict), ("quizzes", list), ("hazards", list)):
+        if not isinstance(source.get(key), kind):
+            problems.append(f"{key}: missing or not a {kind.__name__}")
+    if problems:
+        return problems
+
+    rooms = source["rooms"]
+    if source["start_room"] not in rooms:
+        problems.append(f"start_room: unknown room {source['start_room']!r}")
+
+    item_keys = set()
+    for name, room in rooms.items():
+        if not isinstance(room.get("description"), str):
+            problems.append(f"rooms.{name}: no description")
+        for direction, target in room.get("exits", {}).items():
+            if target not in rooms:
+                problems.append(f"rooms.{name}.exits.{direction}: unknown room {target!r}")
+        for item in room.get("items", []):
+            item_keys.add(item.casefold())
+    for item in source["mission_items"]:
+        if item.casefold() not in item_keys:
+            problems.append(f"mission_items: {item!r} is not in any room")
+
+    for kind in ("quizzes", "hazards"):
+        text = "question" if kind == "quizzes" else "scenario"
+        required = ("id", "category", text, "choices", "answer") if kind == "quizzes" else \
+                   ("id", text, "choices", "answer", "explanations")
+        seen = set()
+        for number, card in enumerate(source[kind]):
+            where = f"{kind}[{number}]"
+            missing = [key for key in required if key not in card]
+            if missing:
+                problems.append(f"{where}: missing {', '.join(missing)}")
+                continue
+            where = f"{kind}.{card['id']}"
+            if card["id"] in seen:
+                problems.append(f"{where}: id used twice")
+            seen.add(card["id"])
+            if len(set(card["choices"])) != len(card["choices"]) or not card["choices"]:
+                problems.append(f"{where}: choices must be distinct and not empty")
+            if card["answer"] not in card["choices"]:
+                problems.append(f"{where}: answer {card['answer']!r} is not one of its choices")
+            if kind == "hazards":
+                for choice in card["choices"]:
+                    if choice not in card["explanations"]:
+                        problems.append(f"{where}: no explanation for {choice!r}")
+    return problems
+
+# -----------------------------
+# Compiling
+# -----------------------------
+
+class HashIndex:
+    """
+    An open-addressing hash table from names to ids, sized up front and filled one name at a time.
+    """
+
+    def __init__(self, count):
+        self.size = 1 << max(3, (2 * count).bit_length())  # At most half full
+        self.slots = array("I", [EMPTY]) * self.size
+        self.used = 0
+
+    def add(self, key, number):
+        if 2 * (self.used + 1) > self.size:
+            raise ValueError("more names than the pack was sized for")
+        mask = self.size - 1
+        slot = zlib.crc32(key.encode("utf-8")) & mask
+        while self.slots[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        self.slots[slot] = number
+        self.used += 1
+
+class PackWriter:
+    """
+    Builds one pack a room at a time. Tables are u32 arrays and names go straight into
+    the hash indexes, so memory grows with the size of the pack itself rather than with
+    Python objects per room: a generator can stream a million rooms through it.
+    Rooms and items get ids in the order they are added.
+    """
+
+    def __init__(self, room_count, item_count):
+        self.strings = bytearray()
+        self.string_refs = {}  # str -> (offset, length), so repeated text is stored once
+        self.tables = {}  # tag -> array of u32, in the order the sections are written
+        self.room_index = HashIndex(room_count)
+        self.item_index = HashIndex(item_count)
+        self.room_count = 0
+        self.item_count = 0
+
+    def text(self, value, shared=True):
+        """
+        Adds a string and returns its (offset, length). Strings that are known to be
+        unique (room names) pass shared=False and skip the lookup of repeated text.
+        """
+        ref = self.string_refs.get(value) if shared else None
+        if ref is None:
+            data = value.encode("utf-8")
+            ref = (len(self.strings), len(data))
+            self.strings += data
+            if shared:
+                self.string_refs[value] = ref
+        return ref
+
+    def table(self, tag):
+        return self.tables.setdefault(tag, array("I"))
+
+    def add_room(self, name, description, exits, items):
+        """
+        Adds the next room. exits is a list of (direction, room id), items a list of item ids.
+        Returns the room id.
+        """
+        exit_rows, room_items = self.table("EXIT"), self.table("RITM")
+        self.table("ROOM").extend((*self.text(name, shared=False), *self.text(description),
+                                   len(exit_rows) // EXIT_ROW, len(exits), len(room_items), len(items)))
+        for direction, target in exits:
+            exit_rows.extend((*self.text(direction), target))
+        room_items.extend(items)
+        self.room_index.add(name, self.room_count)
+        self.room_count += 1
+        return self.room_count - 1
+
+    def add_item(self, name, mission):
+        """
+        Adds the next item and returns its id.
+        """
+        key = name.casefold()
+        name_ref = self.text(name)
+        self.table("ITEM").extend((*name_ref, *(name_ref if key == name else self.text(key)), mission))
+        self.item_index.add(key, self.item_count)
+        self.item_count += 1
+        return self.item_count - 1
+
+    def add_cards(self, quizzes, hazards):
+        """
+        Adds the quizzes and hazards (authored dicts).
+        """
+        categories = list(dict.fromkeys(quiz["category"] for quiz in quizzes))
+        self.table("CATS").extend(number for category in categories for number in self.text(category))
+        choices = self.table("CHOI")
+        quiz_rows = self.table("QUIZ")
+        for quiz in quizzes:
+            quiz_rows.extend((*self.text(quiz["id"]), categories.index(quiz["category"]), *self.text(quiz["question"]),
+                              len(choices) // CHOICE_ROW, len(quiz["choices"]), quiz["choices"].index(quiz["answer"])))
+            for choice in quiz["choices"]:
+                choices.extend((*self.text(choice), 0, 0))
+        hazard_rows = self.table("HAZD")
+        for hazard in hazards:
+            hazard_rows.extend((*self.text(hazard["id"]), *self.text(hazard["scenario"]), len(choices) // CHOICE_ROW,
+                                len(hazard["choices"]), hazard["choices"].index(hazard["answer"])))
+            for choice in hazard["choices"]:
+                choices.extend((*self.text(choice), *self.text(hazard["explanations"][choice])))
+
+    def finish(self, version, source_digest, start_room, missions):
+        """
+        Adds the mission item ids, the indexes and the header numbers. Call once, last.
+        """
+        self.tables["MISN"] = array("I", sorted(missions))
+        self.tables["RIDX"] = self.room_index.slots
+        self.tables["IIDX"] = self.item_index.slots
+        self.tables["META"] = array("I", (*self.text(version), *self.text(source_digest), start_room,
+                                          self.room_count, self.item_count))
+
+    def write(self, f):
+        """
+        Writes the pack to a binary file object.
+        """
+        sections = [(b"STRS", memoryview(self.strings))]
+        for tag, values in self.tables.items():
+            if sys.byteorder != "little":
+                values = array("I", values)
+                values.byteswap()
+            sections.append((tag.encode("ascii"), memoryview(values).cast("B")))
+        offset = HEADER.size + SECTION.size * len(sections)
+        f.write(HEADER.pack(PACK_MAGIC, PACK_FORMAT, len(sections)))
+        places = []
+        for tag, data in sections:
+            offset += -offset % 8  # Every table starts on an 8-byte boundary
+            places.append(offset)
+            f.write(SECTION.pack(tag, offset, len(data)))
+            offset += len(data)
+        position = HEADER.size + SECTION.size * len(sections)
+        for (_, data), place in zip(sections, places):
+            f.write(b"\0" * (place - position))
+            f.write(data)
+            position = place + len(data)
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def save(self, path):
+        """
+        Writes the pack to a temporary file first, so a game starting at the same moment
+        never maps half a pack. Returns the size of the pack in bytes.
+        """
+        import tempfile  # Only needed when a pack is written, so it stays off the startup path
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.write(f)
+                size = f.tell()
+            # mkstemp makes the file private (0600); give the pack the mode a plain open() would,
+            # so other users of a shared install can load it instead of compiling it again
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return size
+
+def compile_pack(source, source_digest=""):
+    """
+    Checks authored content and compiles it. Returns the PackWriter; call to_bytes() or save().
+    Raises ValueError listing every problem if the content is not valid.
+    """
+    problems = validate(source)
+    if problems:
+        raise ValueError("invalid content:\n  " + "\n  ".join(problems))
+
+    rooms = source["rooms"]
+    room_ids = {name: number for number, name in enumerate(rooms)}
+    item_keys = {item.casefold() for room in rooms.values() for item in room.get("items", [])}
+    mission_keys = {item.casefold() for item in source["mission_items"]}
+    pack = PackWriter(len(rooms), len(item_keys))
+    item_ids = {}
+    for name, room in rooms.items():
+        items = []
+        for item in room.get("items", []):
+            key = item.casefold()
+            if key not in item_ids:
+                item_ids[key] = pack.add_item(item, key in mission_keys)
+            items.append(item_ids[key])
+        exits = [(direction, room_ids[target]) for direction, target in room.get("exits", {}).items()]
+        pack.add_room(name, room["description"], exits, items)
+    pack.add_cards(source["quizzes"], source["hazards"])
+    pack.finish(source["content"], source_digest, room_ids[source["start_room"]],
+                [item_ids[key] for key in mission_keys])
+    return pack
+
+def build(source_path, pack_path):
+    """
+    Compiles a source file into a pack file. Returns the size of the pack in bytes.
+    """
+    source, raw = load_source(source_path)
+    return compile_pack(source, source_digest(raw)).save(pack_path)
+
+# -----------------------------
+# Loading
+# -----------------------------
+
+class PackReader:
+    """
+    The sections of one pack, read straight from a buffer (normally a read-only mmap).
+    """
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        magic, pack_format, count = HEADER.unpack_from(self.buffer)
+        if magic != PACK_MAGIC:
+            raise ValueError("not a content pack")
+        if pack_format != PACK_FORMAT:
+            raise ValueError(f"unknown content pack format {pack_format}")
+        self.sections = {}
+        for number in range(count):
+            tag, offset, length = SECTION.unpack_from(self.buffer, HEADER.size + number * SECTION.size)
+            self.sections[tag.decode("ascii")] = self.buffer[offset:offset + length]
+        self.strings = self.sections["STRS"]
+        self.tables = {tag: self.numbers(view) for tag, view in self.sections.items() if tag != "STRS"}
+
+    @staticmethod
+    def numbers(view):
+        if sys.byteorder == "little":
+            return view.cast("I")
+        return struct.unpack(f"<{len(view) // 4}I", view)  # Big-endian machines read a copy
+
+    def text(self, offset, length):
+        return str(self.strings[offset:offset + length], "utf-8")
+
+    def same_text(self, offset, length, data):
+        return self.strings[offset:offset + length] == data
+
+class Records(Sequence):
+    """
+    A read-only list of records that are decoded from the pack on first use.
+    """
+
+    def __init__(self, count, decode):
+        self.count = count
+        self.decode = decode
+        self.cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, number):
+        if isinstance(number, slice):
+            return [self[i] for i in range(*number.indices(self.count))]
+        if number < 0:
+            number += self.count
+        if not 0 <= number < self.count:
+            raise IndexError("record number out of range")
+        record = self.cache.get(number)
+        if record is None:
+            record = self.cache[number] = self.decode(number)
+        return record
+
+    def __iter__(self):
+        # One pass over every record (building a route table, say) does not fill the cache
+        cache, decode = self.cache, self.decode
+        return (cache.get(number) or decode(number) for number in range(self.count))
+
+class PackIndex(Mapping):
+    """
+    A read-only {name: id} mapping backed by one of the pack's hash tables.
+    """
+
+    def __init__(self, reader, slots, rows, row_size, column, count):
+        self.reader = reader
+        self.slots = slots
+        self.rows = rows  # The table that holds the names
+        self.row_size = row_size
+        self.column = column  # Where in a row the (offset, length) of the name is
+        self.count = count
+
+    def __getitem__(self, name):
+        data = name.encode("utf-8")
+        mask = len(self.slots) - 1
+        slot = zlib.crc32(data) & mask
+        while True:
+            number = self.slots[slot]
+            if number == EMPTY:
+                raise KeyError(name)
+            row = number * self.row_size + self.column
+            if self.reader.same_text(self.rows[row], self.rows[row + 1], data):
+                return number
+            slot = (slot + 1) & mask
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for number in range(self.count):
+            row = number * self.row_size + self.column
+            yield self.reader.text(self.rows[row], self.rows[row + 1])
+
+def open_pack(buffer):
+    """
+    Returns a Content backed by pack bytes or an mmap of a pack file.
+    """
+    reader = PackReader(buffer)
+    tables = reader.tables
+    text = reader.text
+    rooms, exits, room_items, items = tables["ROOM"], tables["EXIT"], tables["RITM"], tables["ITEM"]
+    choices = tables["CHOI"]
+    meta = tables["META"]
+
+    def decode_room(number):
+        row = number * ROOM_ROW
+        first_exit, exit_count, first_item, item_count = rooms[row + 4:row + 8]
+        room_exits = {}
+        for exit_row in range(first_exit * EXIT_ROW, (first_exit + exit_count) * EXIT_ROW, EXIT_ROW):
+            room_exits[text(exits[exit_row], exits[exit_row + 1])] = exits[exit_row + 2]
+        return Room(number, text(rooms[row], rooms[row + 1]), text(rooms[row + 2], rooms[row + 3]),
+                    room_exits, tuple(room_items[first_item:first_item + item_count]))
+
+    def decode_neighbours(number):
+        # Straight from the exit rows, without decoding any direction names
+        row = number * ROOM_ROW
+        first_exit, exit_count = rooms[row + 4], rooms[row + 5]
+        return tuple(exits[first_exit * EXIT_ROW + 2:(first_exit + exit_count) * EXIT_ROW:EXIT_ROW])
+
+    def decode_item(number):
+        row = number * ITEM_ROW
+        return Item(number, text(items[row], items[row + 1]), bool(items[row + 4]))
+
+    def choice_texts(first, count):
+        rows = range(first * CHOICE_ROW, (first + count) * CHOICE_ROW, CHOICE_ROW)
+        return ([text(choices[row], choices[row + 1]) for row in rows],
+                [text(choices[row + 2], choices[row + 3]) for row in rows])
+
+    cats = tables["CATS"]
+    categories = tuple(text(cats[row], cats[row + 1]) for row in range(0, len(cats), 2))
+    quizzes = []
+    quiz_rows = tables["QUIZ"]
+    for number, row in enumerate(range(0, len(quiz_rows), QUIZ_ROW)):
+        quiz_choices, _ = choice_texts(quiz_rows[row + 5], quiz_rows[row + 6])
+        quizzes.append(Quiz(number, {"id": text(quiz_rows[row], quiz_rows[row + 1]),
+                                     "category": categories[quiz_rows[row + 2]],
+                                     "question": text(quiz_rows[row + 3], quiz_rows[row + 4]),
+                                     "choices": quiz_choices, "answer": quiz_choices[quiz_rows[row + 7]]}))
+    hazards = []
+    hazard_rows = tables["HAZD"]
+    for number, row in enumerate(range(0, len(hazard_rows), HAZARD_ROW)):
+        hazard_choices, explanations = choice_texts(hazard_rows[row + 4], hazard_rows[row + 5])
+        hazards.append(Hazard(number, {"id": text(hazard_rows[row], hazard_rows[row + 1]),
+                                       "scenario": text(hazard_rows[row + 2], hazard_rows[row + 3]),
+                                       "choices": hazard_choices, "answer": hazard_choices[hazard_rows[row + 6]],
+                                       "explanations": dict(zip(hazard_choices, explanations))}))
+
+    content = Content()
+    content.version = text(meta[0], meta[1])
+    content.rooms = Records(meta[5], decode_room)
+    content.adjacency = Records(meta[5], decode_neighbours)
+    content.items = Records(meta[6], decode_item)
+    content.room_ids = PackIndex(reader, tables["RIDX"], rooms, ROOM_ROW, 0, meta[5])
+    content.item_ids = PackIndex(reader, tables["IIDX"], items, ITEM_ROW, 2, meta[6])  # By key, not name
+    if meta[5] + meta[6] <= EAGER_LIMIT:
+        content.rooms, content.items = tuple(content.rooms), tuple(content.items)
+        content.adjacency = tuple(content.adjacency)
+        content.room_ids, content.item_ids = dict(content.room_ids), dict(content.item_ids)
+    content.missions = tuple(tables["MISN"])
+    content.mission_mask = mask_of(content.missions)
+    content.mission_count = len(content.missions)
+    content.start_room = meta[4]
+    content.categories = categories
+    content.quizzes = tuple(quizzes)
+    content.hazards = tuple(hazards)
+    return content
+
+def built_from(buffer):
+    """
+    The fingerprint of the source a pack was compiled from.
+    """
+    reader = PackReader(buffer)
+    meta = reader.tables["META"]
+    return reader.text(meta[2], meta[3])
+
+def map_file(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def load_pack(path):
+    """
+    Maps a pack file and returns its Content.
+    """
+    return open_pack(map_file(path))
+
+def load_content(pack_path, source_path=None):
+    """
+    Returns the Content of a pack, (re)building the pack first if it is missing, unreadable
+    or was built from a different version of the source file. If the pack cannot be
+    written (a read-only install), the content is compiled in memory instead.
+    """
+    if source_path is None:
+        return load_pack(pack_path)
+    with open(source_path, "rb") as f:
+        wanted = source_digest(f.read())
+    try:
+        buffer = map_file(pack_path)
+        if built_from(buffer) == wanted:
+            return open_pack(buffer)
+    except (OSError, ValueError, KeyError, struct.error):
+        pass  # Missing, damaged or from an older pack format: build it again
+    try:
+        build(source_path, pack_path)
+        return load_pack(pack_path)
+    except OSError:
+        source, raw = load_source(source_path)
+        return open_pack(compile_pack(source, source_digest(raw)).to_bytes())
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and compile Spooky Forest content packs")
+    parser.add_argument("command", choices=["check", "build", "info"])
+    parser.add_argument("path", help="check/build: a .json, .yaml or .yml source; info: a .pack file")
+    parser.add_argument("-o", "--output", help="build: where to write the pack (default: next to the source)")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        started = time.perf_counter()
+        content = load_pack(args.path)
+        seconds = time.perf_counter() - started
+        print(f"📦 {args.path}: content {content.version!r}, {os.path.getsize(args.path):,} bytes")
+        print(f"{len(content.rooms):,} rooms, {len(content.items):,} items ({content.mission_count} mission items), "
+              f"{len(content.quizzes)} quizzes, {len(content.hazards)} hazards")
+        print(f"Loaded in {seconds * 1000:.2f} ms")
+        return 0
+
+    try:
+        if args.command == "check":
+            source, _ = load_source(args.path)
+            problems = validate(source)
+            for problem in problems:
+                print(f"❌ {problem}")
+            if not problems:
+                print(f"✅ {args.path} is valid")
+            return 1 if problems else 0
+        output = args.output or os.path.splitext(args.path)[0] + ".pack"
+        started = time.perf_counter()
+        size = build(args.path, output)
+        print(f"📦 Wrote {output} ({size:,} bytes) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return 0
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
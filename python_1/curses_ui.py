@@ -0,0 +1,284 @@
+# Spooky Forest Adventure - Full-Screen Terminal
+# An optional curses front end for the console game: the location, inventory and options
+# stay in place at the top, the story scrolls underneath, and only what changed is sent
+# to the terminal, which keeps the game smooth over a slow SSH link.
+#
+# Example:
+#   python July30Code.py --curses
+
+import curses
+import locale
+import time
+import unicodedata
+from collections import deque
+
+"""How the screen is drawn:
+
+ Spooky Forest Adventure - Lisa                        03:12    title, with the time played
+ You are in the Clearing.                                       status pane (3 lines)
+ Inventory: Empty | ❤️ Life points: 0/12
+ Game Options: north, south, east, west, inventory, ...
+ ─────────────────────────────────────────────────────────────
+ 🧚‍♀️ Quiz (Math): What is 15% of $200?                         story, scrolling
+ ...
+ > _                                                            input line
+
+The game runs through the engine's usual run(): the screen is its output_fn and input_fn,
+and attach() points the engine's show_status() at the status pane instead of the story.
+
+Nothing is drawn while the engine is working. Text it says is kept until it asks for an
+answer; then the whole frame goes out at once: every window is staged with noutrefresh()
+and a single doupdate() sends the difference to the terminal. Status lines are only
+rewritten when their text changed, new story lines scroll the window (the terminal moves
+the lines itself), and each key typed echoes one character.
+
+Input never blocks for long: keys are read with a short timeout, so the clock keeps
+ticking and a resized terminal is redrawn while the player thinks. Ctrl+D quits, like
+the end of input in the plain console."""
+
+TICK_MS = 250  # Longest wait for a key before the screen gets a chance to update
+STORY_LINES = 500  # Story lines kept for redrawing after a resize
+MIN_SIZE = (10, 40)  # Smallest usable terminal (rows, columns)
+STATUS_LINES = 3
+STORY_TOP = STATUS_LINES + 2  # Title and status lines, then the rule
+
+# -----------------------------
+# Text Width
+# -----------------------------
+
+ZERO_WIDTH = {"\u200d", "\ufe0e", "\ufe0f"}  # Zero-width joiner, text and emoji variation selectors
+
+def char_width(char):
+    if char in ZERO_WIDTH or unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in "WF" else 1
+
+def cell_width(text):
+    """
+    How many terminal cells text takes up (emoji and other wide characters take two).
+    """
+    return sum(map(char_width, text))
+
+def wrap(text, width):
+    """
+    Splits one line of text into rows of at most width cells, breaking between words when it can.
+    """
+    rows, row, used = [], "", 0
+    for word in text.split(" "):
+        size = cell_width(word)
+        if row and used + 1 + size > width:
+            rows.append(row)
+            row, used = "", 0
+        while size > width:  # A word longer than a whole row
+            cut, cut_size = "", 0
+            for char in word:
+                if cut_size + char_width(char) > width:
+                    break
+                cut += char
+                cut_size += char_width(char)
+            rows.append(cut)
+            word, size = word[len(cut):], size - cut_size
+        row, used = (f"{row} {word}", used + 1 + size) if row else (word, size)
+    rows.append(row)
+    return rows
+
+# -----------------------------
+# Screen
+# -----------------------------
+
+class CursesScreen:
+    """
+    The full-screen front end of one game. Pass write as output_fn and read_line as input_fn.
+    """
+
+    def __init__(self, title="Spooky Forest Adventure"):
+        self.title = title
+        self.screen = None  # The curses screen, while run() is running
+        self.windows = None  # (title, status, rule, story, entry) windows
+        self.pending = []  # Story lines said since the last frame
+        self.story = deque(maxlen=STORY_LINES)  # Lines already in the story window, for redrawing it
+        self.status = [""] * STATUS_LINES
+        self.shown_status = [None] * STATUS_LINES  # What the status pane shows now
+        self.ending = []  # Story lines since the last status, printed again after the game
+        self.prompt = ""
+        self.typed = ""
+        self.started = time.monotonic()
+        self.shown_clock = None
+        self.engine = None
+
+    def attach(self, engine):
+        """
+        Shows the engine's status in the status pane. Returns the engine.
+        """
+        self.engine = engine
+        engine.show_status = self.show_status
+        return engine
+
+    # ---------- Engine Side ----------
+
+    def write(self, text=""):
+        for line in str(text).split("\n"):
+            self.pending.append(line)
+            self.ending.append(line)
+
+    def show_status(self):
+        self.status = self.engine.status_lines()
+        self.ending = []
+
+    def read_line(self, prompt=""):
+        """
+        Draws a frame, then collects one line of input. Raises EOFError on Ctrl+D.
+        """
+        self.prompt, self.typed = prompt, ""
+        self.frame(entry=True)
+        while True:
+            try:
+                key = self.screen.get_wch()
+            except curses.error:  # No key within TICK_MS
+                self.frame()
+                continue
+            if key == curses.KEY_RESIZE:
+                self.layout()
+            elif key in ("\n", "\r", curses.KEY_ENTER):
+                answer, self.typed = self.typed, ""
+                self.write(f"{prompt}{answer}")
+                return answer
+            elif key == "\x04":
+                raise EOFError("the player pressed Ctrl+D")
+            elif key in ("\b", "\x7f", curses.KEY_BACKSPACE):
+                if self.typed:
+                    self.typed = self.typed[:-1]
+                    self.frame(entry=True)
+            elif isinstance(key, str) and key.isprintable():
+                if cell_width(self.prompt + self.typed + key) < self.columns():
+                    self.typed += key
+                    if self.windows is not None:  # Echo just the new character
+                        entry = self.windows[4]
+                        self.put(entry, 0, cell_width(self.prompt + self.typed) - cell_width(key), key)
+                        entry.noutrefresh()
+                        curses.doupdate()
+
+    # ---------- Drawing ----------
+
+    def columns(self):
+        return self.screen.getmaxyx()[1]
+
+    @staticmethod
+    def put(window, row, column, text, attr=0):
+        try:
+            window.addstr(row, column, text, attr)
+        except curses.error:
+            pass  # Writing the last cell of a window moves the cursor off it; the text is there
+
+    def layout(self):
+        """
+        Builds the windows for the current terminal size and draws everything from scratch.
+        """
+        rows, columns = self.screen.getmaxyx()
+        self.screen.erase()
+        self.screen.noutrefresh()
+        if rows < MIN_SIZE[0] or columns < MIN_SIZE[1]:
+            self.windows = None
+            self.put(self.screen, 0, 0, "Please make the terminal bigger."[:columns - 1])
+            self.screen.noutrefresh()
+            curses.doupdate()
+            return
+        title = curses.newwin(1, columns, 0, 0)
+        status = curses.newwin(STATUS_LINES, columns, 1, 0)
+        rule = curses.newwin(1, columns, STORY_TOP - 1, 0)
+        story = curses.newwin(rows - STORY_TOP - 1, columns, STORY_TOP, 0)
+        entry = curses.newwin(1, columns, rows - 1, 0)
+        story.scrollok(True)
+        story.idlok(True)  # Scroll with the terminal's own insert/delete line
+        title.bkgd(" ", curses.A_REVERSE)
+        rule.hline(0, 0, curses.ACS_HLINE, columns)
+        self.windows = (title, status, rule, story, entry)
+        self.put(title, 0, 1, self.title[:columns - 10], curses.A_REVERSE | curses.A_BOLD)
+        self.shown_status = [None] * STATUS_LINES
+        self.shown_clock = None
+        # The story is wrapped again for the new width, newest rows at the bottom
+        height = rows - STORY_TOP - 1
+        shown = []
+        for line in reversed(self.story):
+            shown[:0] = wrap(line, columns - 1)
+            if len(shown) >= height:
+                break
+        for row, text in enumerate(shown[-height:]):
+            self.put(story, row, 0, text)
+        for window in (title, rule, story):
+            window.noutrefresh()
+        self.frame(entry=True)
+
+    def frame(self, entry=False):
+        """
+        Sends everything that changed since the last frame to the terminal in one go.
+        entry redraws the input line as well.
+        """
+        if self.windows is None:
+            return
+        title, status, _, story, entry_window = self.windows
+        columns = self.columns()
+
+        seconds = int(time.monotonic() - self.started)
+        clock = f"{seconds // 60:02}:{seconds % 60:02}"
+        if clock != self.shown_clock:
+            self.put(title, 0, columns - len(clock) - 1, clock, curses.A_REVERSE)
+            title.noutrefresh()
+            self.shown_clock = clock
+
+        changed = False
+        for row, text in enumerate(self.status):
+            if text != self.shown_status[row]:
+                status.move(row, 0)
+                status.clrtoeol()
+                self.put(status, row, 0, wrap(text, columns - 1)[0], curses.A_BOLD if row == 0 else 0)
+                self.shown_status[row] = text
+                changed = True
+        if changed:
+            status.noutrefresh()
+
+        if self.pending:
+            bottom = story.getmaxyx()[0] - 1
+            for line in self.pending:
+                for text in wrap(line, columns - 1):
+                    story.scroll(1)
+                    self.put(story, bottom, 0, text)
+                self.story.append(line)
+            self.pending = []
+            story.noutrefresh()
+
+        if entry:
+            entry_window.erase()
+            self.put(entry_window, 0, 0, self.prompt + self.typed)
+        # The input line goes last, so the cursor ends up on it
+        entry_window.move(0, min(cell_width(self.prompt + self.typed), columns - 1))
+        entry_window.noutrefresh()
+        curses.doupdate()
+
+    # ---------- Running ----------
+
+    def run(self, engine):
+        """
+        Plays one game on the full screen and returns its GameResult. The end of the game
+        is printed again once the screen is gone, so it stays in the terminal.
+        """
+        locale.setlocale(locale.LC_ALL, "")  # Lets curses draw emoji and other UTF-8
+        result = curses.wrapper(self.play, engine)
+        for line in self.ending:
+            print(line)
+        return result
+
+    def play(self, screen, engine):
+        self.screen = screen
+        screen.timeout(TICK_MS)
+        try:
+            curses.curs_set(1)
+        except curses.error:
+            pass  # Some terminals cannot show or hide the cursor
+        self.layout()
+        result = engine.run()
+        self.prompt, self.typed = "Press any key to leave.", ""
+        self.frame(entry=True)
+        screen.timeout(-1)
+        screen.getch()
+        return result
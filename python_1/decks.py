@@ -0,0 +1,225 @@
+# Spooky Forest Adventure - Card Decks
+# Draws quizzes and hazards without replacement in O(1) time per draw.
+
+import random
+from collections.abc import Mapping
+
+"""How a deck shuffles:
+
+The deck runs a Fisher-Yates shuffle one step at a time. Each draw picks a random card
+from the part of the deck that is left and swaps it to the front. Only the swapped
+positions are remembered, so a deck costs memory for the cards drawn, not for the whole
+content pack, and the content list itself is never changed.
+
+Because every step comes from a seeded random number generator, the deck's whole
+position can be saved as (seed, pos, skip) and rebuilt later by replaying pos draws.
+With id_key set, skip holds the cards' stable ids instead of their card numbers.
+
+The generator is SplitMix64, whose whole state is one integer, instead of random.Random,
+which carries about 2.5 KB of state. A game holds several decks, so this keeps each game
+small. Deck states saved before the switch have no "rng" entry and are replayed with
+random.Random, so older saves still resume with the same cards left."""
+
+MASK64 = (1 << 64) - 1
+
+def card_field(card, name):
+    """
+    Reads a field from a card that is either a dict or a record with attributes.
+    """
+    return card[name] if isinstance(card, Mapping) else getattr(card, name)
+
+class SplitMix64:
+    """
+    A tiny seeded random number generator: one integer of state, 64 random bits per step.
+    """
+    __slots__ = ("state",)
+
+    def __init__(self, seed):
+        self.state = seed & MASK64
+
+    def randrange(self, start, stop):
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        z ^= z >> 31
+        return start + ((z * (stop - start)) >> 64)
+
+# -----------------------------
+# Deck
+# -----------------------------
+
+class Deck:
+    """
+    A shuffled deck of cards drawn without replacement.
+    cards is shared and never modified; skip lists cards that are already out of the
+    deck before the first draw (for example from an older save), by id_key if given
+    or else by card number.
+    """
+
+    __slots__ = ("cards", "id_key", "seed", "skip", "pos", "legacy", "_rng", "_swaps", "_start")
+
+    def __init__(self, cards, seed=None, skip=(), id_key=None, legacy=False):
+        self.cards = cards
+        self.id_key = id_key
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.skip = tuple(skip)
+        self.pos = 0
+        self.legacy = legacy  # Draw with random.Random, like decks saved before SplitMix64
+        self._rng = None  # Made on the first draw, since many decks are never drawn from
+        self._swaps = None  # position -> card number, only for positions moved by a swap
+        self._start = 0
+        for card in self.skip:
+            self._move_to_front(card)
+
+    def __len__(self):
+        return len(self.cards) - self._start
+
+    def _card_at(self, position):
+        return self._swaps.get(position, position) if self._swaps else position
+
+    def _take(self, position):
+        """
+        Swaps the card at position to the front of the remaining deck and returns its number.
+        """
+        front = self._start
+        card = self._card_at(position)
+        if self._swaps is None:
+            self._swaps = {}
+        if position != front:
+            self._swaps[position] = self._card_at(front)
+        self._swaps.pop(front, None)  # The front position is never looked at again
+        self._start += 1
+        return card
+
+    def _card_id(self, card):
+        return card_field(self.cards[card], self.id_key) if self.id_key else card
+
+    def _move_to_front(self, card_id):
+        # Used only while building the deck, so a linear search is fine here
+        for position in range(self._start, len(self.cards)):
+            if self._card_id(self._card_at(position)) == card_id:
+                self._take(position)
+                return
+        raise ValueError(f"card {card_id} is not in the deck")
+
+    def draw(self):
+        """
+        Draws one random card, or returns None when the deck is empty.
+        """
+        if self._start >= len(self.cards):
+            return None
+        if self._rng is None:
+            self._rng = random.Random(self.seed) if self.legacy else SplitMix64(self.seed)
+        card = self._take(self._rng.randrange(self._start, len(self.cards)))
+        self.pos += 1
+        return self.cards[card]
+
+    def remaining(self):
+        """
+        Returns the cards still in the deck (takes time for the whole deck).
+        """
+        return [self.cards[self._card_at(p)] for p in range(self._start, len(self.cards))]
+
+    def state(self):
+        """
+        Compact position of the deck: enough to rebuild it with Deck.restore().
+        """
+        state = {"seed": self.seed, "pos": self.pos, "skip": self.skip}
+        if not self.legacy:
+            state["rng"] = "splitmix64"
+        return state
+
+    @classmethod
+    def restore(cls, cards, state, id_key=None):
+        """
+        Rebuilds a deck from state() by replaying its draws.
+        """
+        deck = cls(cards, state["seed"], state.get("skip", ()), id_key, "rng" not in state)
+        for _ in range(state["pos"]):
+            deck.draw()
+        return deck
+
+# -----------------------------
+# Decks by Category
+# -----------------------------
+
+class CategoryDecks:
+    """
+    One Deck per category (for example one per score_breakdown category of quizzes).
+    draw(category) draws from one category; draw() draws from all of them, picking a
+    category in proportion to the cards it has left so every remaining card is equally likely.
+    """
+
+    __slots__ = ("key", "seed", "decks")
+
+    def __init__(self, cards, key="category", seed=None, skip=None, id_key=None, legacy=False):
+        self.key = key
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.decks = {}
+        for number, (category, category_cards) in enumerate(group_cards(cards, key).items()):
+            category_skip = (skip or {}).get(category, ())
+            # Each category gets its own seed made from the shared one
+            self.decks[category] = Deck(category_cards, self.seed * 1000 + number, category_skip, id_key, legacy)
+
+    def __len__(self):
+        return sum(len(deck) for deck in self.decks.values())
+
+    def draw(self, category=None, rng=random):
+        """
+        Draws one card from the given category, or from any category when category is None.
+        Returns None when there is nothing left to draw.
+        """
+        if category is not None:
+            deck = self.decks.get(category)
+            return deck.draw() if deck else None
+        left = len(self)
+        if not left:
+            return None
+        # The number of categories is small and fixed, so this walk is constant time
+        pick = rng.randrange(left)
+        for deck in self.decks.values():
+            if pick < len(deck):
+                return deck.draw()
+            pick -= len(deck)
+
+    def remaining(self):
+        return [card for deck in self.decks.values() for card in deck.remaining()]
+
+    def state(self):
+        state = {
+            "seed": self.seed,
+            "pos": {category: deck.pos for category, deck in self.decks.items() if deck.pos},
+            "skip": {category: deck.skip for category, deck in self.decks.items() if deck.skip},
+        }
+        if not any(deck.legacy for deck in self.decks.values()):
+            state["rng"] = "splitmix64"
+        return state
+
+    @classmethod
+    def restore(cls, cards, state, key="category", id_key=None):
+        decks = cls(cards, key, state["seed"], state.get("skip"), id_key, "rng" not in state)
+        for category, pos in state.get("pos", {}).items():
+            for _ in range(pos):
+                decks.decks[category].draw()
+        return decks
+
+# Grouping the same card list again (for every new game) reuses the first grouping
+_groups = {}
+
+def group_cards(cards, key):
+    """
+    Splits cards into {category: tuple of cards}, keeping their order.
+    Groupings of tuples are cached, so games sharing one content pack share the category lists too.
+    """
+    cache_key = (id(cards), key) if isinstance(cards, tuple) else None
+    cached = _groups.get(cache_key)
+    if cached is not None and cached[0] is cards:
+        return cached[1]
+    by_category = {}
+    for card in cards:
+        by_category.setdefault(card_field(card, key), []).append(card)
+    groups = {category: tuple(category_cards) for category, category_cards in by_category.items()}
+    if cache_key is not None:
+        _groups[cache_key] = (cards, groups)
+    return groups
@@ -0,0 +1,156 @@
+# Spooky Forest Adventure - Exit Graph
+# Finds routes through the rooms' exits, so a world with tens of thousands of rooms can
+# still tell the player which way to go.
+
+from array import array
+from collections import OrderedDict, deque
+
+from content import ids_of, mask_of
+
+"""How routes are found:
+
+The exits form a directed graph with one node per room. content.adjacency gives the
+neighbours of a room in O(1); the graph builds the reverse edges (who leads here?) the
+first time it needs them, as two flat int arrays (the rooms leading into room r are
+sources[starts[r]:starts[r + 1]]), which keeps a million-room world to a few megabytes.
+
+A route query asks for the shortest way from a room to the nearest of a set of target
+rooms. Instead of searching from the player's room, the graph searches backwards from
+all targets at once and writes down, for every room, the next room on a shortest way to
+its nearest target. That table answers the question for every starting room, so walking
+around never searches again: each route is read off by following next hops, in time for
+the length of the route.
+
+Tables are kept per set of targets (a bitset of room ids) in a small least-recently-used
+cache. The graph belongs to the shared content, so every game still looking for the same
+rooms (every new game, for example) reuses the same table. Collecting an item changes the
+set, which costs one new search over the world."""
+
+TABLE_CACHE = 16  # Next-hop tables kept; each is 4 bytes per room
+UNREACHED = -1
+
+class ExitGraph:
+    """
+    Shortest routes through the exits of one compiled world.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.reverse = None  # (starts, sources) of the reverse edges, built on first use
+        self.tables = OrderedDict()  # target bitset -> array of next hops
+        self.mission_rooms = None  # (bitset of rooms with mission items, item -> rooms, room -> items)
+
+    def neighbours(self, room):
+        return self.content.adjacency[room]
+
+    def reverse_edges(self):
+        """
+        (starts, sources): the rooms with an exit into room r are sources[starts[r]:starts[r + 1]].
+        """
+        if self.reverse is None:
+            count = len(self.content.rooms)
+            targets, origins = array("i"), array("i")
+            for room, neighbours in enumerate(self.content.adjacency):
+                targets.extend(neighbours)
+                origins.extend([room] * len(neighbours))
+            starts = array("i", [0]) * (count + 1)
+            for target in targets:
+                starts[target + 1] += 1
+            for room in range(count):
+                starts[room + 1] += starts[room]
+            fill = starts[:-1]
+            sources = array("i", [0]) * len(targets)
+            for target, origin in zip(targets, origins):
+                sources[fill[target]] = origin
+                fill[target] += 1
+            self.reverse = (starts, sources)
+        return self.reverse
+
+    def next_hops(self, targets):
+        """
+        The next-hop table toward the nearest of the target rooms (a bitset of room ids):
+        table[room] is the next room on a shortest route, the room itself for a target,
+        or UNREACHED when no route exists.
+        """
+        table = self.tables.get(targets)
+        if table is not None:
+            self.tables.move_to_end(targets)
+            return table
+
+        starts, sources = self.reverse_edges()
+        table = array("i", [UNREACHED]) * (len(starts) - 1)
+        queue = deque(ids_of(targets))
+        for room in queue:
+            table[room] = room
+        while queue:
+            room = queue.popleft()
+            for previous in sources[starts[room]:starts[room + 1]]:
+                if table[previous] == UNREACHED:
+                    table[previous] = room
+                    queue.append(previous)
+
+        self.tables[targets] = table
+        if len(self.tables) > TABLE_CACHE:
+            self.tables.popitem(last=False)
+        return table
+
+    def route(self, start, targets):
+        """
+        The room ids on a shortest route from start to the nearest target, start first.
+        Returns None if no target can be reached.
+        """
+        if not targets:
+            return None
+        table = self.next_hops(targets)
+        if table[start] == UNREACHED:
+            return None
+        path = [start]
+        while table[path[-1]] != path[-1]:
+            path.append(table[path[-1]])
+        return path
+
+    def route_to(self, start, target):
+        return self.route(start, 1 << target)
+
+    def directions(self, path):
+        """
+        Turns a route of room ids into the exit names to take, one per step.
+        """
+        rooms = self.content.rooms
+        steps = []
+        for here, there in zip(path, path[1:]):
+            steps.append(next(direction for direction, room in rooms[here].exits.items() if room == there))
+        return steps
+
+    def index_missions(self):
+        rooms = {}  # mission item id -> ids of the rooms it lies in
+        missions = {}  # room id -> its mission item ids
+        for room in self.content.rooms:
+            for item in room.items:
+                if self.content.items[item].mission:
+                    rooms.setdefault(item, []).append(room.id)
+                    missions.setdefault(room.id, []).append(item)
+        self.mission_rooms = (mask_of(missions), rooms, missions)
+
+    def mission_targets(self, carried, completed):
+        """
+        The bitset of rooms that still hold a mission item the player has not got,
+        skipping rooms already completed. Takes time for the items carried, not for the world.
+        """
+        if self.mission_rooms is None:
+            self.index_missions()
+        room_mask, item_rooms, room_missions = self.mission_rooms
+        targets = room_mask & ~completed
+        for item in ids_of(carried & self.content.mission_mask):
+            for room in item_rooms[item]:
+                if targets >> room & 1 and all(carried >> other & 1 for other in room_missions[room]):
+                    targets &= ~(1 << room)
+        return targets
+
+def graph_of(content):
+    """
+    The ExitGraph of a compiled world, made once and shared by every game that plays it.
+    """
+    if content.graph is None:
+        content.graph = ExitGraph(content)
+    return content.graph
@@ -0,0 +1,672 @@
+# Spooky Forest Adventure - Game Engine
+# The rules of July30Code.py without the terminal: input and output are plugged in,
+# and the end of a game is returned as a result instead of calling sys.exit().
+
+import json
+import os
+import random
+from collections import namedtuple
+
+from content import mask_of
+from content_pack import load_content
+from decks import CategoryDecks, Deck
+from exit_graph import graph_of
+from leaderboard import format_entry, top_lines
+
+"""How the engine talks to the player:
+
+play()
+
+A generator that runs one whole game. Every time the game needs an answer it yields a
+Prompt (kind, text, data) and waits for the answer to be sent back with send().
+When the game is over it returns a GameResult.
+
+run()
+
+Drives play() with input_fn/output_fn. By default these are input() and print(), so
+run() plays exactly like the old console game. Pass ScriptedInput and silent_output to
+play a whole session without a terminal.
+
+Pass timer=phase_timing.PhaseTimer() to measure where the time of a game goes; without a
+timer the engine runs no timing code at all."""
+
+# -----------------------------
+# Content
+# -----------------------------
+
+# Rooms, quizzes and hazards are authored in content/spooky_forest.json and compiled to a
+# binary pack (see content_pack.py), which is memory-mapped here and shared by every engine.
+# Saves refer to quizzes and hazards by id, so never reuse or renumber an id in the source.
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+CONTENT_SOURCE = os.path.join(CONTENT_DIR, "spooky_forest.json")
+CONTENT_PACK = os.path.join(CONTENT_DIR, "spooky_forest.pack")
+
+CONTENT = load_content(CONTENT_PACK, CONTENT_SOURCE)
+CONTENT_VERSION = CONTENT.version  # Bump "content" in the source whenever rooms, quizzes or hazards change
+
+MISSION_ITEMS = frozenset(CONTENT.items[item].name for item in CONTENT.missions)  # Correct items to find
+MISSION_KEYS = frozenset(item.casefold() for item in MISSION_ITEMS)  # Same items, ready for case-insensitive lookups
+
+# Score categories, in the order the summary shows them
+SCORE_CATEGORIES = CONTENT.categories + ("Items", "Hazards")
+
+# Commands that work in every room, after the room's own exits
+COMMANDS = ("inventory", "points", "route", "save", "load", "quit")
+ROUTE_STEPS_SHOWN = 12  # A route command lists at most this many steps
+
+# -----------------------------
+# Scoring Rules
+# -----------------------------
+
+# Life points won or lost for each kind of answer (the +1/-1 rules)
+Rules = namedtuple("Rules", ["max_life_points", "quiz_reward", "quiz_penalty",
+                             "hazard_reward", "hazard_penalty", "item_reward", "item_penalty"])
+
+DEFAULT_RULES = Rules(max_life_points=12, quiz_reward=1, quiz_penalty=1,
+                      hazard_reward=1, hazard_penalty=1, item_reward=1, item_penalty=1)
+
+# -----------------------------
+# Save Format
+# -----------------------------
+
+SAVE_FORMAT = 2  # Version of the savegame.json layout
+
+def migrate_save(save_data, rng=random):
+    """
+    Turns an older savegame.json, which held every remaining quiz and hazard as a full dict,
+    into the current format. Saves that already have a format number are returned unchanged.
+    """
+    if "format" in save_data:
+        return save_data
+
+    # Cards that are no longer in the old save were already drawn
+    remaining_questions = {quiz["question"] for quiz in save_data.get("quizzes", [])}
+    remaining_scenarios = {hazard["scenario"] for hazard in save_data.get("hazards", [])}
+    quiz_skip = {}
+    for quiz in CONTENT.quizzes:
+        if quiz.question not in remaining_questions:
+            quiz_skip.setdefault(quiz.category, []).append(quiz.id)
+    hazard_skip = [hazard.id for hazard in CONTENT.hazards if hazard.scenario not in remaining_scenarios]
+
+    # Old saves did not record completed rooms; a room is done once its mission item is carried
+    carried = {item.casefold() for item in save_data["inventory"]}
+    completed = [room.name for room in CONTENT.rooms
+                 if any(CONTENT.items[item].key in carried for item in room.items)]
+
+    return {
+        "format": SAVE_FORMAT,
+        "content": CONTENT_VERSION,
+        "current_room": save_data["current_room"],
+        "inventory": save_data["inventory"],
+        "completed_rooms": completed,
+        "life_points": save_data["life_points"],
+        "score_breakdown": save_data["score_breakdown"],
+        "decks": {
+            "quizzes": {"seed": rng.getrandbits(32), "pos": {}, "skip": quiz_skip},
+            "hazards": {"seed": rng.getrandbits(32), "pos": 0, "skip": hazard_skip},
+        },
+    }
+
+# -----------------------------
+# Engine Types
+# -----------------------------
+
+# What the engine is waiting for: kind is "proceed", "command", "quiz", "hazard" or "item",
+# text is what a terminal would show, data is the open directions, the Quiz/Hazard record or the list of room items
+Prompt = namedtuple("Prompt", ["kind", "text", "data"])
+
+# How a game ended: outcome is "win", "lose", "quit" or "declined"
+GameResult = namedtuple("GameResult", ["outcome", "player_name", "life_points", "inventory", "score_breakdown", "turns"])
+
+class GameEnded(Exception):
+    """
+    Raised inside the engine when the game is over.
+    Takes the place of sys.exit() and carries the GameResult back up to play().
+    """
+    def __init__(self, result):
+        super().__init__(result.outcome)
+        self.result = result
+
+class ScriptedInput:
+    """
+    Plays the part of input() for scripted sessions.
+    Hands out the given answers one at a time and raises EOFError when they run out.
+    """
+    def __init__(self, lines):
+        self._lines = iter(lines)
+
+    def __call__(self, prompt=""):
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise EOFError("scripted input ran out") from None
+
+def silent_output(*args, **kwargs):
+    """
+    Plays the part of print() when nobody is watching.
+    """
+
+# -----------------------------
+# Engine
+# -----------------------------
+
+class GameEngine:
+    """
+    One game of Spooky Forest Adventure.
+    Every engine has its own rooms, decks and score, so any number of games can run in one process.
+    """
+
+    def __init__(self, player_name="You", input_fn=input, output_fn=print,
+                 save_file="savegame.json", results_file="game_results.txt",
+                 rng=None, rules=DEFAULT_RULES, quizzes=None, hazards=None, leaderboard=None,
+                 replay_log=None, content=CONTENT, timer=None):
+        self.player_name = player_name
+        self.input_fn = input_fn
+        self.output_fn = output_fn
+        self.save_file = save_file
+        self.results_file = results_file  # None skips writing game results
+        self.leaderboard = leaderboard  # A leaderboard.Leaderboard, or None to keep scores to this game
+        self.score_id = None  # Row id of this game's score once it is recorded
+        self.rng = rng if rng is not None else random.Random()
+        self.replay_log = replay_log  # A replay.ReplayLog that also records every loaded save, or None
+        self.rules = rules
+
+        # Content is compiled once and shared by every engine. A game only keeps what it changed:
+        # its inventory, the carried and completed bitsets and the positions of its decks
+        self.content = content
+        self.quizzes = content.quizzes if quizzes is None else quizzes
+        self.hazards = content.hazards if hazards is None else hazards
+        self.quiz_deck = CategoryDecks(self.quizzes, "category", self.rng.getrandbits(32), id_key="id")
+        self.hazard_deck = Deck(self.hazards, self.rng.getrandbits(32), id_key="id")
+        self.max_life_points = rules.max_life_points
+
+        self.start_room = content.rooms[content.start_room].name
+        self.current_room = self.start_room
+        self.inventory = []  # Item names in the order they were taken
+        self.carried = 0  # Bitset of the item ids in the inventory
+        self.missions_carried = 0  # How many of them are mission items
+        self.life_points = 0
+        self.completed = 0  # Bitset of the room ids already completed
+        self.score_breakdown = {category: 0 for category in SCORE_CATEGORIES}
+        self.turns = 0
+
+        self.timer = timer  # A phase_timing.PhaseTimer, or None
+        if timer is not None:
+            timer.attach(self)
+
+    # ---------- Driving the game ----------
+
+    def run(self):
+        """
+        Plays one game with input_fn and output_fn and returns the GameResult.
+        Running out of input (EOFError) counts as quitting.
+        """
+        session = self.play()
+        try:
+            prompt = next(session)
+            while True:
+                try:
+                    answer = self.input_fn(prompt.text)
+                except EOFError:
+                    session.close()
+                    return self.result("quit")
+                prompt = session.send(answer)
+        except StopIteration as stop:
+            return stop.value
+
+    def play(self):
+        """
+        Runs one game as a generator.
+        Yields a Prompt whenever an answer is needed and returns the GameResult at the end.
+        """
+        try:
+            yield from self.intro()
+            while True:
+                yield from self.turn()
+        except GameEnded as ended:
+            return ended.result
+
+    def ask(self, kind, text, data=None):
+        """
+        Waits for one answer from the player.
+        """
+        answer = yield Prompt(kind, text, data)
+        self.turns += 1
+        return answer.strip()
+
+    def say(self, text=""):
+        self.output_fn(text)
+
+    def result(self, outcome):
+        return GameResult(outcome, self.player_name, self.life_points, list(self.inventory),
+                          dict(self.score_breakdown), self.turns)
+
+    def finish(self, outcome):
+        """
+        Records the score, shows the summary and leaderboard, saves results, and ends the game.
+        """
+        if self.leaderboard is not None:
+            self.score_id = self.leaderboard.add(self.player_name, self.life_points, len(self.inventory), "July30")
+        self.show_summary()
+        self.show_leaderboard()
+        self.save_results_to_file()
+        raise GameEnded(self.result(outcome))
+
+    # ---------- Game steps ----------
+
+    def intro(self):
+        """
+        Explains the mission and asks the player whether to proceed.
+        """
+        self.say(f"\n🧚‍♀️ Fairy: Welcome, {self.player_name}! You must collect {self.content.mission_count} key items to survive and escape.")
+        self.say("The right items give +1 life point, the wrong ones lose -1 point.")
+        self.say("Your skills in math, tech, budgeting, project management, and cybersecurity will be tested.")
+        choice = (yield from self.ask("proceed", "Do you wish to proceed? (yes/no): ")).lower()
+        if choice != "yes":
+            self.say("👋 You choose not to proceed. Game over.")
+            raise GameEnded(self.result("declined"))
+        self.say("✨ Be brave and choose your path!")
+
+    def turn(self):
+        """
+        One pass of the main game loop: show stats, read a command and carry it out.
+        """
+        # Show current location and player stats
+        room = self.room(self.current_room)
+        self.show_status()
+
+        command = (yield from self.ask("command", "> ", self.open_directions())).lower()
+
+        if command == "quit":
+            self.say("👋 You chose to rest forever...")
+            self.finish("quit")
+        elif command == "inventory":
+            self.say(f"🎒 Inventory: {', '.join(self.inventory) if self.inventory else 'Empty'}")
+        elif command == "points":
+            self.say(f"❤️ Life points: {self.life_points}")
+        elif command == "save":
+            self.save_game()
+        elif command == "load":
+            self.load_game()
+        elif command == "route":
+            self.show_route()
+        elif command in room.exits:
+            yield from self.enter_room(self.content.rooms[room.exits[command]].name)
+        else:
+            self.say("❓ Invalid command.")
+
+    def status_lines(self):
+        """
+        Where the player is, what they carry and which commands they can type.
+        """
+        room = self.room(self.current_room)
+        return [f"You are in the {self.current_room}.",
+                f"Inventory: {', '.join(self.inventory) if self.inventory else 'Empty'} | ❤️ Life points: {self.life_points}/{self.max_life_points}",
+                f"Game Options: {', '.join([*room.exits, *COMMANDS])}"]
+
+    def show_status(self):
+        location, stats, options = self.status_lines()
+        self.say(f"\n{location}")
+        self.say(stats)
+        self.say(options)
+
+    def room(self, name):
+        return self.content.rooms[self.content.room_ids[name]]
+
+    def room_items(self, room):
+        """
+        The items still lying in a room: the shared content minus the items already carried.
+        """
+        items = self.content.items
+        return [items[item].name for item in self.room(room).items if not self.carried >> item & 1]
+
+    def open_directions(self):
+        """
+        Lists the exits of the current room that the player can take: every exit except
+        those into completed dead ends (completed rooms with exits can be walked through).
+        """
+        rooms = self.content.rooms
+        return [direction for direction, room in self.room(self.current_room).exits.items()
+                if not self.completed >> room & 1 or rooms[room].exits]
+
+    def enter_room(self, target):
+        """
+        Moves into a room, asks a quiz, then lets the player pick an item or leave.
+        Completed rooms and rooms with nothing left to take are just walked through.
+        """
+        room = self.room(target)
+        done = self.completed >> room.id & 1
+        # Check if this room is already completed
+        if done and not room.exits:
+            self.say("⚠️ You've already successfully completed this location. Choose another location.")
+            return
+
+        self.current_room = target
+        self.say(f"🌲 You are now in the {self.current_room}.")
+        if done or not self.room_items(target):
+            self.leave_room()
+            return
+
+        yield from self.ask_quiz()
+
+        # Allow player to pick up items or leave room
+        while True:
+            items = self.room_items(self.current_room)
+            if not items:
+                self.say("No more items here. Go elsewhere.")
+                self.leave_room()
+                break
+
+            self.say("Items in this room:")
+            for i, item in enumerate(items, 1):
+                self.say(f"{i}. {item}")
+            self.say("Choose an item number or type 'leave' to exit.")
+
+            choice = (yield from self.ask("item", "> ", items)).lower()
+
+            if choice == "leave":
+                yield from self.handle_hazard()
+                self.leave_room()
+                break
+            elif choice.isdigit() and 1 <= int(choice) <= len(items):
+                if self.take_item(items[int(choice) - 1]):
+                    yield from self.handle_hazard()
+                    self.check_end()
+                    self.completed |= 1 << room.id
+                    self.leave_room()
+                    break
+            else:
+                self.say("❌ That is not an option, try again.")
+
+    def leave_room(self):
+        """
+        Done with a room: a dead end (no exits) sends the player back to the start room,
+        any other room is where the player goes on from.
+        """
+        if not self.room(self.current_room).exits:
+            self.say(f"✨ You return to the {self.start_room.lower()}.")
+            self.current_room = self.start_room
+
+    def show_route(self):
+        """
+        Shows the way to the nearest room that still holds a mission item the player needs.
+        """
+        graph = graph_of(self.content)
+        path = graph.route(self.room(self.current_room).id, graph.mission_targets(self.carried, self.completed))
+        if path is None:
+            self.say("🧭 No mission item can be reached from here.")
+            return
+        steps = graph.directions(path)
+        if not steps:
+            self.say("🧭 A mission item is right here!")
+            return
+        shown = ", ".join(steps[:ROUTE_STEPS_SHOWN]) + (", ..." if len(steps) > ROUTE_STEPS_SHOWN else "")
+        self.say(f"🧭 Nearest mission item: {self.content.rooms[path[-1]].name}, "
+                 f"{len(steps)} step{'s' if len(steps) != 1 else ''} away: {shown}")
+
+    def choose_number(self, kind, options, data):
+        """
+        Keeps asking until the player enters a valid option number, then returns that option.
+        """
+        while True:
+            answer = yield from self.ask(kind, "Choose the number: ", data)
+            # Validate input is a valid option number
+            if not answer.isdigit() or int(answer) < 1 or int(answer) > len(options):
+                self.say("❌ That is not an option, try again.")
+                continue
+            return options[int(answer) - 1]
+
+    def ask_quiz(self):
+        """
+        Presents a random quiz question to the player.
+        Increases or decreases life points based on correctness.
+        Ends the game if life points drop below zero.
+        """
+        if not self.quiz_deck:
+            self.say("🎓 No more quizzes left!")
+            return
+        quiz = self.quiz_deck.draw(rng=self.rng)  # Drawn cards never repeat
+
+        self.say(f"\n🧚‍♀️ Quiz ({quiz.category}): {quiz.question}")
+        for i, choice in enumerate(quiz.choices, 1):
+            self.say(f"{i}. {choice}")
+
+        selected = yield from self.choose_number("quiz", quiz.choices, quiz)
+        if selected == quiz.answer:
+            self.life_points += self.rules.quiz_reward
+            self.score_breakdown[quiz.category] += 1
+            self.say(f"✅ Correct! +{self.rules.quiz_reward} life point.")
+        else:
+            self.life_points -= self.rules.quiz_penalty
+            self.say(f"❌ Wrong! -{self.rules.quiz_penalty} life point.")
+
+        if self.life_points < 0:
+            self.game_over()
+
+    def handle_hazard(self):
+        """
+        Presents a random hazard scenario to the player.
+        Adjusts life points based on player's choice.
+        Ends the game if life points drop below zero.
+        """
+        if not self.hazard_deck:
+            self.say("✨ No hazards left.")
+            return
+        hazard = self.hazard_deck.draw()  # Drawn cards never repeat
+
+        self.say(f"\n⚠️ Hazard: {hazard.scenario}")
+        for i, choice in enumerate(hazard.choices, 1):
+            self.say(f"{i}. {choice}")
+
+        selected = yield from self.choose_number("hazard", hazard.choices, hazard)
+        if selected == hazard.answer:
+            self.life_points += self.rules.hazard_reward
+            self.score_breakdown["Hazards"] += 1
+            self.say(f"✅ Safe choice! +{self.rules.hazard_reward} life point.\n{hazard.explanation(selected)}")
+        else:
+            self.life_points -= self.rules.hazard_penalty
+            self.say(f"❌ Bad choice! -{self.rules.hazard_penalty} life point.\n{hazard.explanation(selected)}")
+
+        if self.life_points < 0:
+            self.game_over()
+
+    def take_item(self, item):
+        """
+        Attempts to take an item from the current room.
+        Updates inventory and life points based on whether the item is a mission item.
+        Ends game if life points drop below zero.
+        Returns True if item was valid (regardless of success), else False.
+        """
+        item_id = self.content.item_ids.get(item.casefold())
+        room = self.content.rooms[self.content.room_ids[self.current_room]]
+
+        if item_id is None or item_id not in room.items or self.carried >> item_id & 1:
+            self.say("❌ That is not an option, try again.")
+            return False
+
+        item = self.content.items[item_id]
+        if item.mission:
+            self.inventory.append(item.name)
+            self.carried |= 1 << item.id  # Also takes it out of the room
+            self.missions_carried += 1
+            self.life_points += self.rules.item_reward
+            self.score_breakdown["Items"] += 1
+            self.say(f"✅ You took the {item.name}! +{self.rules.item_reward} life point.")
+        else:
+            self.life_points -= self.rules.item_penalty
+            self.say(f"❌ The {item.name} is cursed! -{self.rules.item_penalty} life point. Try again.")
+
+        if self.life_points < 0:
+            self.game_over()
+
+        return True
+
+    def check_end(self):
+        """
+        Checks if player has collected all mission items.
+        If yes, ends the game with a victory message and shows summary and leaderboard.
+        """
+        if self.missions_carried == self.content.mission_count:
+            self.say("\n🎉 You collected all correct items and escape the forest!")
+            self.say(f"❤️ Final life points: {self.life_points}/{self.max_life_points}")
+            self.finish("win")
+
+    def game_over(self):
+        """
+        Ends the game with a failure message when life points drop below zero.
+        """
+        self.say("\n💀 Your life points fell below zero. The wizard captures you forever!")
+        self.say(f"❤️ Final life points: {self.life_points}/{self.max_life_points}")
+        self.finish("lose")
+
+    # ---------- Results ----------
+
+    def summary_lines(self):
+        lines = ["\n📊 Score Breakdown 📊"]
+        for category, score in self.score_breakdown.items():
+            bar = "█" * score
+            lines.append(f"{category:18}: {bar} ({score})")
+        return lines
+
+    def leaderboard_lines(self):
+        lines = ["\n🏅 Leaderboard 🏅"]
+        if self.leaderboard is None:
+            lines.append(format_entry(1, self.player_name, self.life_points))
+        else:
+            lines.extend(top_lines(self.leaderboard, highlight=self.score_id))
+        return lines
+
+    def show_summary(self):
+        """
+        Displays a textual bar chart summary of the player's score breakdown by category.
+        """
+        for line in self.summary_lines():
+            self.say(line)
+
+    def show_leaderboard(self):
+        """
+        Displays the top of the leaderboard, and where the current player ranks.
+        """
+        for line in self.leaderboard_lines():
+            self.say(line)
+
+    def save_results_to_file(self):
+        """
+        Saves the game results, including final life points, score breakdown, and leaderboard, to a text file.
+        Handles exceptions and notifies the player if saving fails.
+        """
+        if self.results_file is None:
+            return
+        try:
+            with open(self.results_file, "w") as f:
+                f.write("🎉 Game Results 🎉\n")
+                f.write(f"Final life points: {self.life_points}\n")
+                for line in self.summary_lines() + self.leaderboard_lines():
+                    f.write(line + "\n")
+            self.say(f"💾 Game results saved to {self.results_file}")
+        except Exception as e:
+            self.say(f"❌ Failed to save game results: {e}")
+
+    # ---------- Save / Load ----------
+
+    def save_data(self):
+        """
+        The game state in the current save format.
+        Decks are stored as seed and position, so the size does not depend on the quiz bank.
+        """
+        return {
+            "format": SAVE_FORMAT,
+            "content": self.content.version,
+            "current_room": self.current_room,
+            "inventory": self.inventory,
+            "completed_rooms": sorted(self.content.room_names(self.completed)),
+            "life_points": self.life_points,
+            "score_breakdown": self.score_breakdown,
+            "decks": {"quizzes": self.quiz_deck.state(), "hazards": self.hazard_deck.state()},
+        }
+
+    def restore(self, save_data):
+        """
+        Puts this engine into the state described by save_data.
+        Older saves are migrated first; saves for another content pack, or naming rooms
+        and items the content does not have, are refused with a ValueError.
+        """
+        save_data = migrate_save(save_data, self.rng)
+        if save_data["format"] != SAVE_FORMAT:
+            raise ValueError(f"unknown save format {save_data['format']}")
+        if save_data["content"] != self.content.version:
+            raise ValueError(f"save is for content pack {save_data['content']}, not {self.content.version}")
+
+        # Check and rebuild everything first so a bad save leaves the current game untouched
+        room_ids, item_ids = self.content.room_ids, self.content.item_ids
+        current_room = save_data["current_room"]
+        if current_room not in room_ids:
+            raise ValueError(f"save is in room {current_room!r}, which this content does not have")
+        inventory = list(save_data["inventory"])
+        unknown = [item for item in inventory if not isinstance(item, str) or item.casefold() not in item_ids]
+        if unknown:
+            raise ValueError(f"save carries unknown items {unknown}")
+        unknown = [name for name in save_data["completed_rooms"] if name not in room_ids]
+        if unknown:
+            raise ValueError(f"save has completed unknown rooms {unknown}")
+        completed = self.content.room_mask(save_data["completed_rooms"])
+        life_points = save_data["life_points"]
+        if not isinstance(life_points, int):
+            raise ValueError(f"save has life points {life_points!r}")
+        decks = save_data["decks"]
+        quiz_deck = CategoryDecks.restore(self.quizzes, decks["quizzes"], id_key="id")
+        hazard_deck = Deck.restore(self.hazards, decks["hazards"], id_key="id")
+
+        self.quiz_deck = quiz_deck
+        self.hazard_deck = hazard_deck
+        self.current_room = current_room
+        self.inventory = inventory
+        self.completed = completed
+        self.life_points = life_points
+        self.score_breakdown = dict(save_data["score_breakdown"])
+        carried = {item_ids[item.casefold()] for item in inventory}
+        self.carried = mask_of(carried)
+        self.missions_carried = sum(self.content.items[item].mission for item in carried)
+
+    def save_game(self):
+        """
+        Saves the current game state to a JSON file.
+        """
+        try:
+            self.write_save(self.save_data())
+            self.say("💾 Game saved successfully!")
+        except Exception as e:
+            self.say(f"❌ Error saving game: {e}")
+
+    def load_game(self):
+        """
+        Loads game state from a JSON file into this engine.
+        Handles errors if file not found, corrupt, or made for other content.
+        """
+        try:
+            self.restore(self.read_save())
+            self.say("📂 Game loaded successfully!")
+        except FileNotFoundError:
+            self.say("❌ No saved game found.")
+        except Exception as e:
+            self.say(f"❌ Error loading game: {e}")
+
+    def write_save(self, save_data):
+        with open(self.save_file, "w") as f:
+            json.dump(save_data, f)
+
+    def read_save(self):
+        """
+        Reads the save file. What was read (or why it failed) goes into the replay log,
+        so a replay loads the same game even after the file has changed.
+        """
+        try:
+            with open(self.save_file, "r") as f:
+                save_data = json.load(f)
+        except Exception as e:
+            if self.replay_log is not None:
+                self.replay_log.record_load(None, e)
+            raise
+        if self.replay_log is not None:
+            self.replay_log.record_load(save_data)
+        return save_data
@@ -0,0 +1,374 @@
+# Spooky Forest Adventure - Classroom Server
+# Hosts many games at once in one process, one GameEngine per connection, so a whole
+# classroom can play over the network with nothing but a terminal.
+#
+# Example:
+#   python forest_server.py serve --port 8765
+#   python forest_server.py client --host 127.0.0.1 --port 8765
+#   python forest_server.py bots --sessions 2000 --port 8765
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+from collections import deque
+
+from content_pack import load_pack
+from forest_engine import CONTENT, GameEngine
+from leaderboard import open_leaderboard
+from phase_timing import PhaseTimer
+
+"""The line protocol (UTF-8, one message per line, server to client):
+
+. text          game text to show
+? kind text     the game waits for one answer line; kind is proceed, command, quiz, hazard or item
+# outcome       the game is over (win, lose, quit, declined or error) and the server hangs up
+
+The client sends plain answer lines. The first prompt asks for the player's name; a name
+that is already playing gets a number added ("Lisa 2"), so two players never share a save.
+
+Every connection is one coroutine and one play() generator, so an idle player costs a
+few kilobytes and no thread. The engine never blocks on input: the server reads a line,
+sends it into the generator and writes out whatever the game said until the next prompt.
+The time for that step is the session's latency."""
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SAVE_DIR = "server_saves"  # One save file per player name: readable prefix plus a hash of the full name
+BOT_MAX_ANSWERS = 200  # A random bot can clear every room without winning, so it gives up after this
+
+# -----------------------------
+# Latency
+# -----------------------------
+
+def percentile(samples, fraction):
+    """
+    Returns the value at the given fraction of an unsorted list, or 0.0 if it is empty.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def latency_line(samples):
+    return (f"p50 {percentile(samples, 0.5) * 1000:.2f} ms, p99 {percentile(samples, 0.99) * 1000:.2f} ms, "
+            f"max {max(samples, default=0.0) * 1000:.2f} ms")
+
+# -----------------------------
+# Game Sessions
+# -----------------------------
+
+def render(output, last):
+    """
+    Turns the game text and the final prompt or end line into protocol lines.
+    """
+    lines = [f". {text}" for text in output]
+    lines.append(last)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+class GameSession:
+    """
+    One game, played one answer at a time. step() returns the protocol bytes to send back.
+    """
+
+    def __init__(self, player_name, save_file, leaderboard=None, phase_log=None, content=CONTENT):
+        self.output = []
+        self.phase_log = phase_log  # Timing log each finished session appends its phase histograms to, or None
+        self.engine = GameEngine(player_name=player_name, input_fn=None,
+                                 output_fn=lambda text="": self.output.extend(str(text).split("\n")),
+                                 save_file=save_file, results_file=None, leaderboard=leaderboard, content=content,
+                                 timer=PhaseTimer() if phase_log else None)
+        self.game = self.engine.play()
+        self.result = None
+
+    def step(self, answer=None):
+        """
+        Starts the game (answer None) or sends one answer. Returns (bytes, game over?).
+        """
+        try:
+            prompt = next(self.game) if answer is None else self.game.send(answer)
+        except StopIteration as stop:
+            self.result = stop.value
+            last = f"# {self.result.outcome}"
+        else:
+            last = f"? {prompt.kind} {prompt.text}"
+        data = render(self.output, last)
+        self.output.clear()
+        return data, self.result is not None
+
+    def close(self):
+        """
+        Ends the game if the player left early. Returns (outcome, turns).
+        """
+        if self.result is None:
+            self.game.close()
+            self.result = self.engine.result("quit")
+        if self.phase_log:
+            self.engine.timer.dump(self.phase_log, player=self.engine.player_name,
+                                   outcome=self.result.outcome, turns=self.result.turns)
+            self.phase_log = None  # Only once, even if close() is called again
+        return self.result.outcome, self.result.turns
+
+# -----------------------------
+# Server
+# -----------------------------
+
+class ForestServer:
+    """
+    Runs one game per connection and keeps server-wide counters.
+    """
+
+    def __init__(self, save_dir=SAVE_DIR, leaderboard=None, idle_timeout=None, phase_log=None, world=None):
+        self.save_dir = save_dir
+        self.leaderboard = leaderboard  # Shared by every session; SQLite calls run on the event loop thread
+        self.idle_timeout = idle_timeout  # Seconds to wait for an answer, or None to wait forever
+        self.phase_log = phase_log  # Timing log for every session's phase histograms, or None
+        self.world = world  # Pack file of a generated world, or None for the spooky forest
+        self.content = load_pack(world) if world else CONTENT
+        self.connected = 0
+        self.playing = 0
+        self.finished = 0
+        self.errors = 0  # Sessions that ended on an exception in the game
+        self.names = set()  # Names of the players connected right now
+        self.recent = deque(maxlen=10000)  # Latencies of the most recent steps of every session
+        os.makedirs(save_dir, exist_ok=True)
+
+    def save_file(self, player_name):
+        """
+        The player's save file. The hash keeps names that clean up to the same prefix ("Zoë", "Zo_") apart.
+        """
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", player_name)[:40] or "player"
+        digest = hashlib.sha1(player_name.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.save_dir, f"{safe}-{digest}.json")
+
+    def unique_name(self, name):
+        """
+        The name itself, or the name with the first free number added if someone is playing under it.
+        """
+        number = 1
+        unique = name
+        while unique in self.names:
+            number += 1
+            unique = f"{name} {number}"
+        return unique
+
+    async def handle(self, reader, writer):
+        self.connected += 1
+        try:
+            await self.session(reader, writer)
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:  # A bug or a bad save in one game: end that game, keep serving the rest
+            self.errors += 1
+            print(f"⚠️ A game stopped with an error: {e!r}")
+            try:
+                writer.write(render([], "# error"))
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            self.connected -= 1
+            writer.close()
+
+    async def read_answer(self, reader):
+        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        if not line:
+            return None  # The player hung up
+        return line.decode("utf-8", "replace").rstrip("\r\n")
+
+    async def session(self, reader, writer):
+        writer.write(b"? name Enter your name, brave adventurer: \n")
+        await writer.drain()
+        name = await self.read_answer(reader)
+        if not name or not name.strip():
+            return
+
+        asked = name.strip()[:40]
+        name = self.unique_name(asked)
+        if name != asked:
+            writer.write(f". Someone called {asked} is already playing, so you are {name} today.\n".encode("utf-8"))
+        self.names.add(name)
+        try:
+            game = await self.start_game(name)
+        except BaseException:
+            self.names.discard(name)
+            raise
+        samples = []
+        self.playing += 1
+        try:
+            answer = None
+            while True:
+                started = time.perf_counter()
+                data, done = await self.step(game, answer)
+                writer.write(data)
+                samples.append(time.perf_counter() - started)
+                await writer.drain()
+                if done:
+                    break
+                answer = await self.read_answer(reader)
+                if answer is None:
+                    break
+        finally:
+            self.names.discard(name)
+            self.playing -= 1
+            self.finished += 1
+            self.recent.extend(samples)
+            outcome, turns = await self.end_game(game)
+            print(f"🎮 {name}: {outcome}, {turns} turns, {latency_line(samples)}")
+
+    # The three steps of a game. ShardedServer (forest_shards.py) runs them in worker processes instead.
+
+    async def start_game(self, name):
+        return GameSession(name, self.save_file(name), self.leaderboard, self.phase_log, self.content)
+
+    async def step(self, game, answer):
+        return game.step(answer)
+
+    async def end_game(self, game):
+        return game.close()
+
+    def report_line(self):
+        return (f"📊 {self.connected} connected, {self.playing} playing, {self.finished} finished, {self.errors} errors | "
+                f"recent steps: {latency_line(list(self.recent))}")
+
+    async def report(self, every):
+        while True:
+            await asyncio.sleep(every)
+            print(self.report_line())
+
+async def serve(host, port, report_every=None, **kwargs):
+    server = ForestServer(**kwargs)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    print(f"🌲 Spooky Forest server on {host}:{port}")
+    if report_every:
+        asyncio.ensure_future(server.report(report_every))
+    async with listener:
+        await listener.serve_forever()
+
+# -----------------------------
+# Clients
+# -----------------------------
+
+async def client(host, port):
+    """
+    Plays one game over the network in this terminal.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        kind, _, text = line.decode("utf-8").rstrip("\n").partition(" ")
+        if kind == ".":
+            print(text)
+        elif kind == "?":
+            prompt = text.partition(" ")[2]
+            try:
+                answer = await loop.run_in_executor(None, input, prompt)
+            except EOFError:
+                break
+            writer.write(answer.encode("utf-8") + b"\n")
+            await writer.drain()
+        elif kind == "#":
+            print(f"Game over: {text}")
+            break
+    writer.close()
+
+def bot_answer(kind, rng, answers):
+    if kind == "name":
+        return f"bot{rng.randrange(1_000_000)}"
+    if kind == "proceed":
+        return "yes"
+    if kind == "command":
+        if answers >= BOT_MAX_ANSWERS:
+            return "quit"
+        return rng.choice(["north", "south", "east", "west", "points"])
+    if kind == "item":
+        return rng.choice(["1", "2", "leave"])
+    return rng.choice(["1", "2", "3"])
+
+async def bot(host, port, rng, think, samples, outcomes):
+    """
+    Plays one game with random answers and measures the round trip of every answer.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = None
+    answers = 0
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                outcomes["dropped"] = outcomes.get("dropped", 0) + 1
+                return
+            kind, _, text = line.decode("utf-8").rstrip("\n").partition(" ")
+            if kind == "#":
+                outcomes[text] = outcomes.get(text, 0) + 1
+                return
+            if kind != "?":
+                continue
+            if sent is not None:
+                samples.append(time.perf_counter() - sent)
+            if think:
+                await asyncio.sleep(rng.uniform(0, think))
+            writer.write(bot_answer(text.partition(" ")[0], rng, answers).encode("utf-8") + b"\n")
+            await writer.drain()
+            sent = time.perf_counter()
+            answers += 1
+    finally:
+        writer.close()
+
+async def bots(host, port, sessions, think, seed):
+    """
+    Plays many games at once against a running server and prints round-trip latency.
+    """
+    rng = random.Random(seed)
+    samples, outcomes = [], {}
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(bot(host, port, random.Random(rng.getrandbits(32)), think, samples, outcomes) for _ in range(sessions)),
+        return_exceptions=True)
+    seconds = time.perf_counter() - started
+    errors = sum(isinstance(r, Exception) for r in results)
+    print(f"{sessions} games in {seconds:.2f}s, {len(samples)} answers ({len(samples) / seconds:,.0f}/sec), "
+          f"{errors} connection errors")
+    print(f"Outcomes: {outcomes}")
+    print(f"Round trip: {latency_line(samples)}")
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spooky Forest classroom server")
+    parser.add_argument("mode", choices=["serve", "client", "bots"])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--save-dir", default=SAVE_DIR, help="serve: folder for the players' save files")
+    parser.add_argument("--idle-timeout", type=float, help="serve: hang up on players idle this many seconds")
+    parser.add_argument("--report", type=float, metavar="SECONDS", help="serve: print server stats this often")
+    parser.add_argument("--phase-log", metavar="FILE", help="serve: append every game's phase timings to FILE")
+    parser.add_argument("--world", metavar="PACK", help="serve: a world grown with world_gen.py instead of the spooky forest")
+    parser.add_argument("--sessions", type=int, default=100, help="bots: games to play at once")
+    parser.add_argument("--think", type=float, default=0.0, help="bots: up to this many seconds before each answer")
+    parser.add_argument("--seed", type=int, default=0, help="bots: seed for the bot answers")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "serve":
+            asyncio.run(serve(args.host, args.port, args.report, save_dir=args.save_dir,
+                              leaderboard=open_leaderboard(), idle_timeout=args.idle_timeout,
+                              phase_log=args.phase_log, world=args.world))
+        elif args.mode == "client":
+            asyncio.run(client(args.host, args.port))
+        else:
+            asyncio.run(bots(args.host, args.port, args.sessions, args.think, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
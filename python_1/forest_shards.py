@@ -0,0 +1,315 @@
+# Spooky Forest Adventure - Sharded Server
+# Runs the games of forest_server.py in a pool of worker processes, so a busy server uses
+# every core instead of one. Each game stays on one worker for its whole life.
+#
+# Example:
+#   python forest_shards.py --workers 4 --port 8765 --report 10
+#   python forest_server.py bots --sessions 2000 --port 8765
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+
+from content_pack import load_pack
+from forest_engine import CONTENT
+from forest_server import DEFAULT_HOST, DEFAULT_PORT, SAVE_DIR, ForestServer, GameSession, render
+from leaderboard import open_leaderboard
+
+"""How the work is split:
+
+The supervisor (this process) owns every network connection and does no game logic.
+Each game gets a session id and is pinned to shard (session id % workers), so all of its
+answers go to the worker process that holds its GameEngine.
+
+Supervisor and worker talk over a multiprocessing Pipe. Messages are small tuples:
+
+to the worker       ("open", sid, name, save_file)   ("step", sid, answer)   ("close", sid)
+from the worker     ("data", sid, bytes, done)       ("closed", sid, outcome, turns)
+
+Messages for one worker are collected during one pass of the event loop and sent as one
+list, so a busy shard pays for one pipe write per pass instead of one per answer. The
+writes happen on a writer thread per shard: a worker too busy to read its pipe only holds
+up its own shard, never the event loop.
+
+A game that raises an exception ends with "# error" and is dropped; the other games on
+its worker carry on. If a worker dies, only its own players are told the game ended
+("# error") and a new worker is started for the shard on a helper thread, so the event
+loop (and every other shard) never waits for it. Games that start on the shard meanwhile
+wait in its outbox until the new worker is up."""
+
+# -----------------------------
+# Worker Process
+# -----------------------------
+
+def worker_main(conn, use_leaderboard, phase_log=None, world=None):
+    """
+    Runs in a worker process: keeps the GameSessions of one shard and answers batches of messages.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the supervisor
+    leaderboard = open_leaderboard() if use_leaderboard else None
+    content = load_pack(world) if world else CONTENT  # Every worker maps the same pack and shares its pages
+    sessions = {}
+    while True:
+        try:
+            batch = conn.recv()
+        except (EOFError, OSError):
+            return  # The supervisor is gone
+        replies = []
+        for message in batch:
+            kind, sid = message[0], message[1]
+            try:
+                if kind == "open":
+                    sessions[sid] = GameSession(message[2], message[3], leaderboard, phase_log, content)
+                elif kind == "step":
+                    session = sessions.get(sid)
+                    data, done = session.step(message[2]) if session else (render([], "# error"), True)
+                    replies.append(("data", sid, data, done))
+                elif kind == "close":
+                    session = sessions.pop(sid, None)
+                    outcome, turns = session.close() if session else ("error", 0)
+                    replies.append(("closed", sid, outcome, turns))
+            except Exception as e:  # One broken game (a bad save file, ...) must not take the shard down
+                print(f"⚠️ Game {sid} stopped on {kind}: {e!r}")
+                sessions.pop(sid, None)  # A failed open leaves no session, so its first step gets "# error"
+                if kind == "step":
+                    replies.append(("data", sid, render([], "# error"), True))
+                elif kind == "close":
+                    replies.append(("closed", sid, "error", 0))
+        if replies:
+            conn.send(replies)
+
+# -----------------------------
+# Supervisor
+# -----------------------------
+
+class ShardLost(Exception):
+    """
+    The worker holding a game died.
+    """
+
+class Shard:
+    """
+    One worker process and the games pinned to it.
+    """
+
+    def __init__(self, number, use_leaderboard, phase_log=None, world=None):
+        self.number = number
+        self.use_leaderboard = use_leaderboard
+        self.phase_log = phase_log
+        self.world = world
+        self.sessions = set()
+        self.outbox = []
+        self.restarts = -1
+        self.respawning = None  # The task starting a new worker after a crash, or None while the worker runs
+        self.start()
+
+    def start(self):
+        # Spawned, not forked: a forked worker would inherit (and keep open) every player's socket
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child, self.use_leaderboard, self.phase_log, self.world),
+                                               name=f"forest-shard-{self.number}", daemon=True)
+        self.process.start()
+        child.close()
+        self.batches = queue.SimpleQueue()  # Batches for the writer thread; None stops it
+        self.writer = threading.Thread(target=write_batches, args=(self.conn, self.batches),
+                                       name=f"forest-shard-{self.number}-writer", daemon=True)
+        self.writer.start()
+        self.restarts += 1
+
+    def stop_writer(self):
+        self.batches.put(None)
+        self.writer.join(timeout=1)
+
+    def replace(self):
+        """
+        Cleans up after a dead worker and starts a new one. Returns the old worker's exit code.
+        This blocks (joins and a process start), so the server runs it off the event loop.
+        """
+        self.stop_writer()
+        self.conn.close()
+        self.process.join(timeout=1)
+        exitcode = self.process.exitcode
+        self.start()
+        return exitcode
+
+def write_batches(conn, batches):
+    """
+    Runs on a shard's writer thread: sends each batch to the worker, blocking only this thread.
+    """
+    while True:
+        batch = batches.get()
+        if batch is None:
+            return
+        try:
+            conn.send(batch)
+        except (OSError, ValueError, TypeError):
+            return  # The worker is gone (or the pipe closed under us); receive() restarts the shard
+
+class ShardedServer(ForestServer):
+    """
+    A ForestServer whose games run in worker processes.
+    """
+
+    def __init__(self, workers, leaderboard=True, **kwargs):
+        super().__init__(**kwargs)
+        self.loop = asyncio.get_running_loop()
+        self.shards = [Shard(number, leaderboard, self.phase_log, self.world) for number in range(workers)]
+        self.pending = {}  # sid -> Future waiting for the worker's reply
+        self.next_sid = 0
+        self.flush_scheduled = False
+        for shard in self.shards:
+            self.watch(shard)
+
+    def watch(self, shard):
+        self.loop.add_reader(shard.conn.fileno(), self.receive, shard)
+
+    def shard_of(self, sid):
+        return self.shards[sid % len(self.shards)]
+
+    # ---------- Messages ----------
+
+    def send(self, sid, message):
+        """
+        Queues a message for the game's worker and returns a Future for the reply.
+        """
+        shard = self.shard_of(sid)
+        future = self.loop.create_future()
+        self.pending[sid] = future
+        shard.outbox.append(message)
+        self.schedule_flush()
+        return future
+
+    def schedule_flush(self):
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.loop.call_soon(self.flush)
+
+    def flush(self):
+        self.flush_scheduled = False
+        for shard in self.shards:
+            if shard.outbox and shard.respawning is None:  # A shard being restarted keeps its outbox until it is back
+                batch, shard.outbox = shard.outbox, []
+                shard.batches.put(batch)
+
+    def receive(self, shard):
+        try:
+            while shard.conn.poll():
+                for reply in shard.conn.recv():
+                    future = self.pending.pop(reply[1], None)
+                    if future is not None and not future.done():
+                        future.set_result(reply[2:])
+        except (EOFError, OSError):
+            self.restart(shard)
+
+    def restart(self, shard):
+        """
+        Replaces a dead worker. Its games are lost straight away; the new worker is started
+        off the event loop, so every other shard keeps running meanwhile.
+        """
+        self.loop.remove_reader(shard.conn.fileno())
+        for sid in shard.sessions:
+            future = self.pending.pop(sid, None)
+            if future is not None and not future.done():
+                future.set_exception(ShardLost(f"shard {shard.number} stopped"))
+        lost = len(shard.sessions)
+        shard.sessions.clear()
+        shard.outbox.clear()
+        shard.respawning = self.loop.create_task(self.respawn(shard, lost))
+
+    async def respawn(self, shard, lost):
+        exitcode = await self.loop.run_in_executor(None, shard.replace)
+        shard.respawning = None
+        self.watch(shard)
+        print(f"⚠️ Shard {shard.number} restarted (exit code {exitcode}), {lost} games lost")
+        if shard.outbox:
+            self.schedule_flush()  # Games that started on this shard while it was down
+
+    # ---------- Game steps ----------
+
+    async def start_game(self, name):
+        sid = self.next_sid
+        self.next_sid += 1
+        shard = self.shard_of(sid)
+        shard.sessions.add(sid)
+        shard.outbox.append(("open", sid, name, self.save_file(name)))  # No reply; the first step follows
+        return sid
+
+    async def step(self, sid, answer):
+        if sid not in self.shard_of(sid).sessions:
+            return render([], "# error"), True  # Lost in a restart while waiting for the player
+        try:
+            data, done = await self.send(sid, ("step", sid, answer))
+        except ShardLost:
+            return render([], "# error"), True
+        return data, done
+
+    async def end_game(self, sid):
+        shard = self.shard_of(sid)
+        if sid not in shard.sessions:
+            return "error", 0
+        try:
+            outcome, turns = await self.send(sid, ("close", sid))
+        except ShardLost:
+            return "error", 0
+        shard.sessions.discard(sid)
+        return outcome, turns
+
+    def report_line(self):
+        shards = ", ".join(f"{len(shard.sessions)}" + (f" (restarted {shard.restarts}x)" if shard.restarts else "")
+                           for shard in self.shards)
+        return f"{super().report_line()} | games per shard: {shards}"
+
+    def close(self):
+        for shard in self.shards:
+            if shard.respawning is not None:
+                shard.respawning.cancel()
+                continue  # Its new worker is a daemon process and goes with the server
+            self.loop.remove_reader(shard.conn.fileno())
+            shard.stop_writer()
+            shard.conn.close()
+            shard.process.join(timeout=1)
+
+async def serve(host, port, workers, report_every=None, **kwargs):
+    server = ShardedServer(workers, **kwargs)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    print(f"🌲 Spooky Forest server on {host}:{port} with {workers} worker processes")
+    if report_every:
+        asyncio.ensure_future(server.report(report_every))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spooky Forest server with games spread over worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--save-dir", default=SAVE_DIR, help="folder for the players' save files")
+    parser.add_argument("--idle-timeout", type=float, help="hang up on players idle this many seconds")
+    parser.add_argument("--report", type=float, metavar="SECONDS", help="print server stats this often")
+    parser.add_argument("--phase-log", metavar="FILE", help="append every game's phase timings to FILE")
+    parser.add_argument("--world", metavar="PACK", help="a world grown with world_gen.py instead of the spooky forest")
+    parser.add_argument("--no-leaderboard", action="store_true", help="do not record scores")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.report, save_dir=args.save_dir,
+                          idle_timeout=args.idle_timeout, leaderboard=not args.no_leaderboard,
+                          phase_log=args.phase_log, world=args.world))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,178 @@
+# Spooky Forest Adventure - Image Cache
+# Loads room pictures once, keeps the recently used ones in memory, and decodes the
+# next pictures on a worker thread so the Tk window never waits for the disk.
+
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+"""How the cache works:
+
+Every picture is looked up by (path, size, modification time), so an edited picture
+file is loaded again instead of showing the old version.
+
+prefetch() reads and decodes pictures on a worker thread. Each call replaces the last
+one: pictures prefetched before but not asked for again are dropped (or never decoded),
+so decoded pictures waiting outside the limit are only ever the latest batch. get() turns the decoded
+picture into a Tk PhotoImage (Tk objects may only be made on the Tk thread) and keeps it
+in a least-recently-used list. When the pictures in memory add up to more than
+max_bytes, the ones used longest ago are dropped.
+
+Resizing needs PIL (Pillow). Resized copies are saved in cache_dir, so the next launch
+loads the small copy instead of decoding and shrinking the big original again.
+Without PIL the pictures are still cached and prefetched, just not resized."""
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # About 32 MB of decoded pictures
+DEFAULT_CACHE_DIR = ".image_cache"
+
+_pil = None  # (Image, ImageTk) once PIL has been imported, or False if it is missing
+
+def load_pil():
+    """
+    Imports PIL the first time it is needed. Returns (Image, ImageTk) or None.
+    """
+    global _pil
+    if _pil is None:
+        try:
+            from PIL import Image, ImageTk
+            _pil = (Image, ImageTk)
+        except ImportError:
+            _pil = False
+    return _pil or None
+
+# -----------------------------
+# Decoding (safe on any thread)
+# -----------------------------
+
+def cache_key(path, size=None):
+    """
+    The cache key for a picture: (absolute path, size, modification time).
+    """
+    path = os.path.abspath(path)
+    return path, tuple(size) if size else None, os.path.getmtime(path)
+
+def disk_cache_path(cache_dir, key):
+    path, size, mtime = key
+    digest = hashlib.sha1(f"{path}|{size}|{mtime}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest + ".png")
+
+def decode(key, cache_dir):
+    """
+    Reads and decodes one picture. Returns ("pil", image) or ("data", base64 text).
+    This does all the disk work, so it runs on the worker thread.
+    """
+    path, size, _ = key
+    pil = load_pil()
+    if pil is None:
+        with open(path, "rb") as f:
+            return "data", base64.b64encode(f.read()).decode("ascii")
+
+    Image = pil[0]
+    if size:
+        cached = disk_cache_path(cache_dir, key)
+        if os.path.exists(cached):
+            image = Image.open(cached)
+            image.load()
+            return "pil", image
+    image = Image.open(path)
+    image.load()
+    if size:
+        image = image.resize(size)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp = f"{disk_cache_path(cache_dir, key)}.{threading.get_ident()}.tmp"
+            image.save(temp, format="PNG")
+            os.replace(temp, disk_cache_path(cache_dir, key))
+        except OSError:
+            pass  # The disk copy is only a speed-up
+    return "pil", image
+
+# -----------------------------
+# Cache
+# -----------------------------
+
+class ImageCache:
+    """
+    A shared, size-limited cache of Tk PhotoImages.
+    get() must be called on the Tk thread; prefetch() can be called from anywhere.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, cache_dir=DEFAULT_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.used_bytes = 0
+        self._photos = OrderedDict()  # key -> (PhotoImage, bytes), oldest first
+        self._pending = {}  # key -> Future from the worker thread
+        self._lock = threading.Lock()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-decode")
+        self._master = None
+
+    def prefetch(self, paths, size=None):
+        """
+        Starts decoding pictures on the worker thread so a later get() is instant, and
+        drops the pictures of earlier prefetches that were never used.
+        Missing files are skipped here; get() will report them.
+        """
+        wanted = set()
+        for path in paths:
+            try:
+                wanted.add(cache_key(path, size))
+            except OSError:
+                continue
+        with self._lock:
+            for key in [key for key in self._pending if key not in wanted]:
+                self._pending.pop(key).cancel()  # Frees the decoded picture, or skips decoding it
+            for key in wanted:
+                if key not in self._photos and key not in self._pending:
+                    self._pending[key] = self._worker.submit(decode, key, self.cache_dir)
+
+    def get(self, path, size=None, master=None):
+        """
+        Returns a PhotoImage for the picture, loading it if needed.
+        Raises OSError if the file cannot be read.
+        """
+        if master is not self._master:
+            self.clear()  # PhotoImages belong to one Tk window and die with it
+            self._master = master
+
+        key = cache_key(path, size)
+        if key in self._photos:
+            self._photos.move_to_end(key)
+            return self._photos[key][0]
+
+        with self._lock:
+            future = self._pending.pop(key, None)
+        decoded = future.result() if future else decode(key, self.cache_dir)
+        photo = self._make_photo(decoded, master)
+
+        nbytes = photo.width() * photo.height() * 4
+        self._photos[key] = (photo, nbytes)
+        self.used_bytes += nbytes
+        self._evict()
+        return photo
+
+    def _make_photo(self, decoded, master):
+        kind, value = decoded
+        if kind == "pil":
+            return load_pil()[1].PhotoImage(value, master=master)
+        import tkinter as tk
+        return tk.PhotoImage(data=value, master=master)
+
+    def _evict(self):
+        # Always keep the newest picture, even if it alone is over the limit
+        while self.used_bytes > self.max_bytes and len(self._photos) > 1:
+            _, (_, nbytes) = self._photos.popitem(last=False)
+            self.used_bytes -= nbytes
+
+    def clear(self):
+        """
+        Forgets every PhotoImage (the disk copies stay).
+        """
+        self._photos.clear()
+        self.used_bytes = 0
+
+    def close(self):
+        self._worker.shutdown(wait=False, cancel_futures=True)
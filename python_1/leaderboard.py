@@ -0,0 +1,242 @@
+# Spooky Forest Adventure - Leaderboard Store
+# Keeps every game result in an indexed SQLite file instead of an append-only text file.
+
+import os
+import re
+import sqlite3
+import time
+
+"""What the store keeps (all in one SQLite file):
+
+scores        one row per finished game, with an index on points so the best games
+              can be read in order without sorting the whole table, and the game's
+              place among the games with the same points (tie), so its rank is one lookup
+score_counts  how many games ended on each points value, so a rank is a sum over the
+              (few) distinct points values instead of a count over every game
+players       each player's best points, so looking up a player is one index lookup
+imports       how far each old leaderboard.txt has been read, so importing twice
+              never adds the same lines again
+
+Inserts and lookups go through SQLite's B-tree indexes, so they take O(log n) time."""
+
+LEADERBOARD_DB = "leaderboard.db"
+LEADERBOARD_TEXT = "leaderboard.txt"  # The old append-only file the games used to write
+
+MEDALS = ["🥇", "🥈", "🥉"]
+
+# Line formats the older games wrote to leaderboard.txt
+TEXT_FORMATS = [
+    # July28_Adventure / July29_Game / TkinterGUI_Adventure
+    re.compile(r"^(?P<name>.*) - Items: (?P<items>-?\d+) - Life Points: (?P<points>-?\d+)$"),
+    # July23_SpookyForestGame
+    re.compile(r"^(?P<name>.*) - Score: (?P<points>-?\d+) - Inventory: \[(?P<inventory>.*)\]$"),
+]
+
+# -----------------------------
+# Store
+# -----------------------------
+
+class Leaderboard:
+    """
+    A persistent leaderboard with a maintained score index.
+    """
+
+    def __init__(self, path=LEADERBOARD_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                points INTEGER NOT NULL,
+                items INTEGER NOT NULL DEFAULT 0,
+                game TEXT NOT NULL DEFAULT '',
+                created REAL NOT NULL,
+                tie INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS scores_by_points ON scores (points DESC, id);
+            CREATE TABLE IF NOT EXISTS score_counts (
+                points INTEGER PRIMARY KEY,
+                games INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS players (
+                name TEXT PRIMARY KEY,
+                best INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL
+            );
+        """)
+        self._add_ties()
+
+    def _add_ties(self):
+        """
+        Gives a store made before scores had a tie column its tie numbers, once.
+        """
+        if "tie" in [row[1] for row in self.db.execute("PRAGMA table_info(scores)")]:
+            return
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")  # Two games opening an old store together must not both add it
+            if "tie" in [row[1] for row in self.db.execute("PRAGMA table_info(scores)")]:
+                return
+            self.db.execute("ALTER TABLE scores ADD COLUMN tie INTEGER NOT NULL DEFAULT 0")
+            self.db.execute(
+                "UPDATE scores SET tie = ranked.tie FROM "
+                "(SELECT id, ROW_NUMBER() OVER (PARTITION BY points ORDER BY id) - 1 AS tie FROM scores) AS ranked "
+                "WHERE ranked.id = scores.id")
+
+    def close(self):
+        self.db.close()
+
+    def add(self, name, points, items=0, game=""):
+        """
+        Records one game result and returns its row id.
+        """
+        with self.db:
+            return self._insert(name, points, items, game)
+
+    def add_many(self, results):
+        """
+        Records many (name, points, items, game) results in one transaction.
+        """
+        with self.db:
+            for name, points, items, game in results:
+                self._insert(name, points, items, game)
+
+    def _insert(self, name, points, items, game):
+        # The count goes up first, which takes the write lock, so the tie read after it is this game's own
+        self.db.execute(
+            "INSERT INTO score_counts (points, games) VALUES (?, 1) "
+            "ON CONFLICT (points) DO UPDATE SET games = games + 1", (points,))
+        (tie,) = self.db.execute("SELECT games - 1 FROM score_counts WHERE points = ?", (points,)).fetchone()
+        cursor = self.db.execute(
+            "INSERT INTO scores (name, points, items, game, created, tie) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, points, items, game, time.time(), tie))
+        self.db.execute(
+            "INSERT INTO players (name, best) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET best = MAX(best, excluded.best)", (name, points))
+        return cursor.lastrowid
+
+    def top(self, k=5):
+        """
+        Returns the k best games as (id, name, points, items) rows, best first.
+        Ties keep the order the games were played in.
+        """
+        return self.db.execute(
+            "SELECT id, name, points, items FROM scores ORDER BY points DESC, id LIMIT ?", (k,)).fetchall()
+
+    def rank_of_points(self, points):
+        """
+        The rank a game with these points has: 1 + the number of games with more points.
+        """
+        (better,) = self.db.execute(
+            "SELECT COALESCE(SUM(games), 0) FROM score_counts WHERE points > ?", (points,)).fetchone()
+        return better + 1
+
+    def rank_of_game(self, game_id):
+        """
+        The place of one game in the order of top(): games with the same points rank
+        in the order they were played. Returns None if there is no such game.
+        """
+        row = self.db.execute("SELECT points, tie FROM scores WHERE id = ?", (game_id,)).fetchone()
+        if row is None:
+            return None
+        points, tie = row
+        return self.rank_of_points(points) + tie
+
+    def best(self, name):
+        """
+        The player's best points, or None if they have never played.
+        """
+        row = self.db.execute("SELECT best FROM players WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def rank(self, name):
+        """
+        The rank of the player's best game, or None if they have never played.
+        """
+        best = self.best(name)
+        return None if best is None else self.rank_of_points(best)
+
+    def __len__(self):
+        (games,) = self.db.execute("SELECT COALESCE(SUM(games), 0) FROM score_counts").fetchone()
+        return games
+
+    def import_text(self, path=LEADERBOARD_TEXT):
+        """
+        Imports the lines of an old leaderboard.txt that have not been imported yet.
+        Returns how many games were added. Lines in an unknown format are skipped.
+        """
+        if not os.path.exists(path):
+            return 0
+        key = os.path.abspath(path)
+        added = 0
+        with open(path, "rb") as f, self.db:
+            # Hold the write lock from reading the offset to saving it, so two games opening
+            # the store together (every shard worker does) never import the same lines twice
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute("SELECT offset FROM imports WHERE path = ?", (key,)).fetchone()
+            offset = row[0] if row else 0
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0  # The file was replaced with a shorter one; read it again
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # A line still being written; pick it up next time
+                offset += len(raw)
+                entry = parse_text_line(raw.decode("utf-8", "replace").strip())
+                if entry:
+                    self._insert(*entry)
+                    added += 1
+            self.db.execute(
+                "INSERT INTO imports (path, offset) VALUES (?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET offset = excluded.offset", (key, offset))
+        return added
+
+# -----------------------------
+# Helpers
+# -----------------------------
+
+def parse_text_line(line):
+    """
+    Turns one leaderboard.txt line into (name, points, items, game), or None.
+    """
+    for pattern in TEXT_FORMATS:
+        match = pattern.match(line)
+        if match:
+            if "inventory" in pattern.groupindex:
+                items = len([i for i in match["inventory"].split(",") if i.strip()])
+            else:
+                items = int(match["items"])
+            return match["name"], int(match["points"]), items, "leaderboard.txt"
+    return None
+
+def open_leaderboard(path=LEADERBOARD_DB, text_path=LEADERBOARD_TEXT):
+    """
+    Opens the leaderboard store and brings in any new lines from the old text file.
+    """
+    leaderboard = Leaderboard(path)
+    leaderboard.import_text(text_path)
+    return leaderboard
+
+def format_entry(rank, name, points):
+    medal = MEDALS[rank - 1] if rank <= len(MEDALS) else "🎖️"
+    return f"{rank}. {medal} {name} - {points} points"
+
+def top_lines(leaderboard, k=5, highlight=None):
+    """
+    Text lines for the top k games. If highlight (a row id) is not in the top k,
+    its place is added underneath so players always see where they stand. Both use
+    the order of top(), so tied games are numbered the same way in both.
+    """
+    rows = leaderboard.top(k)
+    if not rows:
+        return ["No leaderboard data yet."]
+    lines = [format_entry(rank, name, points) for rank, (_, name, points, _) in enumerate(rows, 1)]
+    if highlight is not None and all(row[0] != highlight for row in rows):
+        row = leaderboard.db.execute("SELECT name, points FROM scores WHERE id = ?", (highlight,)).fetchone()
+        if row:
+            lines.append("...")
+            lines.append(format_entry(leaderboard.rank_of_game(highlight), row[0], row[1]))
+    return lines
@@ -0,0 +1,223 @@
+# Spooky Forest Adventure - Phase Timing
+# Measures where the wall time of a game goes (showing text, waiting for the player, quizzes,
+# hazards, items, saving, the leaderboard) and keeps a small histogram per phase.
+#
+# Example:
+#   python July30Code.py --phase-log timings.jsonl
+#   python forest_server.py serve --phase-log timings.jsonl
+#   python phase_timing.py timings.jsonl
+
+import argparse
+import inspect
+import json
+import sys
+import time
+
+"""How phases are timed:
+
+A PhaseTimer is attached to one GameEngine. It replaces that engine's phase methods with
+timed wrappers on the instance only (the GameEngine class is never changed), so a game
+without a timer runs exactly the code it always did: the disabled mode costs nothing.
+
+Times are exclusive. A quiz shows text and waits for an answer; that time is counted as
+render and input, and the quiz phase only gets what is left. So the phases of a session
+add up to (at most) its wall time, and "other" is the engine time outside every phase.
+
+Histograms use power-of-two buckets: bucket b counts the calls that took less than 2**b
+microseconds (and at least 2**(b-1)). Bucket lists of different sessions are added up
+index by index, so any number of sessions can be merged.
+
+Every session appends one JSON line to the timing log:
+
+{"player": "Lisa", "outcome": "win", "wall_ns": 81234567890, "phases": {"quiz": {"count": 4, "total_ns": 210345, "buckets": [0, 0, 1, ...]}, ...}}"""
+
+# Phase name -> the GameEngine method it times
+PHASES = {
+    "render": "say",
+    "input": "ask",
+    "quiz": "ask_quiz",
+    "hazard": "handle_hazard",
+    "item": "take_item",
+    "save": "save_game",
+    "load": "load_game",
+    "results": "save_results_to_file",
+    "leaderboard": "leaderboard_lines",
+}
+
+# -----------------------------
+# Recording
+# -----------------------------
+
+class Histogram:
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self, count=0, total=0, buckets=None):
+        self.count = count
+        self.total = total  # Nanoseconds
+        self.buckets = buckets or []
+
+    def add(self, nanos):
+        self.count += 1
+        self.total += nanos
+        bucket = (nanos // 1000).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        if len(other.buckets) > len(self.buckets):
+            self.buckets.extend([0] * (len(other.buckets) - len(self.buckets)))
+        for bucket, count in enumerate(other.buckets):
+            self.buckets[bucket] += count
+
+    def percentile(self, fraction):
+        """
+        The upper bound in microseconds of the bucket that holds the given fraction of calls.
+        """
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return 2 ** bucket
+        return 0
+
+    def to_json(self):
+        return {"count": self.count, "total_ns": self.total, "buckets": self.buckets}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["count"], data["total_ns"], list(data["buckets"]))
+
+class PhaseTimer:
+    """
+    The phase histograms of one game session.
+    """
+
+    def __init__(self):
+        self.phases = {}  # phase -> Histogram
+        self.covered = 0  # Nanoseconds already counted by some phase
+        self.started = time.perf_counter_ns()
+        self.wall = None  # Nanoseconds from start to finish(), once finished
+
+    def attach(self, engine):
+        """
+        Times the phase methods of one engine. Returns the engine.
+        """
+        for phase, name in PHASES.items():
+            setattr(engine, name, self.timed(phase, getattr(engine, name)))
+        return engine
+
+    def record(self, phase, nanos):
+        self.covered += nanos
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        histogram.add(nanos)
+
+    def timed(self, phase, method):
+        """
+        Wraps a method (or generator method) so each call adds its exclusive time to phase.
+        """
+        clock = time.perf_counter_ns
+
+        if inspect.isgeneratorfunction(method):
+            def timed_steps(*args, **kwargs):
+                started, covered = clock(), self.covered
+                try:
+                    return (yield from method(*args, **kwargs))
+                finally:
+                    self.record(phase, clock() - started - (self.covered - covered))
+            return timed_steps
+
+        def timed_call(*args, **kwargs):
+            started, covered = clock(), self.covered
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(phase, clock() - started - (self.covered - covered))
+        return timed_call
+
+    def finish(self):
+        if self.wall is None:
+            self.wall = time.perf_counter_ns() - self.started
+
+    def to_json(self, **labels):
+        self.finish()
+        session = dict(labels)
+        session["wall_ns"] = self.wall
+        session["phases"] = {phase: histogram.to_json() for phase, histogram in self.phases.items()}
+        return session
+
+    def dump(self, path, **labels):
+        """
+        Appends this session to a timing log as one line, written in one go so that
+        sessions ending at the same time in other processes do not mix their lines.
+        Returns the session as written.
+        """
+        session = self.to_json(**labels)
+        line = json.dumps(session, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return session
+
+# -----------------------------
+# Aggregating
+# -----------------------------
+
+def read_sessions(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def aggregate(sessions):
+    """
+    Adds up sessions. Returns (number of sessions, total wall nanoseconds, {phase: Histogram}).
+    """
+    count, wall, phases = 0, 0, {}
+    for session in sessions:
+        count += 1
+        wall += session["wall_ns"]
+        for phase, data in session["phases"].items():
+            phases.setdefault(phase, Histogram()).merge(Histogram.from_json(data))
+    return count, wall, phases
+
+def report_lines(sessions, wall, phases):
+    lines = [f"⏱️ {sessions} sessions, {wall / 1e9:,.1f}s of wall time",
+             f"{'phase':12} {'calls':>9} {'total ms':>11} {'share':>7} {'mean µs':>9} {'p50 µs':>8} {'p99 µs':>8}"]
+    order = [phase for phase in PHASES if phase in phases] + sorted(set(phases) - set(PHASES))
+    for phase in order:
+        histogram = phases[phase]
+        lines.append(f"{phase:12} {histogram.count:>9,} {histogram.total / 1e6:>11,.1f} "
+                     f"{histogram.total / wall if wall else 0:>7.1%} {histogram.total / histogram.count / 1000:>9,.1f} "
+                     f"{'<' + str(histogram.percentile(0.5)):>8} {'<' + str(histogram.percentile(0.99)):>8}")
+    other = wall - sum(histogram.total for histogram in phases.values())
+    lines.append(f"{'other':12} {'':>9} {other / 1e6:>11,.1f} {other / wall if wall else 0:>7.1%}")
+    return lines
+
+def print_report(sessions):
+    for line in report_lines(*aggregate(sessions)):
+        print(line)
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add up the phase timings of Spooky Forest sessions")
+    parser.add_argument("logs", nargs="+", help="timing logs written with --phase-log")
+    parser.add_argument("--player", help="only sessions of this player")
+    args = parser.parse_args(argv)
+
+    sessions = read_sessions(args.logs)
+    if args.player:
+        sessions = (session for session in sessions if session.get("player") == args.player)
+    print_report(sessions)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
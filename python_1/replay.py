@@ -0,0 +1,220 @@
+# Spooky Forest Adventure - Replay Log
+# Records the seed and every answer of a game, so the game can be played again exactly,
+# at full speed and without a player. Recorded games become regression and speed tests.
+#
+# Example:
+#   python July30Code.py --record replays/lisa.jsonl
+#   python replay.py replays/*.jsonl
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from content_pack import load_pack
+from forest_engine import CONTENT, GameEngine, ScriptedInput, silent_output
+
+"""What a replay log looks like (one JSON value per line, only ever appended to):
+
+{"replay": 2, "seed": 1234, "player": "Lisa", "content": "spooky-forest-1"}
+                                        (plus "world": "forest.pack" for a game in a generated world)
+"yes"                                   every answer, exactly as it was typed
+{"load": {...}}                         a save that was loaded, or {"error": ...} if loading failed
+{"result": "win", "life_points": 5, "turns": 23}    written when the game ends
+
+Every --record appends another game, starting with its own header line, so one log can
+hold a whole session (or a whole classroom). replay.py plays each game in turn.
+
+The engine draws every random choice from random.Random(seed), so the seed plus the
+answers decide the whole game, in the world it was played in: a game in a generated world
+is replayed in the same pack, and only if the pack still holds the same version. Loaded
+saves are copied into the log because the save file may be different (or gone) by the
+time the game is replayed."""
+
+REPLAY_FORMAT = 2  # 2: decks shuffle with SplitMix64, so format 1 logs no longer replay the same game
+
+# -----------------------------
+# Recording
+# -----------------------------
+
+def new_seed():
+    """
+    A fresh random seed for a session that was not given one.
+    """
+    return random.SystemRandom().getrandbits(32)
+
+class ReplayLog:
+    """
+    Appends one game to a replay log file as it is played.
+    Every line is flushed straight away, so a crash still leaves a replayable log.
+    """
+
+    def __init__(self, path, seed, player_name, content=CONTENT, world=None):
+        """
+        world is the path of the content pack the game is played in, or None for the spooky forest.
+        """
+        self.path = path
+        self.seed = seed
+        self.file = open(path, "a+", encoding="utf-8")
+        if self.file.tell():
+            self.file.seek(self.file.tell() - 1)
+            if self.file.read(1) != "\n":
+                self.file.write("\n")  # The last game was cut off mid-line; start this one on its own
+        header = {"replay": REPLAY_FORMAT, "seed": seed, "player": player_name, "content": content.version}
+        if world:
+            header["world"] = world
+        self._write(header)
+
+    def _write(self, value):
+        self.file.write(json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def recording(self, input_fn):
+        """
+        Wraps input_fn so every answer it returns is also written to the log.
+        """
+        def record(prompt=""):
+            answer = input_fn(prompt)
+            self._write(answer)
+            return answer
+        return record
+
+    def record_load(self, save_data, error=None):
+        if error is None:
+            self._write({"load": save_data})
+        elif isinstance(error, FileNotFoundError):
+            self._write({"error": "missing"})
+        else:
+            self._write({"error": str(error)})
+
+    def record_result(self, result):
+        self._write({"result": result.outcome, "life_points": result.life_points, "turns": result.turns})
+
+    def close(self):
+        self.file.close()
+
+# -----------------------------
+# Replaying
+# -----------------------------
+
+def read_replay(path):
+    """
+    Reads a replay log. Returns one (header, answers, loads, result) per game recorded in it,
+    in order; result is None when a game never finished (for example after a crash).
+    """
+    games = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                value = json.loads(line) if line.endswith("\n") else None
+            except json.JSONDecodeError:
+                value = None
+            if value is None:
+                if not games:
+                    raise ValueError(f"{path} is not a replay log")
+                games[-1][4] = True  # A line cut off by a crash: the rest of that game is lost
+                continue
+            if isinstance(value, dict) and "replay" in value:
+                if value["replay"] != REPLAY_FORMAT:
+                    raise ValueError(f"{path} is not a replay log (format {value['replay']})")
+                games.append([value, [], [], None, False])  # header, answers, loads, result, cut off
+            elif not games:
+                raise ValueError(f"{path} is not a replay log")
+            elif games[-1][4]:
+                continue
+            elif isinstance(value, str):
+                games[-1][1].append(value)
+            elif "result" in value:
+                games[-1][3] = value
+            else:
+                games[-1][2].append(value)
+    return [(header, answers, loads, result) for header, answers, loads, result, _ in games]
+
+class ReplayEngine(GameEngine):
+    """
+    A GameEngine that loads saves from the replay log and never writes any files.
+    """
+
+    def __init__(self, loads, **kwargs):
+        super().__init__(save_file=None, results_file=None, **kwargs)
+        self._loads = iter(loads)
+
+    def write_save(self, save_data):
+        pass
+
+    def read_save(self):
+        entry = next(self._loads, {"error": "missing"})
+        if "load" in entry:
+            return entry["load"]
+        if entry["error"] == "missing":
+            raise FileNotFoundError(self.save_file)
+        raise ValueError(entry["error"])
+
+def replay_game(path, game, output_fn=silent_output):
+    """
+    Plays one recorded game again as fast as possible.
+    Returns (header, recorded result, replayed GameResult, seconds).
+    """
+    header, answers, loads, recorded = game
+    content = load_pack(header["world"]) if header.get("world") else CONTENT
+    if header["content"] != content.version:
+        raise ValueError(f"{path} was recorded with content pack {header['content']}, not {content.version}")
+    started = time.perf_counter()
+    engine = ReplayEngine(loads, player_name=header["player"], input_fn=ScriptedInput(answers),
+                          output_fn=output_fn, rng=random.Random(header["seed"]), content=content)
+    result = engine.run()
+    return header, recorded, result, time.perf_counter() - started
+
+def replay(path, output_fn=silent_output):
+    """
+    Plays every game of a replay log again. Returns a list of replay_game() results.
+    """
+    return [replay_game(path, game, output_fn) for game in read_replay(path)]
+
+def matches(recorded, result):
+    """
+    True if the replayed game ended the way the recorded one did.
+    """
+    return (recorded["result"], recorded["life_points"], recorded["turns"]) == \
+        (result.outcome, result.life_points, result.turns)
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded Spooky Forest games")
+    parser.add_argument("logs", nargs="+", help="replay log files")
+    parser.add_argument("--show", action="store_true", help="print the game text while replaying")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.logs:
+        try:
+            games = read_replay(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+            continue
+        for number, game in enumerate(games, 1):
+            name = f"{path} game {number}" if len(games) > 1 else path
+            try:
+                header, recorded, result, seconds = replay_game(path, game, print if args.show else silent_output)
+            except (OSError, ValueError) as e:
+                print(f"❌ {name}: {e}")
+                failed += 1
+                continue
+            summary = f"{result.outcome}, {result.life_points} points, {result.turns} turns in {seconds * 1000:.1f} ms"
+            if recorded is None:
+                print(f"⚪ {name}: {summary} (recording never finished)")
+            elif matches(recorded, result):
+                print(f"✅ {name}: {summary}")
+            else:
+                print(f"❌ {name}: {summary}, but the recording ended "
+                      f"{recorded['result']}, {recorded['life_points']} points, {recorded['turns']} turns")
+                failed += 1
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,271 @@
+# Spooky Forest Adventure - Balance Simulator
+# Plays lots of games with bot players so we can tune the scoring rules and deck sizes
+# without playing by hand. Games are split into chunks and spread across a process pool.
+#
+# Example:
+#   python simulate.py --games 1000000 --policy p-correct --accuracy 0.7 --accuracy Hazards=0.5
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+from forest_engine import CONTENT, DEFAULT_RULES, MISSION_KEYS, GameEngine, Rules, silent_output
+
+# -----------------------------
+# Bot Policies
+# -----------------------------
+
+# A policy is called with (prompt, rng) and returns what the player would type.
+# Policies must be picklable so worker processes can use them.
+
+def pick_answer(options, answer, correct, rng):
+    """
+    Returns the option number of the right answer, or of a random wrong one.
+    """
+    right = options.index(answer) + 1
+    if correct or len(options) == 1:
+        return str(right)
+    wrong = rng.randrange(1, len(options))
+    return str(wrong if wrong < right else wrong + 1)
+
+def pick_item(items, correct, rng):
+    """
+    Returns the item number of a mission item, or of a cursed item when there is one.
+    """
+    mission = [i for i, item in enumerate(items, 1) if item.casefold() in MISSION_KEYS]
+    cursed = [i for i, item in enumerate(items, 1) if item.casefold() not in MISSION_KEYS]
+    choices = mission if (correct and mission) or not cursed else cursed
+    return str(rng.choice(choices))
+
+def common_answer(prompt, rng):
+    """
+    Answers the prompts every bot handles the same way.
+    Returns None when the policy has to decide.
+    """
+    if prompt.kind == "proceed":
+        return "yes"
+    if prompt.kind == "command":
+        # Nowhere left to go means the mission can no longer be finished
+        return rng.choice(prompt.data) if prompt.data else "quit"
+    return None
+
+def random_policy(prompt, rng):
+    """
+    Picks every option uniformly at random, including leaving a room empty-handed.
+    """
+    answer = common_answer(prompt, rng)
+    if answer is not None:
+        return answer
+    if prompt.kind == "item":
+        return rng.choice([str(i) for i in range(1, len(prompt.data) + 1)] + ["leave"])
+    return str(rng.randint(1, len(prompt.data.choices)))
+
+def correct_policy(prompt, rng):
+    """
+    Always gives the right answer and always takes the mission item.
+    """
+    answer = common_answer(prompt, rng)
+    if answer is not None:
+        return answer
+    if prompt.kind == "item":
+        return pick_item(prompt.data, True, rng)
+    return pick_answer(prompt.data.choices, prompt.data.answer, True, rng)
+
+class PCorrectPolicy:
+    """
+    Answers correctly with a given probability per category.
+    Quizzes use their own category, hazards use "Hazards" and item picks use "Items".
+    """
+
+    def __init__(self, accuracy=0.5, per_category=None):
+        self.accuracy = accuracy
+        self.per_category = dict(per_category or {})
+
+    def chance(self, category):
+        return self.per_category.get(category, self.accuracy)
+
+    def __call__(self, prompt, rng):
+        answer = common_answer(prompt, rng)
+        if answer is not None:
+            return answer
+        if prompt.kind == "item":
+            return pick_item(prompt.data, rng.random() < self.chance("Items"), rng)
+        category = prompt.data.category if prompt.kind == "quiz" else "Hazards"
+        correct = rng.random() < self.chance(category)
+        return pick_answer(prompt.data.choices, prompt.data.answer, correct, rng)
+
+# -----------------------------
+# Playing Games
+# -----------------------------
+
+def play_one(policy, rng, rules, quizzes, hazards, max_turns):
+    """
+    Plays one silent game with a bot and returns its GameResult.
+    Games that run past max_turns end with the outcome "stalled".
+    """
+    engine = GameEngine(input_fn=None, output_fn=silent_output, save_file=None, results_file=None,
+                        rng=rng, rules=rules, quizzes=quizzes, hazards=hazards)
+    session = engine.play()
+    try:
+        prompt = next(session)
+        while engine.turns < max_turns:
+            prompt = session.send(policy(prompt, rng))
+    except StopIteration as stop:
+        return stop.value
+    session.close()
+    return engine.result("stalled")
+
+def chunk_seed(seed, chunk):
+    """
+    Seed for one chunk of games. It only depends on the chunk number, not on
+    which worker plays it, so the same --seed always gives the same totals.
+    """
+    return f"{seed}:{chunk}"
+
+def run_chunk(task):
+    """
+    Worker entry point: plays one chunk of games and returns only counters,
+    so very little data travels back to the parent process.
+    """
+    seed, chunk, games, policy, rules, quiz_count, hazard_count, max_turns = task
+    # Decks are built here from the shared read-only content, so only their sizes are sent over
+    quizzes = make_deck(CONTENT.quizzes, quiz_count)
+    hazards = make_deck(CONTENT.hazards, hazard_count)
+    rng = random.Random(chunk_seed(seed, chunk))
+    outcomes = Counter()
+    life_points = Counter()
+    lengths = Counter()
+    for _ in range(games):
+        result = play_one(policy, rng, rules, quizzes, hazards, max_turns)
+        outcomes[result.outcome] += 1
+        life_points[result.life_points] += 1
+        lengths[result.turns] += 1
+    return outcomes, life_points, lengths
+
+def make_deck(cards, size):
+    """
+    Builds a deck of the requested size, repeating the content if it needs more cards.
+    """
+    if size is None:
+        return tuple(cards)
+    return tuple(cards[i % len(cards)] for i in range(size))
+
+def simulate(games, policy, rules=DEFAULT_RULES, quiz_count=None, hazard_count=None,
+             workers=None, seed=0, chunk_size=2000, max_turns=500):
+    """
+    Plays the given number of games across a process pool and returns the merged counters
+    (outcomes, life_points, lengths).
+    """
+    tasks = []
+    for chunk, start in enumerate(range(0, games, chunk_size)):
+        tasks.append((seed, chunk, min(chunk_size, games - start), policy, rules, quiz_count, hazard_count, max_turns))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return merge(map(run_chunk, tasks))
+    with multiprocessing.Pool(workers) as pool:
+        return merge(pool.imap_unordered(run_chunk, tasks))
+
+def merge(chunk_results):
+    """
+    Adds up the counters from every chunk. Order does not matter.
+    """
+    outcomes, life_points, lengths = Counter(), Counter(), Counter()
+    for chunk_outcomes, chunk_life, chunk_lengths in chunk_results:
+        outcomes.update(chunk_outcomes)
+        life_points.update(chunk_life)
+        lengths.update(chunk_lengths)
+    return outcomes, life_points, lengths
+
+# -----------------------------
+# Report
+# -----------------------------
+
+def percentile(counts, fraction):
+    """
+    Returns the value at the given fraction of a histogram stored as a Counter.
+    """
+    target = fraction * sum(counts.values())
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= target:
+            return value
+    return None
+
+def mean(counts):
+    total = sum(counts.values())
+    return sum(value * n for value, n in counts.items()) / total if total else 0.0
+
+def print_report(games, outcomes, life_points, lengths, elapsed):
+    print(f"\n🎲 {games} games in {elapsed:.1f}s ({games / elapsed:,.0f} games/sec)")
+
+    print("\n🏁 Outcomes")
+    for outcome, n in outcomes.most_common():
+        print(f"{outcome:10}: {n / games:7.2%} ({n})")
+
+    print("\n❤️ Final life points")
+    print(f"mean {mean(life_points):.2f} | p10 {percentile(life_points, 0.1)} | "
+          f"p50 {percentile(life_points, 0.5)} | p90 {percentile(life_points, 0.9)}")
+    biggest = max(life_points.values())
+    for value in sorted(life_points):
+        bar = "█" * max(1, round(40 * life_points[value] / biggest))
+        print(f"{value:4}: {bar} ({life_points[value]})")
+
+    print("\n⏱️ Game length (answers given)")
+    print(f"mean {mean(lengths):.1f} | p50 {percentile(lengths, 0.5)} | "
+          f"p99 {percentile(lengths, 0.99)} | max {max(lengths)}")
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def parse_accuracy(values):
+    """
+    Turns ["0.7", "Hazards=0.5"] into a default accuracy and a per-category dict.
+    """
+    default, per_category = 0.5, {}
+    for value in values or []:
+        if "=" in value:
+            category, chance = value.split("=", 1)
+            per_category[category.strip()] = float(chance)
+        else:
+            default = float(value)
+    return default, per_category
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator for the Spooky Forest rules.")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--policy", choices=["random", "correct", "p-correct"], default="p-correct")
+    parser.add_argument("--accuracy", action="append", metavar="[CATEGORY=]P",
+                        help="chance of a right answer for p-correct, optionally per category (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", default="0", help="base seed; the same seed gives the same results")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="games per task sent to a worker")
+    parser.add_argument("--max-turns", type=int, default=500, help="answers before a game counts as stalled")
+    parser.add_argument("--quizzes", type=int, default=None, help="quiz deck size (default: all quizzes)")
+    parser.add_argument("--hazards", type=int, default=None, help="hazard deck size (default: all hazards)")
+    for field in Rules._fields:
+        parser.add_argument("--" + field.replace("_", "-"), type=int, default=getattr(DEFAULT_RULES, field))
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    if args.policy == "random":
+        policy = random_policy
+    elif args.policy == "correct":
+        policy = correct_policy
+    else:
+        policy = PCorrectPolicy(*parse_accuracy(args.accuracy))
+    rules = Rules(**{field: getattr(args, field) for field in Rules._fields})
+
+    started = time.perf_counter()
+    outcomes, life_points, lengths = simulate(args.games, policy, rules, args.quizzes, args.hazards,
+                                              args.workers, args.seed, args.chunk_size, args.max_turns)
+    print_report(args.games, outcomes, life_points, lengths, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Spooky Forest Adventure - Replay Log Tests
+# Run with: python -m pytest test_replay.py
+
+import random
+
+import replay
+from forest_engine import GameEngine, ScriptedInput, silent_output
+
+def record_game(path, seed, answers):
+    log = replay.ReplayLog(path, seed, "Tester")
+    engine = GameEngine(player_name="Tester", rng=random.Random(seed), input_fn=log.recording(ScriptedInput(answers)),
+                        output_fn=silent_output, replay_log=log, save_file=None, results_file=None)
+    result = engine.run()
+    log.record_result(result)
+    log.close()
+    return result
+
+def test_two_games_in_one_log_replay_separately(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    first = record_game(path, 1, ["yes", "north", "1", "1", "1", "south", "2", "2", "2", "quit"])
+    second = record_game(path, 2, ["yes", "east", "3", "1", "2", "points", "quit"])
+
+    games = replay.replay(path)
+    assert [header["seed"] for header, _, _, _ in games] == [1, 2]
+    for (_, recorded, result, _), played in zip(games, [first, second]):
+        assert replay.matches(recorded, result)
+        assert (result.outcome, result.life_points, result.turns) == (played.outcome, played.life_points, played.turns)
+    assert replay.main([path]) == 0
+
+def test_game_cut_off_by_a_crash_does_not_spill_into_the_next(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    record_game(path, 1, ["yes", "points", "quit"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"replay": 2, "seed": 3, "player": "Tester", "content": "x"}\n"nor')  # Crashed mid-answer
+    record_game(path, 2, ["yes", "points", "quit"])
+
+    games = replay.read_replay(path)
+    assert [(header["seed"], answers, result is not None) for header, answers, _, result in games] == \
+        [(1, ["yes", "points", "quit"], True), (3, [], False), (2, ["yes", "points", "quit"], True)]
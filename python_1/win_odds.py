@@ -0,0 +1,275 @@
+# Spooky Forest Adventure - Win Odds
+# Works out exactly how often a bot player wins, loses or gives up under the July30 rules,
+# by solving the game as an absorbing Markov chain instead of playing it a million times.
+#
+# Example:
+#   python win_odds.py
+#   python win_odds.py --grid 0.5,0.7,0.9 --accuracy Hazards=0.5 --item-penalty 2
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+from content_pack import load_pack
+from forest_engine import CONTENT, DEFAULT_RULES, Rules
+from simulate import PCorrectPolicy, make_deck, parse_accuracy
+
+"""How the chain is built:
+
+The player is the p-correct bot of simulate.py: it answers a quiz of some category right
+with its accuracy for that category, a hazard with its "Hazards" accuracy, and picks the
+mission item of a room with its "Items" accuracy. It walks into a random open room.
+
+In a hub world (the start room with dead ends around it, like the spooky forest) one step
+of the chain is one room visit, straight from the engine's rules:
+
+enter_room      a quiz from the deck (ask_quiz), unless the deck is empty
+take_item       one pick: a valid pick always completes the room, right or wrong
+handle_hazard   a hazard from the deck, unless it is empty
+check_end       a win once every mission item is carried
+
+and game_over whenever life points drop below zero. So a state is
+
+    (life points, mission items still needed, rooms left of each kind, quizzes left, hazards left)
+
+where rooms of the same kind (directions into it, mission items, other items) are
+interchangeable, and quizzes only count per accuracy (every card left is equally likely,
+as in CategoryDecks). The absorbing states are the ends of a game: (outcome, life points).
+When no room is left the bot quits; rooms without items are always open and never
+completed, so a world with one ends in a stall instead.
+
+Every visit completes a room, so the chain has no cycles and states are numbered in the
+order they are reached. The odds come from the fundamental matrix: with Q the transient
+and R the absorbing transitions, the expected visits v of every state solve (I - Q)^T v = e_start,
+and the chance of each end is v R. NumPy solves that system when it is installed; without
+it (or for very big chains) the same numbers come from one pass in state order."""
+
+DEFAULT_GRID = [step / 10 for step in range(11)]
+DENSE_LIMIT = 3000  # States up to which the chain is solved as a dense NumPy system
+
+# -----------------------------
+# The Chain
+# -----------------------------
+
+def hub_rooms(content):
+    """
+    The rooms of a hub world, as {(directions into it, mission items, other items): rooms of that kind},
+    and the number of rooms without items. Raises ValueError if the world is not a hub of dead ends.
+    """
+    start = content.rooms[content.start_room]
+    kinds, empty = Counter(), 0
+    seen = set()
+    for room_id, directions in Counter(start.exits.values()).items():
+        room = content.rooms[room_id]
+        if room.exits:
+            raise ValueError(f"{room.name} has exits of its own: only a start room surrounded by dead ends can be solved "
+                             "(grow one with world_gen.py --layout hub)")
+        missions = {item for item in room.items if content.items[item].mission}
+        if missions & seen:
+            raise ValueError(f"{room.name} shares a mission item with another room")
+        seen |= missions
+        if room.items:
+            kinds[(directions, len(missions), len(room.items) - len(missions))] += 1
+        else:
+            empty += 1
+    return kinds, empty
+
+class OddsChain:
+    """
+    The absorbing Markov chain of one world, rules and decks for one bot policy.
+    """
+
+    def __init__(self, policy, content=CONTENT, rules=DEFAULT_RULES, quizzes=None, hazards=None):
+        kinds, self.empty = hub_rooms(content)
+        self.kinds = list(kinds)
+        self.rules = rules
+        quizzes = content.quizzes if quizzes is None else quizzes
+        hazards = content.hazards if hazards is None else hazards
+        # Quizzes only matter through the accuracy for their category
+        by_chance = Counter(policy.chance(quiz.category) for quiz in quizzes)
+        self.quiz_chances = list(by_chance)
+        self.hazard_chance = policy.chance("Hazards")
+        self.item_chance = policy.chance("Items")
+
+        self.start = (0, content.mission_count, tuple(kinds.values()), tuple(by_chance.values()), len(hazards))
+        self.states = [self.start]  # In the order they are reached, which is also an order of the chain
+        self.numbers = {self.start: 0}
+        self.transitions = []  # state number -> [(probability, state number or end)]
+        self.ends = {}  # (outcome, life points) -> column number
+        for state in self.states:  # Grows while it is walked
+            self.transitions.append([(chance, self.number(after)) for after, chance in self.visit(state).items()])
+
+    def number(self, after):
+        """
+        The number of a state (an int) or of an end (a tuple in self.ends).
+        """
+        if after[0] in ("win", "lose", "quit", "stalled"):
+            self.ends.setdefault(after, len(self.ends))
+            return after
+        if after not in self.numbers:
+            self.numbers[after] = len(self.states)
+            self.states.append(after)
+        return self.numbers[after]
+
+    def quiz_steps(self, life, quizzes):
+        left = sum(quizzes)
+        if not left:
+            yield 1.0, life, quizzes
+            return
+        for group, count in enumerate(quizzes):
+            if count:
+                drawn = quizzes[:group] + (count - 1,) + quizzes[group + 1:]
+                chance = self.quiz_chances[group]
+                yield count / left * chance, life + self.rules.quiz_reward, drawn
+                yield count / left * (1 - chance), life - self.rules.quiz_penalty, drawn
+
+    def item_steps(self, life, kind):
+        """
+        (probability, life points, mission item taken?) of the one pick in a room of this kind.
+        """
+        _, missions, others = kind
+        mission = 0.0 if not missions else 1.0 if not others else self.item_chance
+        yield mission, life + self.rules.item_reward, True
+        yield 1 - mission, life - self.rules.item_penalty, False
+
+    def hazard_steps(self, life, hazards):
+        if not hazards:
+            yield 1.0, life, hazards
+            return
+        yield self.hazard_chance, life + self.rules.hazard_reward, hazards - 1
+        yield 1 - self.hazard_chance, life - self.rules.hazard_penalty, hazards - 1
+
+    def visit(self, state):
+        """
+        What one room visit from this state leads to: {state or end: probability}.
+        """
+        life, needed, rooms, quizzes, hazards = state
+        ways = sum(kind[0] * count for kind, count in zip(self.kinds, rooms))
+        outcomes = Counter()
+        for number, count in enumerate(rooms):
+            if not count:
+                continue
+            kind = self.kinds[number]
+            left = rooms[:number] + (count - 1,) + rooms[number + 1:]
+            room_chance = kind[0] * count / ways
+            for quiz_chance, quiz_life, quizzes_after in self.quiz_steps(life, quizzes):
+                chance = room_chance * quiz_chance
+                if quiz_life < 0:
+                    outcomes[("lose", quiz_life)] += chance
+                    continue
+                for item_chance, item_life, found in self.item_steps(quiz_life, kind):
+                    if not item_chance:
+                        continue
+                    if item_life < 0:
+                        outcomes[("lose", item_life)] += chance * item_chance
+                        continue
+                    still_needed = needed - found
+                    for hazard_chance, hazard_life, hazards_after in self.hazard_steps(item_life, hazards):
+                        if not hazard_chance:
+                            continue
+                        if hazard_life < 0:
+                            after = ("lose", hazard_life)
+                        elif still_needed <= 0:
+                            after = ("win", hazard_life)
+                        elif not any(left):
+                            after = ("stalled" if self.empty else "quit", hazard_life)
+                        else:
+                            after = (hazard_life, still_needed, left, quizzes_after, hazards_after)
+                        outcomes[after] += chance * item_chance * hazard_chance
+        if not ways:
+            outcomes[("stalled" if self.empty else "quit", life)] = 1.0
+        return outcomes
+
+    # ---------- Solving ----------
+
+    def solve(self):
+        """
+        The chance of every end of the game from the start: {(outcome, life points): probability}.
+        """
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is None or len(self.states) > DENSE_LIMIT:
+            return self.solve_in_order()
+        count = len(self.states)
+        q = numpy.zeros((count, count))
+        r = numpy.zeros((count, len(self.ends)))
+        for number, transitions in enumerate(self.transitions):
+            for chance, after in transitions:
+                if isinstance(after, int):
+                    q[number, after] += chance
+                else:
+                    r[number, self.ends[after]] += chance
+        start = numpy.zeros(count)
+        start[0] = 1.0
+        visits = numpy.linalg.solve((numpy.eye(count) - q).T, start)
+        odds = visits @ r
+        return {end: float(odds[column]) for end, column in self.ends.items()}
+
+    def solve_in_order(self):
+        """
+        The same odds without NumPy: every transition leads to a later state, so one pass
+        in state order carries the chance of reaching each state forward.
+        """
+        reach = [0.0] * len(self.states)
+        reach[0] = 1.0
+        odds = Counter()
+        for number, transitions in enumerate(self.transitions):
+            for chance, after in transitions:
+                if isinstance(after, int):
+                    reach[after] += reach[number] * chance
+                else:
+                    odds[after] += reach[number] * chance
+        return dict(odds)
+
+def summarize(odds):
+    """
+    Turns {(outcome, life points): probability} into ({outcome: probability}, expected final life points).
+    """
+    outcomes = Counter()
+    for (outcome, _), chance in odds.items():
+        outcomes[outcome] += chance
+    return outcomes, sum(life * chance for (_, life), chance in odds.items())
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact win and loss odds of the Spooky Forest rules for a grid of accuracies.")
+    parser.add_argument("--grid", help="comma-separated accuracies to solve for (default: 0, 0.1, ..., 1)")
+    parser.add_argument("--accuracy", action="append", metavar="CATEGORY=P",
+                        help="fixed accuracy for one category, as in simulate.py (repeatable)")
+    parser.add_argument("--quizzes", type=int, default=None, help="quiz deck size (default: all quizzes)")
+    parser.add_argument("--hazards", type=int, default=None, help="hazard deck size (default: all hazards)")
+    parser.add_argument("--world", metavar="PACK", help="a hub world to solve instead of the spooky forest "
+                                                        "(world_gen.py --layout hub; grid worlds cannot be solved)")
+    for field in Rules._fields:
+        parser.add_argument("--" + field.replace("_", "-"), type=int, default=getattr(DEFAULT_RULES, field))
+    args = parser.parse_args(argv)
+
+    grid = [float(value) for value in args.grid.split(",")] if args.grid else DEFAULT_GRID
+    _, per_category = parse_accuracy(args.accuracy)
+    rules = Rules(**{field: getattr(args, field) for field in Rules._fields})
+    content = load_pack(args.world) if args.world else CONTENT
+    quizzes = make_deck(content.quizzes, args.quizzes)
+    hazards = make_deck(content.hazards, args.hazards)
+
+    started = time.perf_counter()
+    print(f"{'accuracy':>8} {'win':>8} {'lose':>8} {'quit':>8} {'stalled':>8} {'life':>7} {'states':>7}")
+    for accuracy in grid:
+        try:
+            chain = OddsChain(PCorrectPolicy(accuracy, per_category), content, rules, quizzes, hazards)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        outcomes, life = summarize(chain.solve())
+        print(f"{accuracy:>8.2f} {outcomes['win']:>8.2%} {outcomes['lose']:>8.2%} {outcomes['quit']:>8.2%} "
+              f"{outcomes['stalled']:>8.2%} {life:>7.2f} {len(chain.states):>7,}")
+    print(f"\n🧮 Solved {len(grid)} accuracies in {time.perf_counter() - started:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
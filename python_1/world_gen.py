@@ -0,0 +1,212 @@
+# Spooky Forest Adventure - World Generator
+# Grows a forest of any size from a seed and writes it straight into a content pack, so a
+# world with a million rooms can be played (or load tested) without ever being authored.
+#
+# Example:
+#   python world_gen.py 100000 --seed 7 -o content/forest_100k.pack
+#   python July30Code.py --world content/forest_100k.pack
+#   python world_gen.py 5000 --layout hub -o content/hub_5k.pack && python best_play.py --world content/hub_5k.pack
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+from content_pack import PackWriter, load_source, source_digest
+
+"""How a world is grown:
+
+The rooms sit on a square grid, one room per cell, entered from the start room (the
+Clearing) through an exit into the first cell. Every cell but the first opens a passage
+north or west (cells in the top row always west, cells in the left column always north),
+which joins all cells into one tree: every room can be reached, and every room leads back.
+A few cells in a thousand open both ways, which adds loops so there is more than one way
+around. Passages go both ways: a cell has a south exit when the cell below it opens north.
+
+Everything about a cell (its passages, name, description and distractor item) comes from
+a hash of the seed and the cell number, so any cell can be worked out on its own. The
+generator never keeps a map of the world: it walks the cells in order and hands each room
+to a PackWriter, which only keeps the growing pack. Memory grows with the size of the pack
+(about 60 bytes a room), not with Python objects per room.
+
+Mission items lie in rooms picked at random from the seed; about one room in eight also
+holds a distractor item ("broken stick", "old shoe", ...). Quizzes and hazards are taken
+from the authored content, so a generated world asks the same questions as the small one.
+The same seed and sizes always give the same world, byte for byte.
+
+The hub layout grows the same rooms without the grid: the Clearing has one path into
+every room and every room is a dead end, like the spooky forest itself. That is the only
+shape win_odds.py and best_play.py can solve, so a hub world is how they are run on
+thousands of rooms instead of five."""
+
+GENERATOR_VERSION = 1  # Bump when the same seed would grow a different world
+DEFAULT_MISSIONS = 4
+LOOPS_PER_MILLE = 8  # Cells in a thousand that open both north and west
+DISTRACTOR_EIGHTHS = 1  # Eighths of the rooms that hold a distractor item
+LAYOUTS = ["grid", "hub"]
+HUB_DIRECTIONS = ["north", "south", "east", "west"]  # The first paths out of a hub's Clearing; then "path 5", ...
+START_ROOM = "Clearing"
+START_DESCRIPTION = ("A small clearing in the spooky forest. Paths lead off into the trees in every direction, "
+                     "and eerie whispers echo among them.")
+
+MISSION_ITEMS = ["flashlight", "map", "compass", "fire kit", "lantern", "rope", "whistle", "silver key",
+                 "first aid kit", "water bottle", "pocket knife", "moon stone"]
+DISTRACTOR_ITEMS = ["broken stick", "old shoe", "strange feather", "rusty can", "cracked mirror", "wet sock",
+                    "bent spoon", "pine cone", "torn page", "empty jar", "chipped marble", "lost mitten"]
+
+ADJECTIVES = ["Mossy", "Misty", "Silent", "Hollow", "Crooked", "Shadowy", "Tangled", "Frozen", "Whispering",
+              "Sunken", "Foggy", "Thorny", "Ancient", "Gloomy", "Rotten", "Moonlit"]
+PLACES = ["Hollow", "Thicket", "Glade", "Ravine", "Grove", "Bog", "Ridge", "Path", "Stream", "Cave",
+          "Stump", "Meadow", "Ruins", "Burrow", "Bridge", "Pond"]
+SIGHTS = ["Roots twist across the ground like sleeping snakes.", "Tall trees lean in close overhead.",
+          "A thin fog curls around your ankles.", "Owls watch you from the branches.",
+          "Old lanterns hang from the trees, long burnt out.", "The ground is soft and smells of rain.",
+          "Glowing mushrooms light the way in faint blue.", "A cold stream gurgles somewhere nearby."]
+SOUNDS = ["Something rustles in the leaves.", "Distant howling drifts on the wind.",
+          "Twigs snap behind you, then silence.", "A crow caws three times.",
+          "You hear a faint, tuneless humming.", "The branches creak though there is no wind.",
+          "Water drips steadily in the dark.", "It is so quiet you can hear your heartbeat."]
+
+CARDS_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", "spooky_forest.json")
+MASK64 = (1 << 64) - 1
+
+def mix(seed, number):
+    """
+    A well-mixed 64-bit hash of (seed, number), the SplitMix64 finalizer.
+    """
+    z = (seed * 0x9E3779B97F4A7C15 + (number + 1) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+class ForestGrid:
+    """
+    The passages of a generated forest: cells 0..count-1 on a grid side cells wide.
+    """
+
+    def __init__(self, seed, count):
+        self.seed = seed
+        self.count = count
+        self.side = math.isqrt(count - 1) + 1
+
+    def opens(self, cell):
+        """
+        Which passages a cell opens: (north, west).
+        """
+        row, column = divmod(cell, self.side)
+        if row == 0 or column == 0:
+            return column == 0 and row > 0, row == 0 and column > 0
+        bits = mix(self.seed, cell)
+        if bits >> 1 & 1023 < LOOPS_PER_MILLE * 1024 // 1000:
+            return True, True
+        return bool(bits & 1), not bits & 1
+
+    def exits(self, cell):
+        """
+        The (direction, cell) passages out of a cell.
+        """
+        north, west = self.opens(cell)
+        exits = []
+        if north:
+            exits.append(("north", cell - self.side))
+        below = cell + self.side
+        if below < self.count and self.opens(below)[0]:
+            exits.append(("south", below))
+        if cell % self.side < self.side - 1 and cell + 1 < self.count and self.opens(cell + 1)[1]:
+            exits.append(("east", cell + 1))
+        if west:
+            exits.append(("west", cell - 1))
+        return exits
+
+def describe(bits):
+    """
+    The name part and description of a cell, chosen by its hash bits.
+    """
+    name = f"{ADJECTIVES[bits >> 16 & 15]} {PLACES[bits >> 20 & 15]}"
+    description = f"{SIGHTS[bits >> 24 & 7]} {SOUNDS[bits >> 27 & 7]}"
+    return name, description
+
+def hub_direction(cell):
+    return HUB_DIRECTIONS[cell] if cell < len(HUB_DIRECTIONS) else f"path {cell + 1}"
+
+def generate(rooms, seed=0, missions=DEFAULT_MISSIONS, cards_source=CARDS_SOURCE, layout="grid"):
+    """
+    Grows a world of the given number of rooms (the Clearing included) and returns its
+    PackWriter; call save() or to_bytes(). Quizzes and hazards come from cards_source.
+    layout is "grid" (a maze of passages) or "hub" (the Clearing surrounded by dead ends).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r}: choose one of {', '.join(LAYOUTS)}")
+    if rooms < 2:
+        raise ValueError("a world needs at least 2 rooms")
+    if not 1 <= missions < rooms:
+        raise ValueError(f"a world of {rooms:,} rooms can hold 1 to {rooms - 1:,} mission items")
+    cards, raw = load_source(cards_source)
+
+    count = rooms - 1  # Cells of the grid; room id = cell + 1, room 0 is the Clearing
+    grid = ForestGrid(seed, count)
+    rng = random.Random(mix(seed, -1))
+    pack = PackWriter(rooms, missions + len(DISTRACTOR_ITEMS))
+
+    # flashlight, map, ..., then flashlight 2, map 2, ... once every name is taken
+    names = [MISSION_ITEMS[number % len(MISSION_ITEMS)] + (f" {number // len(MISSION_ITEMS) + 1}" if number >= len(MISSION_ITEMS) else "")
+             for number in range(missions)]
+    mission_ids = [pack.add_item(name, True) for name in names]
+    distractor_ids = [pack.add_item(name, False) for name in DISTRACTOR_ITEMS]
+    mission_cells = dict(zip(rng.sample(range(count), missions), mission_ids))
+
+    hub = layout == "hub"
+    start_exits = [(hub_direction(cell), cell + 1) for cell in range(count)] if hub else [("north", 1)]
+    pack.add_room(START_ROOM, START_DESCRIPTION, start_exits, [])
+    for cell in range(count):
+        bits = mix(seed, cell)
+        name, description = describe(bits)
+        if hub:
+            exits = []  # A dead end: the game sends the player back to the Clearing
+        else:
+            exits = [(direction, other + 1) for direction, other in grid.exits(cell)]
+            if cell == 0:
+                exits.append(("back", 0))
+        items = []
+        if cell in mission_cells:
+            items.append(mission_cells[cell])
+        if bits >> 30 & 7 < DISTRACTOR_EIGHTHS:
+            items.append(distractor_ids[(bits >> 33) % len(DISTRACTOR_ITEMS)])
+        pack.add_room(f"{name} {cell + 1}", description, exits, items)
+
+    pack.add_cards(cards["quizzes"], cards["hazards"])
+    version = f"generated-{GENERATOR_VERSION}-{seed}-{rooms}-{missions}" + ("-hub" if hub else "")
+    pack.finish(version, source_digest(raw), 0, mission_ids)
+    return pack
+
+# -----------------------------
+# Command Line
+# -----------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grow a Spooky Forest world and write it as a content pack")
+    parser.add_argument("rooms", type=lambda text: int(text.replace("_", "")), help="number of rooms, the Clearing included")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--missions", type=int, default=DEFAULT_MISSIONS, help="mission items to hide (default: %(default)s)")
+    parser.add_argument("--cards", default=CARDS_SOURCE, help="content file to take quizzes and hazards from")
+    parser.add_argument("--layout", choices=LAYOUTS, default="grid",
+                        help="grid: a maze of passages (default); hub: the Clearing surrounded by dead ends, "
+                             "which win_odds.py and best_play.py can solve")
+    parser.add_argument("-o", "--output", help="where to write the pack (default: content/forest_<rooms>_<seed>.pack)")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"content/forest_{args.rooms}_{args.seed}.pack"
+    started = time.perf_counter()
+    try:
+        pack = generate(args.rooms, args.seed, args.missions, args.cards, args.layout)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    size = pack.save(output)
+    print(f"🌲 Grew {args.rooms:,} rooms into {output} ({size:,} bytes) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))